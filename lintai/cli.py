@@ -1,29 +1,21 @@
 # lintai/cli.py
 from __future__ import annotations
 
-import ast
 import json
-from collections import defaultdict
+import os
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import TYPE_CHECKING, List, Dict, Any
 
 import typer
 from typer import Argument, Context, Option
 
-from lintai.cli_support import init_common
-from lintai.detectors import run_all
-from lintai.core import report
-import lintai.engine as _engine
-import uvicorn
-
-from lintai.engine.inventory_builder import build_inventory
-from lintai.engine.inventory_builder import (
-    classify_sink,
-    detect_frameworks,
-    extract_ast_components,
-)
-from lintai.engine.analysis import ProjectAnalyzer
-from lintai.models.inventory import FileInventory
+from lintai.engine.cache import DEFAULT_CACHE_DIR
+
+# Heavy modules (analysis engine, detectors, pydantic models, uvicorn …) are
+# imported inside the sub-commands that need them, so `lintai --version` and
+# `--help` stay fast.  tests/unit/test_import_time.py keeps it that way.
+if TYPE_CHECKING:
+    from lintai.models.inventory import FileInventory
 
 
 app = typer.Typer(
@@ -43,6 +35,9 @@ def _bootstrap(
     log_level: str,
     ai_call_depth: int,
     ruleset: Path | None,
+    jobs: int | None = None,
+    cache_dir: Path | None = None,
+    defer_cached: bool = False,
 ) -> None:
     """Parse Python files + initialise AI-analysis engine (once)."""
     if ctx.obj is None:
@@ -50,6 +45,8 @@ def _bootstrap(
     if "units" in ctx.obj:  # another sub-command already did this
         return
 
+    from lintai.cli_support import init_common
+
     init_common(
         ctx,
         paths=paths,
@@ -57,6 +54,9 @@ def _bootstrap(
         log_level=log_level,
         ai_call_depth=ai_call_depth,
         ruleset=ruleset,
+        jobs=jobs,
+        cache_dir=cache_dir,
+        defer_cached=defer_cached,
     )
 
 
@@ -96,6 +96,51 @@ def find_issues_cmd(
     output: Path = Option(
         None, "--output", "-o", help="Write JSON output to file (default: stdout)"
     ),
+    jobs: int | None = Option(
+        None,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Parallel processes used to parse files (default: CPU count); "
+        "when given, detectors also run on that many processes",
+    ),
+    cache_dir: Path = Option(
+        DEFAULT_CACHE_DIR, "--cache-dir", help="Per-file analysis cache directory"
+    ),
+    no_cache: bool = Option(
+        False,
+        "--no-cache",
+        help="Analyse every file from scratch and skip the LLM reply cache "
+        "(nothing is read from or written to --cache-dir)",
+    ),
+    since: str | None = Option(
+        None,
+        "--since",
+        help="Only report files changed since this git ref (plus files whose "
+        "AI status those changes flip)",
+    ),
+    llm_concurrency: int = Option(
+        4,
+        "--llm-concurrency",
+        min=1,
+        help="LLM audit requests sent in parallel (default 4)",
+    ),
+    llm_cache: bool = Option(
+        True,
+        "--llm-cache/--no-llm-cache",
+        help="Reuse LLM audit replies cached under --cache-dir (default on)",
+    ),
+    llm_batch: int = Option(
+        1,
+        "--llm-batch",
+        min=1,
+        help="Audit up to N functions per LLM request (default 1: no batching)",
+    ),
+    llm_prefilter: bool = Option(
+        True,
+        "--llm-prefilter/--no-llm-prefilter",
+        help="Skip LLM audits of functions proven clean by static checks",
+    ),
 ):
     _bootstrap(
         ctx,
@@ -104,12 +149,34 @@ def find_issues_cmd(
         log_level=log_level,
         ai_call_depth=ai_call_depth,
         ruleset=ruleset,
+        jobs=jobs,
+        cache_dir=None if no_cache else cache_dir,
     )
 
+    import lintai.engine as _engine
+    from lintai.core import report
+    from lintai.detectors import llm_code_audit, run_units
+    from lintai.engine.incremental import GitError, units_to_rescan
+    from lintai.llm import cache as _llm_cache
+
+    _llm_cache.response_cache = (
+        _llm_cache.ResponseCache.open(cache_dir) if llm_cache and not no_cache else None
+    )
+    llm_code_audit.batch_size = llm_batch
+    llm_code_audit.prefilter = llm_prefilter
+
     units = ctx.obj["units"]
-    findings = []
-    for u in units:
-        findings.extend(run_all(u))
+    if since:
+        try:
+            units = units_to_rescan(
+                units, _engine.ai_analyzer, since, cache=ctx.obj["cache"]
+            )
+        except GitError as exc:
+            ctx.fail(f"--since {since}: {exc}")
+
+    # detector workers re-parse every file, so only when asked for
+    findings = run_units(units, concurrency=llm_concurrency, jobs=jobs or 1)
+    llm_code_audit.log_snippet_stats()
 
     # Save full report with LLM usage - use first path for report name
     path_for_report = str(paths[0]) if paths else "unknown"
@@ -309,6 +376,19 @@ def catalog_ai_cmd(
         "-g",
         help="Include full call-graph payload for visualization.",
     ),
+    jobs: int | None = Option(
+        None,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Parallel processes used to parse files (default: CPU count)",
+    ),
+    cache_dir: Path = Option(
+        DEFAULT_CACHE_DIR, "--cache-dir", help="Per-file analysis cache directory"
+    ),
+    no_cache: bool = Option(
+        False, "--no-cache", help="Analyse every file from scratch (no cache)"
+    ),
 ):
     """
     Analyzes the codebase to produce a unified inventory of AI components,
@@ -321,6 +401,9 @@ def catalog_ai_cmd(
         log_level=log_level,
         ai_call_depth=ai_call_depth,
         ruleset=ruleset,
+        jobs=jobs,
+        cache_dir=None if no_cache else cache_dir,
+        defer_cached=True,  # cached files need no tree here
     )
 
     units = ctx.obj["units"]
@@ -358,10 +441,18 @@ def ui_cmd(
     port: int = Option(8501, "--port", "-p", help="Port to listen on"),
     reload: bool = Option(False, "--reload", help="Auto-reload on code changes"),
     log_level: str = Option("INFO", "--log-level", "-l", help="Logging level"),
+    warm_worker: bool = Option(
+        False,
+        "--warm-worker",
+        help="Run scans inside the server, reusing LLM clients and connections",
+    ),
 ):
     """
     Start FastAPI + React UI.
     """
+    import uvicorn
+    from lintai.cli_support import init_common
+
     # Initialize logging with the specified level
     init_common(
         ctx,
@@ -376,6 +467,11 @@ def ui_cmd(
     from lintai.ui.server import set_server_log_level
 
     set_server_log_level(log_level)
+    if warm_worker:
+        from lintai.ui.server import enable_audit_worker
+
+        os.environ["LINTAI_UI_WARM_WORKER"] = "1"
+        enable_audit_worker()
 
     uvicorn.run(
         "lintai.ui.server:app",
@@ -1,18 +1,24 @@
 # lintai/cli_support.py
 from __future__ import annotations
-import logging, os
+import ast, logging, os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from itertools import chain, islice
 from pathlib import Path
-from typing import Iterable, List
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Sequence
 
 import pathspec
-from typer import Context
 
 from lintai.core.loader import load_plugins
-from lintai.dsl.loader import load_rules
 from lintai.engine.python_ast_unit import PythonASTUnit
 from lintai.engine import initialise as _init_ai_engine
+from lintai.engine.cache import AnalysisCache
 from lintai.llm import budget
 
+if TYPE_CHECKING:
+    from typer import Context
+
 _DEFAULT_FMT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
 logging.basicConfig(level=logging.INFO, format=_DEFAULT_FMT)
 logger = logging.getLogger("lintai.cli")
@@ -28,6 +34,12 @@ for n in _NOISY_HTTP_LOGGERS:
 
 
 # ------------------------------------------------------------------ utils
+class _IgnoreSpec(pathspec.PathSpec):
+    """A PathSpec that remembers the resolved ignore file it was read from."""
+
+    source: Path | None = None
+
+
 def _load_ignore(search_root: Path) -> pathspec.PathSpec:
     candidates = []
 
@@ -46,9 +58,11 @@ def _load_ignore(search_root: Path) -> pathspec.PathSpec:
             p = base / name
             if p.is_file():
                 logger.info("Loading ignore patterns from %s", p)
-                return pathspec.PathSpec.from_lines(
+                spec = _IgnoreSpec.from_lines(
                     "gitwildmatch", p.read_text().splitlines()
                 )
+                spec.source = p.resolve()
+                return spec
 
     logger.info(
         "No .lintaiignore or .gitignore found in %s or CWD. Will not ignore any files.",
@@ -57,15 +71,71 @@ def _load_ignore(search_root: Path) -> pathspec.PathSpec:
     return pathspec.PathSpec.from_lines("gitwildmatch", [])
 
 
-def iter_python_files(root: Path, ignore_spec: pathspec.PathSpec) -> Iterable[Path]:
+# per-directory ignore files, in precedence order (same as `_load_ignore`)
+_IGNORE_FILES = (".lintaiignore", ".gitignore")
+
+
+def _is_ignored(path: str, specs: Sequence[tuple[pathspec.PathSpec, int]]) -> bool:
+    """*path* is matched against each spec relative to the spec's directory."""
+    if os.sep != "/":
+        path = path.replace(os.sep, "/")
+    return any(spec.match_file(path[cut:]) for spec, cut in specs)
+
+
+def iter_python_files(root: Path, ignore_spec: pathspec.PathSpec) -> Iterator[Path]:
+    """
+    Yield ``*.py`` files under *root*, depth-first with entries sorted by name.
+
+    Ignored directories are pruned before they are listed, and a
+    ``.lintaiignore`` (else ``.gitignore``) found in any sub-directory applies
+    to everything below it, matched relative to that directory.  Symlinked
+    directories are not followed.  The file *ignore_spec* was loaded from
+    (see `_load_ignore`) is not read a second time.
+    """
     if root.is_file():
         if root.suffix == ".py":
             yield root
         return
-    for p in root.rglob("*.py"):
-        if ignore_spec.match_file(p.relative_to(root).as_posix()):
+
+    loaded = getattr(ignore_spec, "source", None)
+    stack = [(str(root), ((ignore_spec, len(str(root)) + 1),))]
+    while stack:
+        current, specs = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError as exc:
+            logger.warning("Cannot list %s: %s", current, exc)
             continue
-        yield p
+
+        names = {e.name for e in entries}
+        for name in _IGNORE_FILES:
+            if name in names:
+                fp = os.path.join(current, name)
+                if loaded is not None and Path(fp).resolve() == loaded:
+                    break  # already in *specs*
+                logger.debug("Loading ignore patterns from %s", fp)
+                try:
+                    lines = Path(fp).read_text().splitlines()
+                except (OSError, UnicodeDecodeError) as exc:
+                    logger.warning("Cannot read %s: %s", fp, exc)
+                    break
+                spec = pathspec.PathSpec.from_lines("gitwildmatch", lines)
+                specs = (*specs, (spec, len(current) + 1))
+                break
+
+        subdirs = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not _is_ignored(entry.path + "/", specs):
+                        subdirs.append(entry.path)
+                elif entry.name.endswith(".py") and entry.is_file():
+                    if not _is_ignored(entry.path, specs):
+                        yield Path(entry.path)
+            except OSError:
+                continue
+        stack.extend((d, specs) for d in reversed(subdirs))
 
 
 def maybe_load_env(env_path: Path | None) -> None:
@@ -106,37 +176,126 @@ def maybe_load_env(env_path: Path | None) -> None:
     return
 
 
-def build_ast_units(path: Path, ignore_spec: pathspec.PathSpec) -> List[PythonASTUnit]:
+# below this many files a process pool costs more than it saves
+_MIN_FILES_FOR_POOL = 32
+# paths handed to a parser worker at a time (the total is not known up front)
+_POOL_CHUNK = 8
+
+
+def default_jobs() -> int:
+    """Number of parser processes used when ``--jobs`` is not given."""
+    return os.cpu_count() or 1
+
+
+def _parse_file(
+    fp: Path, cache: AnalysisCache | None = None
+) -> tuple[str | None, ast.Module | None, Exception | None]:
+    """
+    Read, decode and parse *fp*.  Runs inside worker processes, so errors are
+    returned (not raised) and logged by the parent in file order.
+
+    With *cache*, files that have an analysis-cache entry are only read; their
+    tree is parsed lazily, in the calling process, if somebody needs it.
+    """
+    try:
+        text = fp.read_text(encoding="utf-8")
+        if cache is not None and cache.has(cache.key(fp, text)):
+            return text, None, None
+        return text, ast.parse(text, filename=str(fp)), None
+    except Exception as exc:
+        return None, None, exc
+
+
+def _parse_files(
+    files: Iterable[Path], jobs: int, cache: AnalysisCache | None = None
+) -> Iterator[tuple[Path, tuple]]:
+    """
+    Yield ``(path, _parse_file result)`` in the *same order* as *files*.
+
+    *files* may be a lazy stream: workers start parsing as soon as the first
+    chunk is discovered instead of waiting for the whole tree to be listed.
+    """
+    parse = partial(_parse_file, cache=cache)
+    files = iter(files)
+    head = list(islice(files, _MIN_FILES_FOR_POOL))
+    if jobs <= 1 or len(head) < _MIN_FILES_FOR_POOL:
+        for fp in chain(head, files):
+            yield fp, parse(fp)
+        return
+
+    submitted: list[Path] = []
+
+    def _record(stream: Iterable[Path]) -> Iterator[Path]:
+        for fp in stream:
+            submitted.append(fp)
+            yield fp
+
+    try:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            # Executor.map submits while it consumes the stream and preserves
+            # input order → deterministic unit list
+            results = list(
+                pool.map(parse, _record(chain(head, files)), chunksize=_POOL_CHUNK)
+            )
+    except (OSError, BrokenProcessPool) as exc:
+        logger.warning("Parser pool unavailable (%s) – parsing serially", exc)
+        for fp in chain(submitted, files):
+            yield fp, parse(fp)
+        return
+    yield from zip(submitted, results)
+
+
+def build_ast_units(
+    path: Path,
+    ignore_spec: pathspec.PathSpec,
+    jobs: int | None = None,
+    cache: AnalysisCache | None = None,
+    *,
+    defer_cached: bool = False,
+) -> List[PythonASTUnit]:
     """
     Finds all python files, creates a shared project_root for them, and
     builds a PythonASTUnit for each one.
-    """
-    units: list[PythonASTUnit] = []
 
-    # --- NEW: Collect all file paths into a list first ---
-    python_files = list(iter_python_files(path, ignore_spec))
+    Discovery is streamed into the parser, which is fanned out over *jobs*
+    processes (default: CPU count); units are returned in discovery order
+    regardless of *jobs*.  With *defer_cached* files that hit *cache* are not
+    parsed at all – only for commands that never look at the trees
+    (catalog-ai); find-issues needs every tree, best parsed in the pool.
+    """
+    jobs = default_jobs() if jobs is None else jobs
+    discovered: list[Path] = []
+    parsed = []
+    for fp, (text, tree, exc) in _parse_files(
+        iter_python_files(path, ignore_spec), jobs, cache if defer_cached else None
+    ):
+        discovered.append(fp)
+        if isinstance(exc, UnicodeDecodeError):
+            logger.warning("Skipping non-utf8 file %s", fp)
+            continue
+        if exc is not None:
+            logger.error("Failed to parse %s: %s", fp, exc)
+            continue
+        parsed.append((fp, text, tree))
 
-    if not python_files:
+    if not parsed:
         return []
 
-    # --- NEW: Determine a common root path for clean module names ---
-    # This ensures that module names are relative and clean, not long absolute paths.
-    if len(python_files) == 1:
-        project_root = python_files[0].parent
+    # Common root of everything discovered → relative, clean module names
+    if len(discovered) == 1:
+        project_root = discovered[0].parent
     else:
-        project_root = Path(os.path.commonpath([str(p) for p in python_files]))
+        project_root = Path(os.path.commonpath([str(fp) for fp in discovered]))
 
-    # --- MODIFIED: Loop through the collected files ---
-    for fp in python_files:
+    units: list[PythonASTUnit] = []
+    for fp, text, tree in parsed:
         try:
             # Pass the calculated project_root to the constructor
             units.append(
                 PythonASTUnit(
-                    fp, fp.read_text(encoding="utf-8"), project_root=project_root
+                    fp, text, project_root=project_root, tree=tree, lazy=tree is None
                 )
             )
-        except UnicodeDecodeError:
-            logger.warning("Skipping non-utf8 file %s", fp)
         except Exception as e:
             logger.error("Failed to parse %s: %s", fp, e)
 
@@ -151,6 +310,9 @@ def init_common(
     log_level: str,
     ai_call_depth: int,
     ruleset: Path | None,
+    jobs: int | None = None,
+    cache_dir: Path | None = None,
+    defer_cached: bool = False,
 ):
     """Shared bootstrap executed before *every* command."""
     # logging
@@ -184,18 +346,28 @@ def init_common(
     base_path = paths[0] if paths else Path.cwd()
     ignore_spec = _load_ignore(base_path)
 
+    # per-file analysis cache (None → always analyse from scratch)
+    cache = AnalysisCache.for_run(cache_dir, ruleset) if cache_dir else None
+
     # AST + AI engine - collect units from all paths
     units = []
     for path in paths:
-        units.extend(build_ast_units(path, ignore_spec))
-    _init_ai_engine(units, depth=ai_call_depth)
+        units.extend(
+            build_ast_units(
+                path, ignore_spec, jobs=jobs, cache=cache, defer_cached=defer_cached
+            )
+        )
+    _init_ai_engine(units, depth=ai_call_depth, cache=cache)
 
     load_plugins()
     if ruleset:
+        from lintai.dsl.loader import load_rules  # pulls in yaml
+
         load_rules(ruleset)
 
     # make them available to the command via Typer's context obj
     ctx.obj = {
         "units": units,
         "ignore_spec": ignore_spec,
+        "cache": cache,
     }
@@ -9,10 +9,12 @@ and it will be executed automatically.
 import importlib
 import pkgutil
 import sys
-from typing import Callable, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Optional
 
-from lintai.engine.visitor import _DispatchVisitor
-from lintai.detectors.base import SourceUnit  # local import is fine
+from lintai.engine.visitor import DispatchTable, _DispatchVisitor
+from lintai.detectors.base import Deferred, SourceUnit  # local import is fine
 from lintai.core.finding import Finding
 import logging
 
@@ -25,17 +27,23 @@ logger = logging.getLogger(__name__)
 _REGISTRY: Dict[str, List[Callable]] = {}
 
 
-def register(rule_id: str, *, scope: str = "module", node_types=()):
+def register(
+    rule_id: str, *, scope: str = "module", node_types=(), parallel: bool = True
+):
     """
     scope: "module"  – run once on the top‑level Module node   (default)
            "node"    – run on every AST node whose type is in node_types
     node_types: tuple of ast.* classes, only for scope="node"
+    parallel: False keeps the detector in the main process under
+              ``find-issues --jobs`` (it yields `Deferred` work or keeps
+              per-scan state)
     """
 
     def _decorator(fn):
         fn._lintai_rule_id = rule_id
         fn._lintai_scope = scope
         fn._lintai_node_types = node_types
+        fn._lintai_parallel = parallel
         _REGISTRY.setdefault(rule_id, []).append(fn)
         return fn
 
@@ -67,11 +75,144 @@ def _discover_builtin():
 # --------------------------------------------------------------------------- #
 # 3. public API: run all detectors                                            #
 # --------------------------------------------------------------------------- #
-def run_all(unit: SourceUnit) -> List[Finding]:
-    from lintai.engine.visitor import _DispatchVisitor  # deferred import
-
+def _detectors() -> List[Callable]:
+    """Every registered detector, in registration order."""
     _discover_builtin()
-    detectors = [d for lst in _REGISTRY.values() for d in lst]
-    visitor = _DispatchVisitor(unit, detectors)
+    return [d for lst in _REGISTRY.values() for d in lst]
+
+
+# registry contents the cached table was compiled from, and the table
+_TABLE: Optional[tuple[tuple, DispatchTable]] = None
+
+
+def _dispatch_table() -> DispatchTable:
+    """The registry compiled for dispatch; recompiled only when it changed."""
+    global _TABLE
+    detectors = tuple(_detectors())
+    if _TABLE is None or _TABLE[0] != detectors:
+        _TABLE = (detectors, DispatchTable.compile(detectors))
+    return _TABLE[1]
+
+
+def _collect(unit: SourceUnit, table: Optional[DispatchTable] = None) -> list:
+    """Findings of one unit; may still contain `Deferred` placeholders."""
+    visitor = _DispatchVisitor(unit, table or _dispatch_table())
     visitor.visit(unit.tree)
     return visitor.findings
+
+
+_FAILED = object()  # result of a Deferred whose work crashed
+
+
+def _single(item: Deferred) -> list:
+    return [item.work()]
+
+
+def _plan(pending: List[Deferred]) -> List[tuple]:
+    """
+    Split *pending* into ``(indices, fn)`` tasks ordered by first index;
+    *fn()* returns one result per index.
+    """
+    tasks = []
+    batched: Dict[int, List[int]] = {}  # id(batcher) → indices, first-seen order
+    for i, item in enumerate(pending):
+        if item.batcher is None:
+            tasks.append(([i], partial(_single, item)))
+        else:
+            batched.setdefault(id(item.batcher), []).append(i)
+
+    for idx in batched.values():
+        batcher = pending[idx[0]].batcher
+        payloads = [pending[i].payload for i in idx]
+        try:
+            groups = batcher.plan(payloads)
+        except Exception as exc:
+            logger.error("Detector %s crashed: %s", pending[idx[0]].detector, exc)
+            groups = [[k] for k in range(len(idx))]
+        for group in groups:
+            members = [idx[k] for k in group]
+            if len(members) == 1:
+                tasks.append((members, partial(_single, pending[members[0]])))
+            else:
+                group_payloads = [payloads[k] for k in group]
+                tasks.append((members, partial(batcher.run, group_payloads)))
+
+    tasks.sort(key=lambda t: t[0][0])
+    return tasks
+
+
+def _run(pending: List[Deferred], task: tuple) -> list:
+    members, fn = task
+    detector = pending[members[0]].detector
+    try:
+        results = fn()
+    except Exception as exc:
+        logger.error("Detector %s crashed: %s", detector, exc)
+        return [_FAILED] * len(members)
+    if len(results) != len(members):
+        logger.error("Detector %s: batch returned %d results", detector, len(results))
+        return [_FAILED] * len(members)
+    return results
+
+
+def _finish(item: Deferred, result) -> List[Finding]:
+    if result is _FAILED:
+        return []
+    try:
+        return list(item.finish(result))
+    except Exception as exc:
+        logger.error("Detector %s crashed: %s", item.detector, exc)
+        return []
+
+
+def run_units(
+    units: Iterable[SourceUnit], concurrency: int = 1, jobs: int = 1
+) -> List[Finding]:
+    """
+    Run all detectors on *units* and return their findings in unit order.
+
+    Detectors run serially, or – with *jobs* > 1 on big enough scans – in
+    that many worker processes (see `lintai.detectors._workers`); findings
+    come out in the same order either way.  The `Deferred` work they yield
+    (LLM audits) is gathered across *all* units first, packed into batches
+    where the detector supplies a `Batcher`, and executed on up to
+    *concurrency* threads.  Results are spliced back where each placeholder
+    was yielded, so the output does not depend on completion order.
+    """
+    units = list(units)
+    collected = None
+    if jobs > 1:
+        from lintai.detectors._workers import collect_in_workers
+
+        collected = collect_in_workers(units, jobs)
+    if collected is None:
+        table = _dispatch_table()
+        collected = [_collect(u, table) for u in units]
+    pending = [f for lst in collected for f in lst if isinstance(f, Deferred)]
+    tasks = _plan(pending)
+
+    run = partial(_run, pending)
+    if concurrency <= 1 or len(tasks) <= 1:
+        outcomes = list(map(run, tasks))
+    else:
+        workers = min(concurrency, len(tasks))
+        with ThreadPoolExecutor(workers, thread_name_prefix="lintai-audit") as pool:
+            outcomes = list(pool.map(run, tasks))  # input order
+    results = [None] * len(pending)
+    for (members, _), outcome in zip(tasks, outcomes):
+        for i, result in zip(members, outcome):
+            results[i] = result
+    resolved = iter(results)
+
+    findings: List[Finding] = []
+    for lst in collected:
+        for f in lst:
+            if isinstance(f, Deferred):
+                findings.extend(_finish(f, next(resolved)))
+            else:
+                findings.append(f)
+    return findings
+
+
+def run_all(unit: SourceUnit, concurrency: int = 1) -> List[Finding]:
+    return run_units([unit], concurrency)
@@ -0,0 +1,158 @@
+"""
+Detector execution in worker processes (``find-issues --jobs``).
+
+Once `ProjectAnalyzer` has finished, detectors only *read* its results, so
+units can be spread over a process pool.  Each worker gets, once, a
+read-only `AnalyzerSnapshot` (AI functions and modules, inventories, the
+call graph …) plus the source of every unit, and re-parses the units it is
+handed.  Detectors that must stay in the main process – ``parallel=False``
+ones (LLM audits yield `Deferred` work and keep per-scan state) and ones
+that cannot be pickled (closures) – run there, on the units they apply to.
+
+Every finding carries a ``(node, detector)`` sort key (see
+`_DispatchVisitor`), so the two halves of a unit merge back into exactly
+the order of a serial run.  Detector crashes are contained per detector, as
+in a serial run; a unit whose worker result cannot come back (it yielded
+`Deferred` work, a finding does not pickle, or the pool broke) is simply
+re-run in-process with every detector.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from operator import itemgetter
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence
+
+import lintai.engine as _engine
+from lintai.detectors import _collect, _detectors, _dispatch_table
+from lintai.detectors.base import Deferred, SourceUnit
+from lintai.engine.python_ast_unit import PythonASTUnit
+from lintai.engine.visitor import DispatchTable, _DispatchVisitor
+
+logger = logging.getLogger(__name__)
+
+# below this many units a process pool costs more than it saves
+_MIN_UNITS_FOR_POOL = 32
+# units handed to a worker at a time
+_POOL_CHUNK = 4
+
+# worker-side state, set up once by `_init_worker`
+_UNITS: List[PythonASTUnit] = []
+_REMOTE: Optional[DispatchTable] = None
+
+
+def _spec(unit: PythonASTUnit) -> tuple:
+    return (unit.path, unit.source, unit.modname, unit.is_ai_module)
+
+
+def _init_worker(snapshot, specs: Sequence[tuple], detectors, ranks) -> None:
+    global _REMOTE
+    units = []
+    for path, source, modname, is_ai_module in specs:
+        unit = PythonASTUnit(path, source, Path(path).parent, lazy=True)
+        unit.modname, unit.is_ai_module = modname, is_ai_module
+        units.append(unit)
+    if snapshot is not None:
+        snapshot.attach(units)
+    _engine.ai_analyzer = snapshot
+    _UNITS[:] = units
+    _REMOTE = DispatchTable.compile(detectors, ranks)
+
+
+def _collect_remote(i: int) -> Optional[list]:
+    """``(key, finding)`` pairs of unit *i*; None to have the parent run it."""
+    unit = _UNITS[i]
+    try:
+        visitor = _DispatchVisitor(unit, _REMOTE, keyed=True)
+        visitor.visit(unit.tree)
+        pairs = list(zip(visitor.keys, visitor.findings))
+        if any(isinstance(f, Deferred) for _, f in pairs):
+            return None
+        pickle.dumps(pairs)
+    except Exception as exc:
+        logger.debug("Unit %s goes back to the main process: %s", unit.path, exc)
+        return None
+    return pairs
+
+
+def _applies(table: DispatchTable, unit: PythonASTUnit) -> bool:
+    """Whether a visitor over *table* would call any detector on *unit*."""
+    return bool(table.module) or any(unit.nodes_of(t) for t in table.by_type)
+
+
+def _picklable(fn: Callable) -> bool:
+    try:
+        pickle.dumps(fn)
+    except Exception:
+        return False
+    return True
+
+
+def collect_in_workers(units: List[SourceUnit], jobs: int) -> Optional[list]:
+    """
+    Per-unit findings (as `_collect` returns them) computed on *jobs*
+    processes, or None when the scan is too small or not suited for a pool –
+    the caller then runs it serially.
+    """
+    if len(units) < _MIN_UNITS_FOR_POOL or not all(
+        isinstance(u, PythonASTUnit) for u in units
+    ):
+        return None
+
+    detectors = _detectors()
+    remote, local = [], []
+    for rank, fn in enumerate(detectors):
+        portable = getattr(fn, "_lintai_parallel", True) and _picklable(fn)
+        (remote if portable else local).append((rank, fn))
+    if not remote:
+        return None
+
+    # workers also need the files `source_of()` may point into
+    analyzer = _engine.ai_analyzer
+    snapshot = analyzer.snapshot() if hasattr(analyzer, "snapshot") else None
+    seen = {u.path for u in units}
+    others = [u for u in getattr(analyzer, "units", ()) if u.path not in seen]
+    specs = [_spec(u) for u in [*units, *others]]
+
+    results: list = [None] * len(units)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=min(jobs, len(units)),
+            initializer=_init_worker,
+            initargs=(
+                snapshot,
+                specs,
+                [fn for _, fn in remote],
+                [rank for rank, _ in remote],
+            ),
+        ) as pool:
+            outcomes = pool.map(
+                _collect_remote, range(len(units)), chunksize=_POOL_CHUNK
+            )
+            for i, outcome in enumerate(outcomes):
+                results[i] = outcome
+    except (OSError, BrokenProcessPool, pickle.PicklingError) as exc:
+        logger.warning("Detector pool failed (%s) – finishing in-process", exc)
+
+    table = _dispatch_table()
+    local_table = DispatchTable.compile(
+        [fn for _, fn in local], [rank for rank, _ in local]
+    )
+    collected = []
+    for unit, pairs in zip(units, results):
+        if pairs is None:
+            collected.append(_collect(unit, table))
+            continue
+        if local and _applies(local_table, unit):
+            visitor = _DispatchVisitor(unit, local_table, keyed=True)
+            visitor.visit(unit.tree)
+            pairs = heapq.merge(
+                pairs, zip(visitor.keys, visitor.findings), key=itemgetter(0)
+            )
+        collected.append([f for _, f in pairs])
+    return collected
@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable
+from typing import Any, Callable, Iterable, List, Optional, Sequence
+
+from lintai.core.finding import Finding
 
 
 class SourceUnit(ABC):
@@ -15,3 +18,37 @@ class SourceUnit(ABC):
 
     @abstractmethod
     def has_call(self, name: str, node) -> bool: ...
+
+
+@dataclass(frozen=True)
+class Deferred:
+    """
+    Placeholder a detector yields instead of a `Finding` for slow, independent
+    work such as an LLM round trip.
+
+    `lintai.detectors.run_units` runs every ``work()`` of a scan on a bounded
+    thread pool, then – back on the calling thread and in collection order –
+    replaces the placeholder with whatever ``finish(result)`` yields.
+
+    Items that share a *batcher* may instead be resolved together: the runner
+    hands their *payload*s to `Batcher.plan` and runs each multi-item group
+    with one `Batcher.run` call (single-item groups still use ``work()``).
+    """
+
+    detector: str
+    work: Callable[[], Any]
+    finish: Callable[[Any], Iterable[Finding]]
+    payload: Any = None
+    batcher: Optional["Batcher"] = None
+
+
+class Batcher(ABC):
+    """Resolves the payloads of several `Deferred` items with shared requests."""
+
+    @abstractmethod
+    def plan(self, payloads: Sequence[Any]) -> List[List[int]]:
+        """Partition ``range(len(payloads))`` into ordered groups."""
+
+    @abstractmethod
+    def run(self, payloads: Sequence[Any]) -> List[Any]:
+        """One result per payload – the same value ``work()`` would return."""
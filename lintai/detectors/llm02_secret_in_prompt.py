@@ -19,24 +19,20 @@ def detect_secret_in_prompt(unit):
 
     # --- Pass 1: Find all variables that are assigned a tainted f-string ---
     tainted_variables = {}
-    for node in ast.walk(unit.tree):
-        if isinstance(node, ast.Assign):
-            if len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
-                target_var_name = node.targets[0].id
-                if isinstance(node.value, ast.JoinedStr):
-                    for value_node in node.value.values:
-                        if isinstance(value_node, ast.FormattedValue) and isinstance(
-                            value_node.value, ast.Name
-                        ):
-                            if SECRET_VAR_REGEX.search(value_node.value.id):
-                                tainted_variables[target_var_name] = node.lineno
+    for node in unit.nodes_of(ast.Assign):
+        if len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            target_var_name = node.targets[0].id
+            if isinstance(node.value, ast.JoinedStr):
+                for value_node in node.value.values:
+                    if isinstance(value_node, ast.FormattedValue) and isinstance(
+                        value_node.value, ast.Name
+                    ):
+                        if SECRET_VAR_REGEX.search(value_node.value.id):
+                            tainted_variables[target_var_name] = node.lineno
 
     # --- Pass 2: Check if any tainted variables are used in an LLM call ---
-    for node in ast.walk(unit.tree):
-        # We only care about Call nodes
-        if not isinstance(node, ast.Call):
-            continue
-
+    # (both passes read the unit's node-type index instead of walking the tree)
+    for node in unit.nodes_of(ast.Call):
         # --- THIS IS THE CORRECTED LOGIC ---
         call_name = get_full_attr_name(node.func)
         if "ChatCompletion.create" not in call_name:
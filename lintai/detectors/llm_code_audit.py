@@ -13,24 +13,166 @@ import json
 import logging
 import re
 import textwrap
-from typing import Optional
+import threading
+from collections import OrderedDict
+from functools import partial
+from typing import NamedTuple, Optional
 
 from lintai.engine.analysis import ProjectAnalyzer
 from lintai.core.finding import Finding
 from lintai.detectors import register
+from lintai.detectors.base import Batcher, Deferred
+from lintai.llm import cache as _llm_cache
 from lintai.llm import get_client
+from lintai.llm.base import reply_was_billed
+from lintai.llm.json_stream import IncrementalJSON
+from lintai.llm.budget import manager as _budget
+from lintai.llm.token_util import approx_tokens, estimate_tokens
 from lintai.engine.classification import is_ai_related as is_ai_call
 from lintai.engine.ast_utils import get_full_attr_name
 
 logger = logging.getLogger(__name__)
-_CLIENT = get_client()  # dummy stub if provider missing
+_CLIENT = None  # created on first use – provider SDKs are slow to import
+
+
+def _client():
+    """The LLM client (dummy stub if provider missing), created lazily."""
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = get_client()
+    return _CLIENT
+
+
+def reset_run_state() -> None:
+    """Forget the client and per-scan de-duplication before another scan in
+    the same process (the UI's warm audit worker)."""
+    global _CLIENT
+    _CLIENT = None
+    _SEEN_FUNCS.clear()
+    _EMITTED.clear()
+    _SNIPPETS.clear()
+
 
 # --------------------------------------------------------------------------- #
 # constants / patterns                                                        #
 # --------------------------------------------------------------------------- #
+# part of the response-cache key – bump whenever the prompt wording changes
+_PROMPT_VERSION = 3
+_MAX_REPLY_TOK = 180  # per audited function
+
+#: functions packed into one audit request (``find-issues --llm-batch``);
+#: 1 sends every function on its own
+batch_size = 1
+
+#: skip functions the static pre-filter proves clean (``--no-llm-prefilter``)
+prefilter = True
+
+_PREAMBLE = textwrap.dedent(
+    """
+    ## Context
+    You are a security expert reviewing Python source code for **OWASP Top-10 for LLM Applications** risks:
+    1. LLM01:2025 Prompt Injection
+    2. LLM02:2025 Sensitive Information Disclosure
+    3. LLM03:2025 Supply Chain
+    4. LLM04:2025 Data and Model Poisoning
+    5. LLM05:2025 Improper Output Handling
+    6. LLM06:2025 Excessive Agency
+    7. LLM07:2025 System Prompt Leakage
+    8. LLM08:2025 Vector and Embedding Weaknesses
+    9. LLM09:2025 Misinformation
+    10. LLM10:2025 Unbounded Consumption
+
+    You will receive:
+
+    • **LOCAL FUNCTION**  – the code to audit
+    • **CALL-FLOW CONTEXT** – snippets of its immediate callers / callees (for reference only)
+
+    ### NON-NEGOTIABLE RULES
+    1. If a LOCAL FUNCTION is merely a thin wrapper (no extra logic), its verdict is `{"issue": "clean"}`.
+    2. Report **only** vulnerabilities that are **inside that LOCAL FUNCTION itself**.
+    3. Ignore risks that exist *solely* in CALL-FLOW CONTEXT.
+    """
+).strip()
+
+_SINGLE_TASK = textwrap.dedent(
+    """
+    ### TASK
+    Return **exactly one line of JSON** with keys:
+    `"issue" · "sev" · "fix" · "owasp" · ("mitre" optional)`.
+    Use `"issue": "clean"` when no problem is present.
+    """
+).strip()
+
+_BATCH_TASK = textwrap.dedent(
+    """
+    ### TASK
+    Audit every LOCAL FUNCTION below on its own.  Return **one JSON object**
+    `{"results": [...]}` holding exactly one verdict per function, each with keys:
+    `"id" · "issue" · "sev" · "fix" · "owasp" · ("mitre" optional)`,
+    where `"id"` is the number in the function's header.
+    Use `"issue": "clean"` when no problem is present.
+    """
+).strip()
+
+# static prefixes sent as the `system` part, so providers with prompt caching
+# only bill them in full once; the function blocks are the variable suffix
+_SINGLE_SYSTEM = f"{_PREAMBLE}\n\n{_SINGLE_TASK}"
+_BATCH_SYSTEM = f"{_PREAMBLE}\n\n{_BATCH_TASK}"
+
 _CODE_RE = re.compile(r"```(?:json)?\s*(\{.*?})\s*```", re.S | re.I)
+_BATCH_RE = re.compile(r"```(?:json)?\s*([\[{].*[\]}])\s*```", re.S | re.I)
 
 _SANITIZERS = {"escape_braces", "sanitize", "redact_secrets"}
+
+# calls that make a model reply dangerous however static the prompt was – a
+# function using any of them always goes to the LLM.  Names are matched after
+# import aliases are resolved (``from os import system``).
+_DANGEROUS_SINKS = {
+    "eval",
+    "exec",
+    "compile",
+    "__import__",
+    "os.system",
+    "os.popen",
+    "os.startfile",
+    "pickle.load",
+    "pickle.loads",
+    "marshal.loads",
+    "dill.loads",
+    "jsonpickle.decode",
+    "shelve.open",
+    "yaml.load",
+    "yaml.unsafe_load",
+    "importlib.import_module",
+    "runpy.run_module",
+    "runpy.run_path",
+    "jinja2.Template",
+    "markupsafe.Markup",
+    "flask.render_template_string",
+    "django.utils.safestring.mark_safe",
+    "sqlalchemy.text",
+}
+_DANGEROUS_PREFIXES = (
+    "subprocess.",
+    "os.exec",
+    "os.spawn",
+    "asyncio.create_subprocess_",
+)
+# method names dangerous whatever the receiver – DB cursors / ORMs and
+# template engines are rarely imported under a recognisable name
+_DANGEROUS_METHODS = {
+    "execute",
+    "executemany",
+    "executescript",
+    "raw",
+    "render",
+    "render_template_string",
+    "from_string",
+    "mark_safe",
+}
+# calls a model reply may be handed to without leaving the function's control
+_REPLY_READERS = {"print", "len", "str", "repr", "bool", "isinstance", "json.loads"}
+_LOG_METHODS = {"debug", "info", "warning", "warn", "error", "exception", "critical"}
 _SANITIZER_RE = re.compile(r"(^|\.)\s*(sanitize|escape|redact|clean)\w*$", re.I)
 
 _IGNORE_PREFIXES = (
@@ -49,7 +191,68 @@ import ast
 import textwrap
 
 
-def _snippet(node: ast.AST, src: str, max_lines: int = 60) -> str:
+class _SnippetMemo:
+    """
+    Bounded LRU of cleaned snippets, keyed by (unit path, node position).
+
+    Popular helpers show up as caller / callee of many audited functions;
+    the memo spares re-parsing and re-unparsing them each time.  Cleared
+    with the rest of the per-scan state (`reset_run_state`).
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items: OrderedDict[tuple, list[str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[list[str]]:
+        with self._lock:
+            lines = self._items.get(key)
+            if lines is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return lines
+
+    def put(self, key: tuple, lines: list[str]) -> None:
+        with self._lock:
+            self._items[key] = lines
+            self._items.move_to_end(key)
+            if len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            looked_up = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._items),
+                "hit_rate": round(self.hits / looked_up, 3) if looked_up else 0.0,
+            }
+
+
+_SNIPPETS = _SnippetMemo()
+
+
+def log_snippet_stats() -> dict:
+    """Log (at DEBUG) and return the snippet memo's counters for this scan."""
+    stats = _SNIPPETS.stats()
+    logger.debug("llm_code_audit: snippet memo %s", stats)
+    return stats
+
+
+def _snippet(
+    node: ast.AST, src: str, max_lines: int = 60, *, path: Optional[str] = None
+) -> str:
     """
     Return cleaned, dedented source for *node*, trimmed to *max_lines*.
 
@@ -58,11 +261,42 @@ def _snippet(node: ast.AST, src: str, max_lines: int = 60) -> str:
     • Drops single-line comments and blank lines.
     • Leaves triple-quoted strings that are *inside* the code logic
       (those are usually prompts we *do* want the model to see).
+
+    With *path* (the node's unit) the cleaned lines are memoised per scan.
     """
+    key = None
+    if path is not None and hasattr(node, "end_lineno"):
+        key = (
+            str(path),
+            node.lineno,
+            node.col_offset,
+            node.end_lineno,
+            node.end_col_offset,
+        )
+        lines = _SNIPPETS.get(key)
+        if lines is not None:
+            return _trim(lines, max_lines)
+
+    lines = _clean_lines(node, src)
+    if lines is None:
+        return "<code unavailable>"
+    if key is not None:
+        _SNIPPETS.put(key, lines)
+    return _trim(lines, max_lines)
+
+
+def _trim(lines: list[str], max_lines: int) -> str:
+    if len(lines) > max_lines:
+        lines = lines[:max_lines] + ["    # …trimmed…"]
+    return "\n".join(lines)
+
+
+def _clean_lines(node: ast.AST, src: str) -> Optional[list[str]]:
+    """Cleaned lines of *node* for `_snippet`; None when it has no source."""
     # --- 1. get raw text for the node -----------------------------------
     raw = ast.get_source_segment(src, node) or ""
     if not raw:
-        return "<code unavailable>"
+        return None
 
     # --- 2. parse & delete doc-strings ----------------------------------
     class _DocstringStripper(ast.NodeTransformer):
@@ -105,12 +339,7 @@ def _snippet(node: ast.AST, src: str, max_lines: int = 60) -> str:
 
     # --- 3. dedent + drop comments / blanks -----------------------------
     lines = textwrap.dedent(cleaned).splitlines()
-    lines = [ln for ln in lines if ln.strip() and not ln.lstrip().startswith("#")]
-
-    if len(lines) > max_lines:
-        lines = lines[:max_lines] + ["    # …trimmed…"]
-
-    return "\n".join(lines)
+    return [ln for ln in lines if ln.strip() and not ln.lstrip().startswith("#")]
 
 
 def _path_context(unit, func_node: ast.AST, max_funcs: int = 3) -> str:
@@ -133,7 +362,7 @@ def _path_context(unit, func_node: ast.AST, max_funcs: int = 3) -> str:
         for name in callers:
             try:
                 src_unit, node = ai_analyzer.source_of(name)  # (PythonASTUnit, ast.AST)
-                callers_src.append(_snippet(node, src_unit.source))
+                callers_src.append(_snippet(node, src_unit.source, path=src_unit.path))
             except Exception as e:
                 logger.debug(f"llm_code_audit: skipping caller {name} - no source: {e}")
 
@@ -144,7 +373,9 @@ def _path_context(unit, func_node: ast.AST, max_funcs: int = 3) -> str:
                 try:
                     src_unit, node = ai_analyzer.source_of(name)
                     san_callees.add(name)
-                    san_callee_blocks.append(_snippet(node, src_unit.source))
+                    san_callee_blocks.append(
+                        _snippet(node, src_unit.source, path=src_unit.path)
+                    )
                 except Exception as e:
                     logger.debug(
                         f"llm_code_audit: skipping sanitizer callee {name} - no source: {e}"
@@ -158,7 +389,7 @@ def _path_context(unit, func_node: ast.AST, max_funcs: int = 3) -> str:
         for name in other_callees:
             try:
                 src_unit, node = ai_analyzer.source_of(name)
-                callees_src.append(_snippet(node, src_unit.source))
+                callees_src.append(_snippet(node, src_unit.source, path=src_unit.path))
             except Exception as e:
                 logger.debug(f"llm_code_audit: skipping callee {name} - no source: {e}")
 
@@ -211,35 +442,29 @@ def _call_has_sanitised_args(node: ast.Call) -> bool:
     return all(_sanitised(a) for a in args_iter)
 
 
-def _get_enclosing_function_source(call: ast.Call, source: str, tree: ast.AST) -> str:
+def _get_enclosing_function_source(call: ast.Call, unit) -> str:
     """
-    Return the source text for the smallest `FunctionDef` that fully encloses
+    Return the source text for the smallest function that fully encloses
     *call*. Falls back to the call snippet when no enclosing function exists.
     """
-    lineno = call.lineno
-    best: Optional[ast.FunctionDef] = None
-
-    for node in ast.walk(tree):
-        if isinstance(node, ast.FunctionDef):
-            # Requires Python 3.8+ for end_lineno
-            start, end = node.lineno, getattr(node, "end_lineno", node.lineno)
-            if start <= lineno <= end:
-                # Choose the *innermost* function (greatest start line)
-                if best is None or start > best.lineno:
-                    best = node
-
+    # served from the unit's interval index of def ranges – no tree walk
+    best = unit.enclosing_function(call)
     target = best if best is not None else call
-    return ast.get_source_segment(source, target) or "<code unavailable>"
+    return ast.get_source_segment(unit.source, target) or "<code unavailable>"
 
 
 _SEEN_FUNCS: set[tuple[str, int]] = set()
 
 
-def _debug_ancestry(node):
-    chain = []
-    while node:
-        chain.append(f"{type(node).__name__}:{getattr(node,'lineno', '?')}")
-        node = getattr(node, "parent", None)
+def _debug_ancestry(node, unit):
+    chain = [f"{type(node).__name__}:{getattr(node,'lineno', '?')}"]
+    scope = unit.enclosing_def(node)
+    if scope is node:
+        scope = unit.parent_def(node)
+    while scope is not None:
+        chain.append(f"{type(scope).__name__}:{scope.lineno}")
+        scope = unit.parent_def(scope)
+    chain.append("Module")
     return " -> ".join(chain)
 
 
@@ -247,6 +472,7 @@ def _is_trivial_wrapper(
     fn: ast.FunctionDef | ast.AsyncFunctionDef,
     *,
     src: str,
+    path: Optional[str] = None,
 ) -> bool:
     """
     True **only when** the *cleaned* source of *fn* (with doc-strings,
@@ -263,7 +489,7 @@ def _is_trivial_wrapper(
     try:
         # Use the same cleaner that feeds the LLM so comments/doc-strings
         # never influence the result.
-        cleaned = _snippet(fn, src, max_lines=999_999)  # keep full body
+        cleaned = _snippet(fn, src, max_lines=999_999, path=path)  # full body
         tree = ast.parse(cleaned)
         body = (
             tree.body[0].body
@@ -285,20 +511,159 @@ def _is_trivial_wrapper(
         return False
 
 
-@register("AI_DETECTOR01", scope="node", node_types=(ast.Call,))
+def _call_name(call: ast.Call) -> str:
+    if isinstance(call.func, ast.Name):
+        return call.func.id
+    if isinstance(call.func, ast.Attribute):
+        return get_full_attr_name(call.func)
+    return ""
+
+
+def _is_constant(node: ast.AST) -> bool:
+    """Literal data only – strings, numbers, containers of them, static f-strings."""
+    if isinstance(node, ast.Constant):
+        return True
+    if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+        return all(_is_constant(e) for e in node.elts)
+    if isinstance(node, ast.Dict):
+        return all(
+            k is not None and _is_constant(k) and _is_constant(v)
+            for k, v in zip(node.keys, node.values)
+        )
+    if isinstance(node, ast.JoinedStr):
+        return all(isinstance(v, ast.Constant) for v in node.values)
+    return False
+
+
+def _is_sanitised(node: ast.AST) -> bool:
+    return isinstance(node, ast.Call) and _is_sanitizer(
+        _call_name(node).rsplit(".", 1)[-1]
+    )
+
+
+def _resolved(unit, name: str) -> str:
+    """*name* with its import alias resolved (``run`` → ``subprocess.run``)."""
+    from lintai.engine import ai_analyzer  # late import → no cycle
+
+    if ai_analyzer is None or not name:
+        return name
+    return ai_analyzer.resolve_name(unit.path, name)
+
+
+def _is_dangerous_sink(name: str) -> bool:
+    return (
+        name in _DANGEROUS_SINKS
+        or name.startswith(_DANGEROUS_PREFIXES)
+        or name.rsplit(".", 1)[-1] in _DANGEROUS_METHODS
+    )
+
+
+def _reply_stays_local(func_node: ast.AST, ai_calls: list[ast.Call]) -> bool:
+    """
+    True when the model's reply in *func_node* cannot reach code nobody
+    audits: it may be read, logged or sanitised, but not returned or
+    yielded (callers are only audited when their own names look AI-related),
+    handed to other calls, stored on objects or in containers, or bound to
+    ``global`` / ``nonlocal`` names.
+    """
+    ai = {id(c) for c in ai_calls}
+    tainted: set[str] = set()
+
+    def carries(expr: ast.AST) -> bool:
+        return any(
+            id(n) in ai or (isinstance(n, ast.Name) and n.id in tainted)
+            for n in ast.walk(expr)
+        )
+
+    flows = []  # (targets, value) of every binding in the function
+    for node in ast.walk(func_node):
+        if isinstance(node, ast.Assign):
+            flows.append((node.targets, node.value))
+        elif isinstance(node, (ast.AnnAssign, ast.AugAssign, ast.NamedExpr)):
+            if node.value is not None:
+                flows.append(([node.target], node.value))
+        elif isinstance(node, (ast.For, ast.AsyncFor, ast.comprehension)):
+            flows.append(([node.target], node.iter))
+        elif isinstance(node, ast.withitem) and node.optional_vars is not None:
+            flows.append(([node.optional_vars], node.context_expr))
+
+    changed = True
+    while changed:
+        changed = False
+        for targets, value in flows:
+            if not carries(value):
+                continue
+            for n in (n for t in targets for n in ast.walk(t)):
+                if isinstance(n, (ast.Attribute, ast.Subscript)) and isinstance(
+                    n.ctx, ast.Store
+                ):
+                    return False
+                if isinstance(n, ast.Name) and n.id not in tainted:
+                    tainted.add(n.id)
+                    changed = True
+
+    for node in ast.walk(func_node):
+        if isinstance(node, (ast.Global, ast.Nonlocal)) and tainted & set(node.names):
+            return False
+        if isinstance(node, (ast.Return, ast.Yield, ast.YieldFrom)):
+            if node.value is not None and carries(node.value):
+                return False
+            continue
+        if not isinstance(node, ast.Call) or id(node) in ai:
+            continue
+        if not any(carries(a) for a in (*node.args, *(k.value for k in node.keywords))):
+            continue  # e.g. reply.json() – reading the reply itself
+        name = _call_name(node)
+        method = name.rsplit(".", 1)[-1]
+        if name in _REPLY_READERS or method in _LOG_METHODS or _is_sanitizer(method):
+            continue
+        return False
+    return True
+
+
+def _static_verdict(unit, func_node) -> Optional[str]:
+    """
+    Why *func_node* is provably clean without an LLM audit, or None.
+
+    Deliberately conservative, the evidence is structural rather than the
+    name-based `is_user_tainted` heuristic: every AI call in the function
+    must take only constant arguments ("constant prompt") or constants and
+    sanitiser results ("sanitised prompt"), no call may reach a dangerous
+    sink (import aliases resolved), and the reply must stay local
+    (`_reply_stays_local`) – a fixed prompt says nothing about how the
+    model's output is handled.
+    """
+    if unit.is_user_tainted(func_node):
+        return None
+    ai_calls, ai_args = [], []
+    for node in ast.walk(func_node):
+        if not isinstance(node, ast.Call):
+            continue
+        name = _call_name(node)
+        full = _resolved(unit, name)
+        if _is_dangerous_sink(name) or _is_dangerous_sink(full):
+            return None
+        if name and (is_ai_call(name) or is_ai_call(full)):
+            ai_calls.append(node)
+            ai_args += node.args + [kw.value for kw in node.keywords]
+    if not _reply_stays_local(func_node, ai_calls):
+        return None
+    if all(_is_constant(a) for a in ai_args):
+        return "constant prompt"
+    if all(_is_constant(a) or _is_sanitised(a) for a in ai_args):
+        return "sanitised prompt"
+    return None
+
+
+@register("AI_DETECTOR01", scope="node", node_types=(ast.Call,), parallel=False)
 def llm_audit(unit):
     call = unit._current
 
-    call_name = ""
-    if isinstance(call.func, ast.Name):
-        call_name = call.func.id
-    elif isinstance(call.func, ast.Attribute):
-        call_name = get_full_attr_name(call.func)
-
+    call_name = _call_name(call)
     if not call_name or not is_ai_call(call_name):
         return
 
-    if getattr(_CLIENT, "is_dummy", False):
+    if getattr(_client(), "is_dummy", False):
         logger.debug(
             "llm_code_audit: dummy client – skipping call at %s:%s",
             unit.path,
@@ -309,11 +674,7 @@ def llm_audit(unit):
     logger.debug("llm_code_audit: call at %s:%s", unit.path, call.lineno)
 
     # climb to the nearest function *or* lambda
-    func_node = call
-    while func_node and not isinstance(
-        func_node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)
-    ):
-        func_node = getattr(func_node, "parent", None)
+    func_node = unit.enclosing_def(call)
 
     if func_node is None:  # top-level call → treat the Module as key
         key = (str(unit.path), "module", call.lineno)
@@ -329,7 +690,7 @@ def llm_audit(unit):
         "Visiting call at %s:%s - ancestry: %s",
         unit.path,
         call.lineno,
-        _debug_ancestry(call),
+        _debug_ancestry(call, unit),
     )
 
     # Short-circuit when everything is already routed through sanitisers
@@ -338,7 +699,7 @@ def llm_audit(unit):
 
     if isinstance(
         func_node, (ast.FunctionDef, ast.AsyncFunctionDef)
-    ) and _is_trivial_wrapper(func_node, src=unit.source):
+    ) and _is_trivial_wrapper(func_node, src=unit.source, path=unit.path):
         logger.debug("llm_code_audit: trivial wrapper – skipped")
         return
 
@@ -348,67 +709,232 @@ def llm_audit(unit):
         logger.debug("llm_code_audit: AST missing – skipped")
         return
 
-    func_src = _get_enclosing_function_source(call, unit.source, tree)
+    func_src = _get_enclosing_function_source(call, unit)
+
+    reason = prefilter and func_node is not None and _static_verdict(unit, func_node)
+    if reason:
+        # what the audit would at least have cost: instructions, function, reply
+        model = str(_client().model)
+        block = _function_block(func_src, "")
+        sent = approx_tokens(f"{_SINGLE_SYSTEM}\n\n{block}", model)
+        _budget.record_skip(sent, _MAX_REPLY_TOK, model, reason)
+        logger.debug(
+            "llm_code_audit: %s – skipped %s:%s", reason, unit.path, call.lineno
+        )
+        return
+
     flow_src = _path_context(unit, func_node)
 
-    prompt = textwrap.dedent(
-        f"""
-        ## Context
-        You are a security expert reviewing Python source code for **OWASP Top-10 for LLM Applications** risks:
-        1. LLM01:2025 Prompt Injection
-        2. LLM02:2025 Sensitive Information Disclosure
-        3. LLM03:2025 Supply Chain
-        4. LLM04:2025 Data and Model Poisoning
-        5. LLM05:2025 Improper Output Handling
-        6. LLM06:2025 Excessive Agency
-        7. LLM07:2025 System Prompt Leakage
-        8. LLM08:2025 Vector and Embedding Weaknesses
-        9. LLM09:2025 Misinformation
-        10. LLM10:2025 Unbounded Consumption
-
-        You will receive:
-
-        • **LOCAL FUNCTION**  – the code to audit
-        • **CALL-FLOW CONTEXT** – snippets of its immediate callers / callees (for reference only)
-
-        ### NON-NEGOTIABLE RULES
-        1. If LOCAL FUNCTION is merely a thin wrapper (no extra logic), reply with `{{"issue": "clean"}}`.
-        2. Report **only** vulnerabilities that are **inside LOCAL FUNCTION itself**.
-        3. Ignore risks that exist *solely* in CALL-FLOW CONTEXT.
-
-        ### TASK
-        Return **exactly one line of JSON** with keys:<br>
-        `"issue" · "sev" · "fix" · "owasp" · ("mitre" optional)`.<br>
-        Use `"issue": "clean"` when no problem is present.
-
-        ### LOCAL FUNCTION ###
-        ```python
-        {func_src}
-        ```
-
-        {flow_src}
-    """
-    ).strip()
+    prompt = _function_block(func_src, flow_src)
 
     logger.debug(
         f"Detecting issues in {unit.path} {call.lineno} with LLM prompt:\n{prompt}\n\n"
     )
 
-    try:
-        reply = _CLIENT.ask(prompt, max_tokens=180)
-    except Exception as exc:
-        logger.error("llm_code_audit: provider error %s – skipped", exc)
-        return
+    # the round trip itself runs later, concurrently with (or batched into
+    # one request alongside) other audits
+    yield Deferred(
+        "AI_DETECTOR01",
+        partial(_ask, prompt),
+        partial(_to_findings, unit.path, call.lineno),
+        payload=_Audit(prompt, func_src, flow_src),
+        batcher=_BATCHER if batch_size > 1 else None,
+    )
+
+
+def _function_block(func_src: str, flow_src: str, label: str = "") -> str:
+    block = f"### LOCAL FUNCTION{label} ###\n```python\n{func_src}\n```"
+    return f"{block}\n\n{flow_src}" if flow_src else block
+
 
+def _cache_key(client, prompt: str) -> str | None:
+    cache = _llm_cache.response_cache
+    if cache is None:
+        return None
+    template = f"{_PROMPT_VERSION}:{_MAX_REPLY_TOK}"
+    return cache.key(type(client).__module__, str(client.model), template, prompt)
+
+
+def _cached_reply(key: str | None, model: str) -> str | None:
+    """Reply cached under *key* (noted as a budget-free hit), else None."""
+    if key is None:
+        return None
+    hit = _llm_cache.response_cache.get(key)
+    if hit is None:
+        return None
+    _budget.record_cache_hit(hit.prompt_tok, hit.completion_tok, model)
+    return hit.reply
+
+
+def _store_reply(
+    key: str | None, system: str, prompt: str, reply: str, model: str
+) -> None:
+    if key is not None:
+        _llm_cache.response_cache.put(
+            key,
+            reply,
+            estimate_tokens(f"{system}\n\n{prompt}", model),
+            estimate_tokens(reply, model),
+        )
+
+
+def _parse_verdict(reply: str) -> Optional[dict]:
     payload = _json_fragment(reply)
     if not payload:
         logger.debug("llm_code_audit: non-JSON reply – skipped")
-        return
+        return None
 
     try:
-        data = json.loads(payload)
+        return json.loads(payload)
     except json.JSONDecodeError:
         logger.debug("llm_code_audit: bad JSON – skipped")
+        return None
+
+
+def _ask(prompt: str) -> Optional[dict]:
+    """Send one audit *prompt* (worker thread) and return the parsed verdict."""
+    client = _client()
+    model = str(client.model)
+    key = _cache_key(client, prompt)
+    reply = _cached_reply(key, model)
+
+    if reply is None:
+        try:
+            reply = _stream_verdict(client, prompt)
+        except Exception as exc:
+            logger.error("llm_code_audit: provider error %s – skipped", exc)
+            return None
+        verdict = _parse_verdict(reply)
+        # never cache offline / error stubs or replies cut off mid-way
+        if reply_was_billed() and verdict is not None:
+            _store_reply(key, _SINGLE_SYSTEM, prompt, reply, model)
+        return verdict
+
+    return _parse_verdict(reply)
+
+
+def _stream_verdict(client, prompt: str) -> str:
+    """
+    Stream the reply to *prompt*, cancelling it as soon as the verdict is
+    known to be clean – most functions are, and the rest of such a reply
+    (`sev`, `fix`, …) is not used.  Returns the reply, or the clean verdict.
+    """
+    parser = IncrementalJSON()
+    pieces = client.stream(prompt, max_tokens=_MAX_REPLY_TOK, system=_SINGLE_SYSTEM)
+    try:
+        for piece in pieces:
+            issue = parser.feed(piece).get("issue")
+            if isinstance(issue, str) and issue.strip().lower() == "clean":
+                logger.debug("llm_code_audit: clean verdict – stream cancelled")
+                return json.dumps({"issue": "clean"})
+    finally:
+        pieces.close()
+    return parser.text
+
+
+def _batch_verdicts(reply: str, n: int) -> list[Optional[dict]]:
+    """Verdicts for functions ``1..n`` from a batched reply (None if missing)."""
+    m = _BATCH_RE.search(reply)
+    try:
+        data = json.loads(m.group(1) if m else reply.strip())
+    except json.JSONDecodeError:
+        logger.debug("llm_code_audit: bad batch JSON – skipped")
+        return [None] * n
+    if isinstance(data, dict):
+        data = data.get("results")
+    if not isinstance(data, list):
+        logger.debug("llm_code_audit: batch reply without results – skipped")
+        return [None] * n
+
+    verdicts: list[Optional[dict]] = [None] * n
+    for obj in data:
+        if not isinstance(obj, dict):
+            continue
+        try:
+            i = int(obj.get("id"))
+        except (TypeError, ValueError):
+            continue
+        if 1 <= i <= n:
+            verdicts[i - 1] = {k: v for k, v in obj.items() if k != "id"}
+    return verdicts
+
+
+class _Audit(NamedTuple):
+    prompt: str  # the single-function prompt (after _SINGLE_SYSTEM) – cache key
+    func_src: str
+    flow_src: str
+
+
+class _AuditBatcher(Batcher):
+    """Packs up to `batch_size` functions into one request within max_context."""
+
+    def plan(self, payloads):
+        client = _client()
+        model = str(client.model)
+        limit = client.max_context
+        base = estimate_tokens(_BATCH_SYSTEM, model)
+
+        groups, group, used = [], [], base
+        for i, audit in enumerate(payloads):
+            block = _function_block(audit.func_src, audit.flow_src, f" id={i}")
+            cost = estimate_tokens(block, model) + _MAX_REPLY_TOK
+            if group and (len(group) >= batch_size or used + cost > limit):
+                groups.append(group)
+                group, used = [], base
+            group.append(i)
+            used += cost
+        if group:
+            groups.append(group)
+        return groups
+
+    def run(self, payloads):
+        client = _client()
+        model = str(client.model)
+        keys = [_cache_key(client, a.prompt) for a in payloads]
+        verdicts: list[Optional[dict]] = [None] * len(payloads)
+
+        todo = []
+        for i, key in enumerate(keys):
+            reply = _cached_reply(key, model)
+            if reply is None:
+                todo.append(i)
+            else:
+                verdicts[i] = _parse_verdict(reply)
+        if len(todo) == 1:
+            verdicts[todo[0]] = _ask(payloads[todo[0]].prompt)
+        if len(todo) < 2:
+            return verdicts
+
+        blocks = [
+            _function_block(payloads[i].func_src, payloads[i].flow_src, f" id={n}")
+            for n, i in enumerate(todo, 1)
+        ]
+        prompt = "\n\n".join(blocks)
+        try:
+            reply = client.ask(
+                prompt, max_tokens=_MAX_REPLY_TOK * len(todo), system=_BATCH_SYSTEM
+            )
+        except Exception as exc:
+            logger.error("llm_code_audit: provider error %s – skipped", exc)
+            return verdicts
+        billed = reply_was_billed()
+
+        for i, verdict in zip(todo, _batch_verdicts(reply, len(todo))):
+            verdicts[i] = verdict
+            if billed and verdict is not None:  # cached per function
+                verdict_json = json.dumps(verdict)
+                _store_reply(
+                    keys[i], _SINGLE_SYSTEM, payloads[i].prompt, verdict_json, model
+                )
+        return verdicts
+
+
+_BATCHER = _AuditBatcher()
+
+
+def _to_findings(path, lineno: int, data: Optional[dict]):
+    """Turn a verdict from `_ask` into findings (calling thread, scan order)."""
+    if data is None:
         return
 
     issue = str(data.get("issue", "")).lower()
@@ -416,7 +942,7 @@ def llm_audit(unit):
         logger.debug("llm_code_audit: benign / clean – skipped")
         return
 
-    dedup = (str(unit.path), call.lineno, str(data.get("owasp", "Axx")))
+    dedup = (str(path), lineno, str(data.get("owasp", "Axx")))
     if dedup in _EMITTED:
         return
     _EMITTED.add(dedup)
@@ -425,8 +951,8 @@ def llm_audit(unit):
         "llm_code_audit: found %s (%s) in %s:%s",
         data.get("issue"),
         data.get("sev"),
-        unit.path,
-        call.lineno,
+        path,
+        lineno,
     )
     yield Finding(
         detector_id="AI_DETECTOR01",
@@ -434,7 +960,7 @@ def llm_audit(unit):
         mitre=data.get("mitre", []),
         severity=str(data.get("sev", "info")).lower(),
         message=f"LLM audit: {data['issue']}",
-        location=unit.path,
-        line=call.lineno,
+        location=path,
+        line=lineno,
         fix=data.get("fix", ""),
     )
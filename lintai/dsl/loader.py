@@ -1,66 +1,380 @@
 from __future__ import annotations
 import ast, json, yaml, pathlib, re, logging
-from lintai.detectors import register
+from typing import Iterator, NamedTuple, Optional
+import lintai.detectors as _detectors
 from lintai.core.finding import Finding
 from lintai.detectors.base import SourceUnit
 from lintai.engine.classification import is_ai_related as is_ai_call
 
 logger = logging.getLogger(__name__)
 
+# longest literal kept for the prefilter (a prefix of a required literal is
+# required too)
+_MAX_LITERAL = 32
+_QUANTIFIER_RE = re.compile(r"[*+?]|\{(\d*),?(\d*)\}")
+# escapes that stand for more than the next character: \x41, \N{..}, \1 …
+_LONG_ESCAPES = frozenset("xuUN0123456789")
 
-def _load_one(rule: dict):
-    nid = rule["id"]
-    scope = rule.get("scope", "module")
-    node_types = tuple(getattr(ast, t) for t in rule.get("node_types", []))
 
-    pattern_src = rule["pattern"]
-    compiled_re = re.compile(pattern_src)
-
-    def _extract_text(node: ast.AST) -> str:
-        # literal or triple‑quoted template
-        if isinstance(node, ast.Constant) and isinstance(node.value, str):
-            return node.value
-
-        # f‑string
-        if isinstance(node, ast.JoinedStr):
-            parts = []
-            for v in node.values:
-                if isinstance(v, ast.Constant) and isinstance(v.value, str):
-                    parts.append(v.value)
-                elif isinstance(v, ast.FormattedValue):
-                    if isinstance(v.value, ast.Name):  # {variable}
-                        parts.append("{" + v.value.id + "}")
-                    else:
-                        parts.append("{...}")  # other expression
-            return "".join(parts)
-
-        return ""
-
-    # generate detector on‑the‑fly
-    @register(nid, scope=scope, node_types=node_types)
-    def _generated(unit: SourceUnit, _r=rule, _cre=compiled_re):
-        node = unit._current  # set by the dispatcher
+def _extract_text(node: ast.AST) -> str:
+    # literal or triple‑quoted template
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+
+    # f‑string
+    if isinstance(node, ast.JoinedStr):
+        parts = []
+        for v in node.values:
+            if isinstance(v, ast.Constant) and isinstance(v.value, str):
+                parts.append(v.value)
+            elif isinstance(v, ast.FormattedValue):
+                if isinstance(v.value, ast.Name):  # {variable}
+                    parts.append("{" + v.value.id + "}")
+                else:
+                    parts.append("{...}")  # other expression
+        return "".join(parts)
+
+    return ""
+
+
+# --------------------------------------------------------------------------- #
+# required literals of a pattern                                              #
+# --------------------------------------------------------------------------- #
+def _class_end(pattern: str, i: int) -> int:
+    """Index just past the ``[...]`` class opened at *i*."""
+    j = i + 1
+    if pattern[j : j + 1] == "^":
+        j += 1
+    if pattern[j : j + 1] == "]":
+        j += 1  # a leading "]" is literal
+    while j < len(pattern):
+        if pattern[j] == "\\":
+            j += 2
+        elif pattern[j] == "]":
+            return j + 1
+        else:
+            j += 1
+    raise ValueError("unbalanced class")
+
+
+def _group_end(pattern: str, i: int) -> int:
+    """Index of the ``)`` closing the group opened at *i*."""
+    depth, j = 0, i
+    while j < len(pattern):
+        c = pattern[j]
+        if c == "\\":
+            j += 2
+            continue
+        if c == "[":
+            j = _class_end(pattern, j)
+            continue
+        if c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+            if depth == 0:
+                return j
+        j += 1
+    raise ValueError("unbalanced group")
+
+
+def _quantifier(pattern: str, i: int) -> Optional[re.Match]:
+    m = _QUANTIFIER_RE.match(pattern, i)
+    if m and m.group(0).startswith("{") and not (m.group(1) or m.group(2)):
+        return None  # "{}" / "{,}" are literal text
+    return m
+
+
+def _alternatives(body: str) -> Optional[frozenset[str]]:
+    """The branches of *body* when every one is a plain literal string."""
+    branches, current, i = [], [], 0
+    while i < len(body):
+        c = body[i]
+        if c == "\\":
+            nxt = body[i + 1 : i + 2]
+            if not nxt or nxt.isalnum():
+                return None  # \d, \b, \1 … – not a literal
+            current.append(nxt)
+            i += 2
+            continue
+        if c == "|":
+            branches.append("".join(current))
+            current = []
+        elif c in ".^$*+?{}[]()":
+            return None
+        else:
+            current.append(c)
+        i += 1
+    branches.append("".join(current))
+    if not all(branches):
+        return None
+    return frozenset(branches)
+
+
+def _required_literals(pattern: str) -> Optional[frozenset[str]]:
+    """
+    A set of strings one of which occurs in every match of *pattern* (None
+    when no such set is found).  Only the top-level sequence is looked at:
+    runs of literal characters and groups that are an alternation of plain
+    literals; anything unusual makes the pattern "always check".
+    """
+    factors: list[frozenset[str]] = []
+    run: list[str] = []
+
+    def _flush():
+        if run:
+            factors.append(frozenset(["".join(run)]))
+            run.clear()
+
+    i = 0
+    try:
+        while i < len(pattern):
+            c = pattern[i]
+            literal = group = None
+            if c == "\\":
+                nxt = pattern[i + 1 : i + 2]
+                if nxt in _LONG_ESCAPES:
+                    return None
+                if not nxt.isalnum():
+                    literal = nxt
+                end = i + 2
+            elif c == "[":
+                end = _class_end(pattern, i)
+            elif c == "(":
+                close = _group_end(pattern, i)
+                body = pattern[i + 1 : close]
+                if body.startswith("?P<"):
+                    body = body[body.index(">") + 1 :]
+                elif body.startswith("?:"):
+                    body = body[2:]
+                elif body.startswith("?"):
+                    body = None  # look-around, flags, conditionals
+                group = _alternatives(body) if body is not None else None
+                end = close + 1
+            elif c == "|":
+                return None  # top-level alternation
+            elif c in ".^$)":
+                end = i + 1
+            elif _quantifier(pattern, i):
+                return None  # quantifier without an atom
+            else:
+                literal, end = c, i + 1
+
+            quant = _quantifier(pattern, end)
+            optional = False
+            if quant:
+                optional = quant.group(0) in "*?" or quant.group(1) in ("", "0")
+                end = quant.end()
+                if pattern[end : end + 1] in ("?", "+"):
+                    end += 1  # lazy / possessive
+            if literal is not None and not optional:
+                run.append(literal)
+                if quant:
+                    _flush()  # "ab+c": "ab" and "c" are not adjacent
+            else:
+                _flush()
+                if group and not optional:
+                    factors.append(group)
+            i = end
+    except ValueError:
+        return None
+    _flush()
+    if not factors:
+        return None
+    return max(factors, key=lambda f: (min(map(len, f)), -len(f)))
+
+
+def _trie_regex(words) -> str:
+    """Regex matching any of *words*, factored into a prefix trie."""
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def _build(node: dict) -> str:
+        alts = [re.escape(ch) + _build(sub) for ch, sub in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return _build(trie)
+
+
+# --------------------------------------------------------------------------- #
+# one matcher per group of rules                                              #
+# --------------------------------------------------------------------------- #
+class _Rule(NamedTuple):
+    spec: dict
+    regex: re.Pattern
 
-        # ── 2️⃣  (optional) debug log ────────────────────────────────────────
+
+class _RuleMatcher:
+    """
+    Shared matching for every DSL rule of a scope and node types.
+
+    The text of a node is extracted once.  Rules with required literals
+    (see `_required_literals`) are only confirmed with their own regex when
+    one of those literals occurs in it; the literals of all rules are found
+    in one scan with a trie-shaped regex, so the cost per string grows with
+    the literals present, not with the number of rules.  Rules without a
+    usable literal are checked on every string, as before.
+
+    Each rule is still registered as its own `_RuleDetector`; the matcher is
+    their ``_lintai_group``, so the dispatcher calls it once per node for a
+    run of them (see `DispatchTable`).
+    """
+
+    def __init__(self, name: str):
+        self.__name__ = name
+        self.rules: list[_Rule] = []
+        self._scan: Optional[tuple] = None  # built on first use
+        # id(members) → (members, rule index → position), per dispatch entry
+        self._members: dict[int, tuple] = {}
+
+    def __getstate__(self) -> dict:
+        return dict(self.__dict__, _scan=None, _members={})
+
+    def add(self, rule: dict) -> int:
+        self.rules.append(_Rule(rule, re.compile(rule["pattern"])))
+        self._scan = None
+        return len(self.rules) - 1
+
+    def _compile(self) -> tuple:
+        always: list[int] = []
+        by_literal = ({}, {})  # case-sensitive, case-insensitive (lower-cased)
+        for i, rule in enumerate(self.rules):
+            flags = rule.regex.flags
+            literals = None
+            if not flags & re.VERBOSE:
+                literals = _required_literals(rule.regex.pattern)
+            if literals is None:
+                always.append(i)
+                continue
+            icase = bool(flags & re.IGNORECASE)
+            if icase and not all(lit.isascii() for lit in literals):
+                always.append(i)  # "ß" matches neither "ss" nor a lower()
+                continue
+            for lit in literals:
+                lit = lit[:_MAX_LITERAL]
+                key = lit.lower() if icase else lit
+                by_literal[icase].setdefault(key, []).append(i)
+        scans = []
+        for icase, table in enumerate(by_literal):
+            if table:
+                flags = re.IGNORECASE if icase else 0
+                scan = re.compile(f"(?=({_trie_regex(table)}))", flags)
+                every = frozenset(i for idx in table.values() for i in idx)
+                scans.append((scan, table, bool(icase), every))
+        return tuple(always), tuple(scans)
+
+    def candidates(self, text: str) -> list[int]:
+        """Indices of the rules that may match *text*, in load order."""
+        if self._scan is None:
+            self._scan = self._compile()
+        always, scans = self._scan
+        hits = set(always)
+        for scan, table, icase, every in scans:
+            for m in scan.finditer(text):
+                found = m.group(1).casefold() if icase else m.group(1)
+                if found not in table:
+                    # a case-insensitive match through a character that does
+                    # not fold to ASCII ("ı" for "i"): no key to look up
+                    hits.update(every)
+                    continue
+                # every literal starting here is a prefix of the longest one
+                for k in range(1, len(found) + 1):
+                    hits.update(table.get(found[:k], ()))
+        return sorted(hits)
+
+    def _positions(self, members: tuple) -> dict:
+        entry = self._members.get(id(members))
+        if entry is None or entry[0] is not members:
+            if len(self._members) > 16:  # tables compiled by earlier scans
+                self._members.clear()
+            entry = (members, {m.index: p for p, m in enumerate(members)})
+            self._members[id(members)] = entry
+        return entry[1]
+
+    def __call__(
+        self, unit: SourceUnit, members: tuple
+    ) -> Iterator[tuple[_RuleDetector, Finding]]:
+        """``(member, finding)`` for each of *members* matching the node."""
+        node = unit._current  # set by the dispatcher
         logger.debug(
-            "DSL-%s running on %s line %s", nid, unit.path, getattr(node, "lineno", "?")
+            "%s running on %s line %s",
+            self.__name__,
+            unit.path,
+            getattr(node, "lineno", "?"),
         )
-
-        # ── 3️⃣  rule body ───────────────────────────────────────────────────
         code = _extract_text(node)
-        if code and _cre.search(code):
-            yield Finding(
+        if not code:
+            return
+        positions = self._positions(members)
+        hits = sorted(
+            positions[i]
+            for i in self.candidates(code)
+            if i in positions and self.rules[i].regex.search(code)
+        )
+        for p in hits:
+            member = members[p]
+            spec = self.rules[member.index].spec
+            nid = spec["id"]
+            yield member, Finding(
                 detector_id=f"Rule {nid}",
-                owasp_id=_r.get("owasp_id", nid),
-                severity=_r.get("severity", "info"),
-                mitre=_r.get("mitre", []),
-                message=_r["message"],
+                owasp_id=spec.get("owasp_id", nid),
+                severity=spec.get("severity", "info"),
+                mitre=spec.get("mitre", []),
+                message=spec["message"],
                 location=unit.path,
                 line=getattr(node, "lineno", None),
-                fix=_r.get("fix", ""),
+                fix=spec.get("fix", ""),
             )
 
 
+class _RuleDetector:
+    """The registered detector of one DSL rule, matched by its group."""
+
+    def __init__(self, matcher: _RuleMatcher, index: int):
+        self._lintai_group = matcher
+        self.index = index
+        self.__name__ = f"DSL-{matcher.rules[index].spec['id']}"
+
+    def __call__(self, unit: SourceUnit) -> Iterator[Finding]:
+        return (f for _, f in self._lintai_group(unit, (self,)))
+
+
+# group name → matcher its newest rules were added to
+_MATCHERS: dict[str, _RuleMatcher] = {}
+
+
+def _matcher_for(group: str) -> _RuleMatcher:
+    """The group's matcher, or a new one once its rules left the registry
+    (e.g. after the UI's warm worker reset it)."""
+    matcher = _MATCHERS.get(group)
+    if matcher is not None:
+        rid = matcher.rules[-1].spec["id"]
+        registered = _detectors._REGISTRY.get(rid, ())
+        if any(getattr(fn, "_lintai_group", None) is matcher for fn in registered):
+            return matcher
+    matcher = _MATCHERS[group] = _RuleMatcher(group)
+    return matcher
+
+
+def _load_one(rule: dict):
+    scope = rule.get("scope", "module")
+    node_types = tuple(getattr(ast, t) for t in rule.get("node_types", []))
+
+    # each rule keeps its own registry id; rules of the same scope and node
+    # types share one matcher
+    group = f"DSL[{scope}:{','.join(t.__name__ for t in node_types)}]"
+    matcher = _matcher_for(group)
+    detector = _RuleDetector(matcher, matcher.add(rule))
+    _detectors.register(rule["id"], scope=scope, node_types=node_types)(detector)
+
+
 def load_rules(path: str | pathlib.Path):
     p = pathlib.Path(path)
     if p.is_dir():
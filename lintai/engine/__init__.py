@@ -10,17 +10,27 @@ and query `ai_analyzer.ai_functions`, etc.
 """
 
 from __future__ import annotations
-from typing import Iterable, Optional
+from typing import TYPE_CHECKING, Iterable, Optional
 import logging
 
-from lintai.engine.python_ast_unit import PythonASTUnit
-from lintai.engine.analysis import ProjectAnalyzer
+# the analyzer (and the pydantic models it builds) is only imported once a
+# scan actually starts – importing `lintai.engine.*` must stay cheap
+if TYPE_CHECKING:
+    from lintai.engine.analysis import ProjectAnalyzer
+    from lintai.engine.cache import AnalysisCache
+    from lintai.engine.python_ast_unit import PythonASTUnit
 
 
 #: will be set by `initialise()` – None during import-time
 ai_analyzer: Optional[ProjectAnalyzer] = None
 
 
-def initialise(units: Iterable[PythonASTUnit], depth: int = 2) -> None:
+def initialise(
+    units: Iterable[PythonASTUnit],
+    depth: int = 2,
+    cache: Optional[AnalysisCache] = None,
+) -> None:
+    from lintai.engine.analysis import ProjectAnalyzer
+
     global ai_analyzer
-    ai_analyzer = ProjectAnalyzer(units, call_depth=depth).analyze()
+    ai_analyzer = ProjectAnalyzer(units, call_depth=depth, cache=cache).analyze()
@@ -9,6 +9,8 @@ import logging
 import re
 from typing import Set
 
+from lintai.engine.python_ast_unit import unit_of
+
 # ---------------------------------------------------------------------------
 # 1.  Regexes
 # ---------------------------------------------------------------------------
@@ -68,11 +70,12 @@ _seen_import_nodes: Set[int] = set()  # guard against double logging
 def is_hot_import(node: ast.AST) -> bool:
     """True if this Import/ImportFrom brings in a Gen-AI provider."""
     if isinstance(node, (ast.Import, ast.ImportFrom)):
-        if id(node) not in _seen_import_nodes:  # optional debug
+        log = logging.getLogger(__name__)
+        if log.isEnabledFor(logging.DEBUG) and id(node) not in _seen_import_nodes:
             _seen_import_nodes.add(id(node))
-            logging.getLogger(__name__).debug(
-                "IMPORT   %s", ast.get_source_segment(node._unit.source, node)  # type: ignore[attr-defined]
-            )
+            unit = unit_of(node)
+            if unit is not None:
+                log.debug("IMPORT   %s", ast.get_source_segment(unit.source, node))
         return any(_PROVIDER_RX.search(alias.name) for alias in node.names)
     return False
 
@@ -13,6 +13,10 @@ functions up to an arbitrary depth.
 2.  *Link pass*   – builds a *call‑graph* between user‑defined functions
     and propagates the *ai_sink* flag outward up to a configurable depth.
 
+Both passes – plus def collection and the raw component inventory – are
+fed from a single traversal of each file (`PythonASTUnit.walk`), which also
+leaves behind the node-type index detectors are dispatched from.
+
 The result is available via:
 
     analyzer.ai_calls        # list[AICall]
@@ -27,17 +31,30 @@ import ast
 import os
 import logging
 import re
-import networkx as nx
+from array import array
 from collections import defaultdict
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Iterable, Mapping, MutableMapping, Set
-from networkx.readwrite import json_graph
+from typing import (
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    Set,
+)
 
 from lintai.models.inventory import FileInventory, Component, Relationship
 from lintai.engine.ast_utils import get_full_attr_name, get_code_snippet
-from lintai.engine.classification import classify_component_type, detect_frameworks
-from lintai.engine.python_ast_unit import PythonASTUnit
+from lintai.engine.cache import AnalysisCache
+from lintai.engine.classification import (
+    classify_component_type,
+    frameworks_from_imports,
+)
+from lintai.engine.python_ast_unit import PythonASTUnit, unit_of
 
 # ---------------------------------------------------------------------------#
 # helper: path  →   import-style module name                                 #
@@ -58,13 +75,6 @@ def _path_to_modname(project_root: Path, path: Path) -> str:
     return ".".join(parts)
 
 
-def _node_at_lineno(tree: ast.AST, lineno: int) -> ast.AST | None:
-    for node in ast.walk(tree):
-        if hasattr(node, "lineno") and node.lineno == lineno:
-            return node
-    return None
-
-
 ###############################################################################
 # 0.  Public dataclasses ######################################################
 ###############################################################################
@@ -75,6 +85,9 @@ class AICall:
     fq_name: str  # e.g. "openai.ChatCompletion.create"
     file: Path
     lineno: int
+    # enclosing function as ``module.func`` (just ``module`` at top level) –
+    # the seed `_propagate_ai_tags` walks the call graph up from
+    scope: Optional[str] = None
 
     def as_dict(self) -> dict:  # convenience for JSON report
         return {"name": self.fq_name, "file": str(self.file), "line": self.lineno}
@@ -172,23 +185,207 @@ class _AttrChain:
         return ".".join(parts)
 
 
+# ---------------------------------------------------------------------------
+class _DefSites(Mapping):
+    """
+    qualname → ``(unit, def node)`` (or just the node with *nodes_only*).
+
+    Only the def *position* is stored; the node is looked up on access, so
+    units restored from the analysis cache are parsed only when needed.
+    """
+
+    def __init__(self, nodes_only: bool = False) -> None:
+        self._sites: dict[str, tuple[PythonASTUnit, int, int]] = {}
+        self._nodes_only = nodes_only
+
+    def add(self, qname: str, unit: PythonASTUnit, lineno: int, col: int) -> None:
+        self._sites[qname] = (unit, lineno, col)
+
+    def unit_of(self, qname: str) -> PythonASTUnit | None:
+        site = self._sites.get(qname)
+        return site[0] if site else None
+
+    def __getitem__(self, qname: str):
+        unit, lineno, col = self._sites[qname]
+        node = unit.def_at(lineno, col)
+        return node if self._nodes_only else (unit, node)
+
+    def __contains__(self, qname: object) -> bool:
+        return qname in self._sites
+
+    def __iter__(self):
+        return iter(self._sites)
+
+    def __len__(self) -> int:
+        return len(self._sites)
+
+
+# ---------------------------------------------------------------------------
+class _CallGraph:
+    """
+    Interned, CSR-packed call graph.
+
+    Every qualname is stored once in a symbol table and referred to by its
+    int id.  Edges are collected with `add_edge()`; `freeze()` then packs
+    them into forward (caller → callees) and reverse (callee → callers)
+    offset/target arrays, keeping first-seen edge order and dropping
+    duplicates.  Queries are only valid after `freeze()`.
+    """
+
+    def __init__(self) -> None:
+        self._names: list[str] = []
+        self._ids: dict[str, int] = {}
+        self._src = array("i")
+        self._dst = array("i")
+        self._seen: set[tuple[int, int]] | None = set()
+        self._fwd_off = self._fwd = self._rev_off = self._rev = array("i")
+        self.n_callers = self.n_callees = 0
+
+    # ---- symbols ----------------------------------------------------------
+    def intern(self, name: str) -> int:
+        sid = self._ids.get(name)
+        if sid is None:
+            sid = self._ids[name] = len(self._names)
+            self._names.append(name)
+        return sid
+
+    def id_of(self, name: str) -> int | None:
+        return self._ids.get(name)
+
+    def name(self, sid: int) -> str:
+        return self._names[sid]
+
+    def canonical(self, name: str) -> str:
+        """The interned string object for *name* (adds it if new)."""
+        return self._names[self.intern(name)]
+
+    # ---- building ---------------------------------------------------------
+    def add_edge(self, caller: str, callee: str) -> None:
+        edge = (self.intern(caller), self.intern(callee))
+        if edge not in self._seen:
+            self._seen.add(edge)
+            self._src.append(edge[0])
+            self._dst.append(edge[1])
+
+    def freeze(self) -> None:
+        n = len(self._names)
+        self._fwd_off, self._fwd = self._pack(self._src, self._dst, n)
+        self._rev_off, self._rev = self._pack(self._dst, self._src, n)
+        self._src, self._dst, self._seen = array("i"), array("i"), None
+        self.n_callers = sum(1 for _ in self.callers_ids())
+        self.n_callees = sum(1 for _ in self.callees_ids())
+
+    @staticmethod
+    def _pack(keys: array, vals: array, n: int) -> tuple[array, array]:
+        """Stable counting sort of (key, val) pairs into CSR offsets/targets."""
+        off = array("i", bytes(4 * (n + 1)))
+        for k in keys:
+            off[k + 1] += 1
+        for i in range(n):
+            off[i + 1] += off[i]
+        out = array("i", bytes(4 * len(vals)))
+        fill = off[:-1]
+        for k, v in zip(keys, vals):
+            out[fill[k]] = v
+            fill[k] += 1
+        return off, out
+
+    # ---- queries ----------------------------------------------------------
+    def callees(self, sid: int) -> array:
+        if sid + 1 >= len(self._fwd_off):
+            return array("i")
+        return self._fwd[self._fwd_off[sid] : self._fwd_off[sid + 1]]
+
+    def callers(self, sid: int) -> array:
+        if sid + 1 >= len(self._rev_off):
+            return array("i")
+        return self._rev[self._rev_off[sid] : self._rev_off[sid + 1]]
+
+    def out_degree(self, sid: int) -> int:
+        return len(self.callees(sid))
+
+    def in_degree(self, sid: int) -> int:
+        return len(self.callers(sid))
+
+    def callers_ids(self) -> Iterator[int]:
+        """Ids with at least one outgoing edge, in id order."""
+        off = self._fwd_off
+        return (i for i in range(len(off) - 1) if off[i + 1] > off[i])
+
+    def callees_ids(self) -> Iterator[int]:
+        """Ids with at least one incoming edge, in id order."""
+        off = self._rev_off
+        return (i for i in range(len(off) - 1) if off[i + 1] > off[i])
+
+    def number_of_edges(self) -> int:
+        return len(self._fwd)
+
+
+class _AdjacencyView(Mapping):
+    """Read-only ``qualname → names`` mapping over one direction of a `_CallGraph`."""
+
+    def __init__(self, graph: _CallGraph, reverse: bool = False) -> None:
+        self._g = graph
+        self._reverse = reverse
+
+    def _row(self, name: object) -> array:
+        sid = self._g.id_of(name) if isinstance(name, str) else None
+        if sid is None:
+            return array("i")
+        return self._g.callers(sid) if self._reverse else self._g.callees(sid)
+
+    def __getitem__(self, name: str):
+        row = self._row(name)
+        if not row:
+            raise KeyError(name)
+        names = [self._g.name(i) for i in row]
+        return names if self._reverse else set(names)
+
+    def __contains__(self, name: object) -> bool:
+        return bool(self._row(name))
+
+    def __iter__(self) -> Iterator[str]:
+        ids = self._g.callees_ids() if self._reverse else self._g.callers_ids()
+        return (self._g.name(i) for i in ids)
+
+    def __len__(self) -> int:
+        return self._g.n_callees if self._reverse else self._g.n_callers
+
+
 ###############################################################################
 # 3.  Phase‑1 visitor – collect aliases & sinks ###############################
 ###############################################################################
-class _PhaseOneVisitor(ast.NodeVisitor):
-    """Walk a module AST once to collect alias info *and* direct AI calls."""
+class _PhaseOneVisitor:
+    """
+    Collect alias info *and* direct AI calls of one module.
+
+    Not a tree walker: `ProjectAnalyzer._scan_unit` feeds it every node in
+    pre-order via `visit()`, which returns False when the node's subtree
+    must not be inspected any further.
+    """
 
     def __init__(
-        self, unit: PythonASTUnit, tracker: _ImportTracker, sinks: list[AICall]
+        self,
+        unit: PythonASTUnit,
+        tracker: _ImportTracker,
+        sinks: list[AICall],
+        scope_of: Callable[[], str],
     ):
         self.unit = unit
         self.tracker = tracker
         self.sinks = sinks
+        self.scope_of = scope_of  # enclosing function of the current node
+
+    def _sink(self, dotted: str, node: ast.AST) -> None:
+        self.sinks.append(AICall(dotted, self.unit.path, node.lineno, self.scope_of()))
+
+    def visit(self, node: ast.AST) -> bool:
+        method = self._METHODS.get(type(node))
+        return method is None or method(self, node) is not False
 
     # ---------------------------------------------------------------------
     def visit_Import(self, node):
         self.tracker.visit_import(node)
-        self.generic_visit(node)
 
     visit_ImportFrom = visit_Import  # alias
 
@@ -196,13 +393,13 @@ class _PhaseOneVisitor(ast.NodeVisitor):
     def visit_Call(self, node: ast.Call):
         parts = _AttrChain.parts(node.func)
         if not parts:
-            return
+            return False  # historical behaviour: skip e.g. ``f()(...)`` bodies
         base, *rest = parts
         base_resolved = self.tracker.resolve(base)
         dotted = ".".join([base_resolved, *rest])
 
         if _PROVIDER_RX.search(dotted):
-            self.sinks.append(AICall(dotted, self.unit.path, node.lineno))
+            self._sink(dotted, node)
         else:
             # Heuristic: verb at the end + base looks like provider
             if (
@@ -210,8 +407,7 @@ class _PhaseOneVisitor(ast.NodeVisitor):
                 and _VERB_RX.search(rest[-1])
                 and _PROVIDER_RX.search(base_resolved)
             ):
-                self.sinks.append(AICall(dotted, self.unit.path, node.lineno))
-        self.generic_visit(node)
+                self._sink(dotted, node)
 
     # Inspect code with binary operators to find agentic AI calls
     def visit_BinOp(self, node: ast.BinOp):
@@ -227,9 +423,8 @@ class _PhaseOneVisitor(ast.NodeVisitor):
                                 _AttrChain.to_dotted(_AttrChain.parts(node.right)),
                             ]
                         )
-                        self.sinks.append(AICall(dotted, self.unit.path, node.lineno))
+                        self._sink(dotted, node)
                         break
-        self.generic_visit(node)
 
     # Inspect code with assignment to find assignments to AI libraries
     def visit_Assign(self, node: ast.Assign):
@@ -257,14 +452,26 @@ class _PhaseOneVisitor(ast.NodeVisitor):
                 if isinstance(lhs, ast.Attribute) and isinstance(lhs.attr, str):
                     self.tracker.aliases[lhs.attr] = _AttrChain.to_dotted(parts)
 
-        self.generic_visit(node)
+    _METHODS = {
+        ast.Import: visit_Import,
+        ast.ImportFrom: visit_ImportFrom,
+        ast.Call: visit_Call,
+        ast.BinOp: visit_BinOp,
+        ast.Assign: visit_Assign,
+    }
 
 
 ###############################################################################
 # 4.  Phase‑2 visitor – build call graph #####################################
 ###############################################################################
-class _PhaseTwoVisitor(ast.NodeVisitor):
-    """Collect def‑name and outgoing calls for user code."""
+class _PhaseTwoVisitor:
+    """
+    Collect def‑name and outgoing calls for user code.
+
+    Fed ``(node, depth)`` in pre-order by `ProjectAnalyzer._scan_unit`.
+    Call targets are recorded raw and only resolved in `finish()`, once the
+    module's import aliases are complete.
+    """
 
     def __init__(
         self,
@@ -278,69 +485,63 @@ class _PhaseTwoVisitor(ast.NodeVisitor):
         self.tracker = tracker
         self._call_graph = _call_graph
         self.pa = pa
-        self.current_func: list[str] = []  # stack of qualified names
-
-    # Helper ----------------------------------------------------------------
-    def _qual(self, name: str) -> str:
-        return (
-            f"{self.mod}.{'.'.join(self.current_func+[name])}"
-            if self.current_func
-            else f"{self.mod}.{name}"
-        )
-
-    # Visit defs ------------------------------------------------------------
-    def visit_FunctionDef(self, node: ast.FunctionDef):
-        qname = self._qual(node.name)
-        self.current_func.append(node.name)
-        self.generic_visit(node)
-        self.current_func.pop()
+        self.current_func: list[str] = []  # stack of function names
+        self._depths: list[int] = []  # tree depth of each current_func entry
+        # (caller, parts, lineno, is_hof)
+        self._pending: list[tuple[str, list[str], object, bool]] = []
+
+    def visit(self, node: ast.AST, depth: int) -> None:
+        # leave every function whose subtree we have walked out of
+        while self._depths and self._depths[-1] >= depth:
+            self._depths.pop()
+            self.current_func.pop()
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            self.current_func.append(node.name)
+            self._depths.append(depth)
+        elif isinstance(node, ast.Call):
+            self.visit_Call(node)
 
-    visit_AsyncFunctionDef = visit_FunctionDef
+    def current_scope(self) -> str:
+        """Innermost enclosing function as ``module.func`` (``module`` at top level)."""
+        return f"{self.mod}.{self.current_func[-1]}" if self.current_func else self.mod
 
     # Visit calls -----------------------------------------------------------
     def visit_Call(self, node: ast.Call):
         if not self.current_func:
             # we only care about calls *inside* a function/method
-            self.generic_visit(node)
             return
         caller = f"{self.mod}.{'.'.join(self.current_func)}"
 
         # --------- direct call  foo.bar()  -----------------------------
         parts = _AttrChain.parts(node.func)
         if not parts:
-            self.generic_visit(node)
             return
-        callee = self._resolve_parts(parts)
-        if callee:
-            self._call_graph[caller].add(callee)
-            self.log.debug(
-                "P2-EDGE  %s  →  %s  (line %s)",
-                caller,
-                callee,
-                getattr(node, "lineno", "?"),
-            )
+        self._pending.append((caller, parts, getattr(node, "lineno", "?"), False))
 
         # --------- HOF / callback  some_helper(process_message_sync) ---
-        def _maybe_add(expr: ast.AST) -> None:
+        for expr in [*node.args, *(kw.value for kw in node.keywords)]:
             if isinstance(expr, (ast.Name, ast.Attribute)):
                 parts = _AttrChain.parts(expr)
                 if parts:
-                    tgt = self._resolve_parts(parts)
-                    if tgt and tgt != caller:
-                        self._call_graph[caller].add(tgt)
-                        self.log.debug(
-                            "P2-EDGE(HOF)  %s  →  %s  (line %s)",
-                            caller,
-                            tgt,
-                            getattr(expr, "lineno", "?"),
-                        )
-
-        for arg in node.args:
-            _maybe_add(arg)
-        for kw in node.keywords:
-            _maybe_add(kw.value)
+                    self._pending.append(
+                        (caller, parts, getattr(expr, "lineno", "?"), True)
+                    )
 
-        self.generic_visit(node)
+    def finish(self) -> None:
+        """Resolve the recorded calls into call-graph edges."""
+        for caller, parts, lineno, is_hof in self._pending:
+            callee = self._resolve_parts(parts)
+            if not callee or (is_hof and callee == caller):
+                continue
+            self._call_graph[caller].add(callee)
+            self.log.debug(
+                "P2-EDGE%s  %s  →  %s  (line %s)",
+                "(HOF)" if is_hof else "",
+                caller,
+                callee,
+                lineno,
+            )
+        self._pending.clear()
 
     # ---------------------------------------------------------------------
     def _resolve_parts(self, parts: list[str]) -> str | None:
@@ -359,15 +560,89 @@ class _PhaseTwoVisitor(ast.NodeVisitor):
 ###############################################################################
 # 5.  Public driver ###########################################################
 ###############################################################################
-class ProjectAnalyzer:
+class _AnalyzerView:
+    """
+    Read-only queries detectors make against the analysis, shared by
+    `ProjectAnalyzer` and the `AnalyzerSnapshot` shipped to worker processes.
+    """
+
+    # ------------------------------------------------------------------
+    # Exposed properties for compatibility with ai_call_analysis
+    # ------------------------------------------------------------------
+    @property
+    def ai_calls(self) -> list[AICall]:
+        return self._ai_sinks
+
+    @property
+    def ai_functions(self) -> Set[str]:
+        return self._ai_funcs
+
+    @property
+    def call_graph(self) -> Mapping[str, Set[str]]:
+        return _AdjacencyView(self._graph)
+
+    @property
+    def reverse_call_graph(self) -> Mapping[str, List[str]]:
+        """callee → callers (in first-edge order); the inverse of `call_graph`."""
+        return _AdjacencyView(self._graph, reverse=True)
+
+    @property
+    def qualname_to_node(self) -> Mapping[str, ast.AST]:
+        """Mapping from qualified function name to AST node for detector compatibility."""
+        return self._qualname_to_node
+
+    # ------------------------------------------------------------------
+    # Additional methods for llm_code_audit.py compatibility
+    # ------------------------------------------------------------------
+    def callers_of(self, qname: str) -> List[str]:
+        """Return list of function names that call the given qualified name."""
+        sid = self._graph.id_of(qname)
+        if sid is None:
+            return []
+        return [self._graph.name(c) for c in self._graph.callers(sid)]
+
+    def callees_of(self, qname: str) -> List[str]:
+        """Return list of function names called by the given qualified name."""
+        sid = self._graph.id_of(qname)
+        if sid is None:
+            return []
+        return [self._graph.name(c) for c in self._graph.callees(sid)]
+
+    def resolve_name(self, path: Path, dotted: str) -> str:
+        """*dotted* with its leading import alias in file *path* resolved."""
+        tracker = self._trackers.get(path)
+        if tracker is None or not dotted:
+            return dotted
+        base, dot, rest = dotted.partition(".")
+        return tracker.resolve(base) + dot + rest
+
+    def source_of(self, qname: str) -> tuple[PythonASTUnit, ast.AST]:
+        """Return (unit, node) tuple for the given qualified function name."""
+        if qname in self._where:
+            return self._where[qname]
+        # If not found, try to construct a dummy response to avoid crashes
+        # This shouldn't happen in practice if call graph is correctly built
+        raise KeyError(f"No source found for qualified name: {qname}")
+
+
+class ProjectAnalyzer(_AnalyzerView):
     """Run both phases over all PythonASTUnits and expose results."""
 
-    def __init__(self, units: Iterable[PythonASTUnit], call_depth: int = 2):
+    def __init__(
+        self,
+        units: Iterable[PythonASTUnit],
+        call_depth: int = 2,
+        cache: AnalysisCache | None = None,
+        root: Path | None = None,
+    ):
         self.log = logging.getLogger(__name__)
         self.units = list(units)
         self.call_depth = call_depth
+        self.cache = cache
         # directory shared by *all* source files – used for nice mod-names
-        if self.units:
+        if root is not None:
+            self.root = root
+        elif self.units:
             self.root = Path(os.path.commonpath(u.path for u in self.units))
         else:
             # If no Python files found, use current working directory
@@ -376,16 +651,18 @@ class ProjectAnalyzer:
         # AI call analysis state
         self._trackers: dict[Path, _ImportTracker] = {}
         self._ai_sinks: list[AICall] = []
-        self._call_graph: dict[str, Set[str]] = defaultdict(set)
+        # interned call graph with forward + reverse adjacency
+        self._graph = _CallGraph()
         self._ai_funcs: Set[str] = set()
-        self._nodes: dict[int, ast.AST] = {}  # id(node) -> node
-        self._units_by_node: dict[ast.AST, PythonASTUnit] = {}
-        self._id_to_qname: dict[int, str] = {}
-        self._qname_to_id: dict[str, int] = {}
-        self._nx_graph = nx.DiGraph()
-        self._where: dict[str, tuple[PythonASTUnit, ast.AST]] = {}
+        # def symbol → None, plus plain ``module.name`` symbol → def symbol
+        self._def_syms: dict[int, int | None] = {}
+        self._where = _DefSites()
         self.ai_modules: set[str] = set()
 
+        # per-file facts: restored from the cache / freshly computed (to store)
+        self._cached: dict[Path, dict] = {}
+        self._fresh: dict[Path, dict] = {}
+
         # cache: file path → derived module name (sanitised, root-relative)
         self._modnames = {
             u.path: _path_to_modname(self.root, u.path) for u in self.units
@@ -396,7 +673,7 @@ class ProjectAnalyzer:
             unit.modname = self._modnames[unit.path]
 
         # Add _qualname_to_node mapping for detector compatibility
-        self._qualname_to_node: dict[str, ast.AST] = {}
+        self._qualname_to_node = _DefSites(nodes_only=True)
 
         # Component inventory state (for backward compatibility)
         self.inventories: Dict[str, FileInventory] = {}
@@ -409,121 +686,225 @@ class ProjectAnalyzer:
             self.log.info("No Python files found to analyze")
             return self
 
-        self._phase_one()
-        self._phase_two()
+        self._load_cache()
+        self._scan_units()
         self._propagate_ai_tags()
         self._mark_ai_modules()
         self._build_component_inventories()
+        self._store_cache()
         return self
 
     # ------------------------------------------------------------------
-    def _phase_one(self):
-        """Phase 1: collect import aliases and direct AI sinks."""
+    def _load_cache(self) -> None:
+        """Restore per-file facts for every unit whose content is cached."""
+        if self.cache is None:
+            return
         for unit in self.units:
-            tracker = _ImportTracker()
-            self._trackers[unit.path] = tracker
-            visitor = _PhaseOneVisitor(unit, tracker, self._ai_sinks)
-            visitor.visit(unit.tree)
-        self.log.info("Phase‑1: found %d direct AI calls", len(self._ai_sinks))
+            facts = self.cache.load(self.cache.key(unit.path, unit.source))
+            # qualnames embed the module name, which depends on the scan root
+            if facts is not None and facts.get("modname") == unit.modname:
+                self._cached[unit.path] = facts
+        self.log.info(
+            "Analysis cache: reusing %d of %d files", len(self._cached), len(self.units)
+        )
+
+    def _store_cache(self) -> None:
+        if self.cache is None:
+            return
+        for unit in self.units:
+            facts = self._fresh.get(unit.path)
+            if facts is not None:
+                self.cache.store(self.cache.key(unit.path, unit.source), facts)
 
     # ------------------------------------------------------------------
-    def _phase_two(self):
-        """Phase 2: build call graph between user-defined functions."""
+    def _scan_units(self):
+        """Phase 1 + 2: aliases, direct AI sinks, call graph and def sites."""
         for unit in self.units:
-            mod_name = self._modnames[unit.path]
-            tracker = self._trackers[unit.path]
-            visitor = _PhaseTwoVisitor(mod_name, tracker, self._call_graph, pa=self)
-
-            visitor.visit(unit.tree)
-            # ─── gather every Def/Lambda so detectors can ask for source later ───
-            for node in ast.walk(unit.tree):
-                if isinstance(
-                    node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)
-                ):
-                    q = unit.qualname(node)
-                    self._where[q] = (unit, node)
-                    self._nodes[id(node)] = node
-                    self._units_by_node[node] = unit
-                    self._id_to_qname[id(node)] = q
-                    self._qname_to_id[q] = id(node)
-                    # Populate _qualname_to_node for detector compatibility
-                    self._qualname_to_node[q] = node
-                    # Lambdas are anonymous – they have no `.name` attribute.
-                    if hasattr(node, "name"):
-                        plain = f"{self._modnames[unit.path]}.{node.name}"
-                        # Also map the plain name for compatibility
-                        self._qualname_to_node[plain] = node
-                    else:  # ast.Lambda → give it a synthetic, lineno-based label
-                        plain = f"{self._modnames[unit.path]}.<lambda>@{getattr(node, 'lineno', 0)}"
-
-                    self._qname_to_id.setdefault(plain, id(node))
-                    self._nx_graph.add_node(id(node))
-
-        # ── after *all* units are processed we finally connect the graph IDs ──
-        for caller, callees in self._call_graph.items():
-            src_id = self._qname_to_id.get(caller)
-            if src_id is None:
-                continue
-            for callee in callees:
-                dst_id = self._qname_to_id.get(callee)
-                if dst_id is not None:
-                    self._nx_graph.add_edge(src_id, dst_id)
+            tracker = _ImportTracker()
+            self._trackers[unit.path] = tracker
+
+            cached = self._cached.get(unit.path)
+            if cached is not None:
+                facts = cached
+                tracker.aliases.update(cached["aliases"])
+                self._ai_sinks.extend(
+                    AICall(fq_name, unit.path, lineno, scope)
+                    for fq_name, lineno, scope in cached["sinks"]
+                )
+            else:
+                facts = self._fresh[unit.path] = self._scan_unit(unit, tracker)
+
+            for caller, callees in facts["edges"].items():
+                for callee in callees:
+                    self._graph.add_edge(caller, callee)
+            for qname, name, lineno, col in facts["defs"]:
+                self._add_def(unit, qname, name, lineno, col)
+        self.log.info("Phase‑1: found %d direct AI calls", len(self._ai_sinks))
 
+        self._graph.freeze()
         self.log.debug(
             "Phase-2: constructed call graph with %d edges",
-            self._nx_graph.number_of_edges(),
+            self._graph.number_of_edges(),
+        )
+
+    def _scan_unit(self, unit: PythonASTUnit, tracker: _ImportTracker) -> dict:
+        """
+        Collect every cacheable per-file fact in a *single* traversal of
+        *unit* (`PythonASTUnit.walk`): Phase-1 aliases and sinks, Phase-2
+        edges, def sites, imported frameworks and raw inventory components.
+        """
+        first_sink = len(self._ai_sinks)
+        local_graph: dict[str, Set[str]] = defaultdict(set)
+        phase_two = _PhaseTwoVisitor(
+            self._modnames[unit.path], tracker, local_graph, pa=self
+        )
+        phase_one = _PhaseOneVisitor(
+            unit, tracker, self._ai_sinks, scope_of=phase_two.current_scope
+        )
+
+        imports: list[str] = []
+        # defs / component candidates are keyed (depth, position) so they can
+        # be replayed in breadth-first order – the order `ast.walk` used to
+        # give them, which decides who wins on duplicate plain names
+        defs: list[tuple[int, int, ast.AST]] = []
+        candidates: list[tuple[int, int, ast.AST]] = []
+        skip_below: int | None = None  # Phase-1 ignores this subtree
+        for i, (node, depth) in enumerate(unit.walk()):
+            phase_two.visit(node, depth)  # first: keeps current_scope() in sync
+            if skip_below is not None and depth <= skip_below:
+                skip_below = None
+            if skip_below is None and not phase_one.visit(node):
+                skip_below = depth
+
+            t = type(node)
+            if t is ast.Import:
+                imports.extend(alias.name for alias in node.names)
+            elif t is ast.ImportFrom:
+                if node.module:
+                    imports.append(node.module)
+            elif t is ast.Call or t is ast.Assign:
+                candidates.append((depth, i, node))
+            elif t is ast.FunctionDef or t is ast.AsyncFunctionDef:
+                defs.append((depth, i, node))
+                candidates.append((depth, i, node))
+            elif t is ast.Lambda:
+                defs.append((depth, i, node))
+        phase_two.finish()
+
+        defs.sort()  # positions are unique, so nodes are never compared
+        candidates.sort()
+        return {
+            "modname": unit.modname,
+            "aliases": dict(tracker.aliases),
+            "sinks": [
+                [c.fq_name, c.lineno, c.scope] for c in self._ai_sinks[first_sink:]
+            ],
+            "edges": {
+                caller: sorted(callees) for caller, callees in local_graph.items()
+            },
+            # Lambdas are anonymous – they have no `.name` attribute.
+            "defs": [
+                [unit.qualname(n), getattr(n, "name", None), n.lineno, n.col_offset]
+                for _, _, n in defs
+            ],
+            "frameworks": frameworks_from_imports(imports),
+            "components": [
+                r
+                for r in (self._component_record(n, unit) for _, _, n in candidates)
+                if r is not None
+            ],
+        }
+
+    def _add_def(
+        self, unit: PythonASTUnit, q: str, name: str | None, lineno: int, col: int
+    ) -> None:
+        """Register a def site under its qualname (and plain name)."""
+        q = self._graph.canonical(q)
+        self._where.add(q, unit, lineno, col)
+        did = self._graph.intern(q)
+        self._def_syms[did] = None
+        # Populate _qualname_to_node for detector compatibility
+        self._qualname_to_node.add(q, unit, lineno, col)
+        if name is not None:
+            plain = f"{self._modnames[unit.path]}.{name}"
+            # Also map the plain name for compatibility
+            self._qualname_to_node.add(plain, unit, lineno, col)
+        else:  # ast.Lambda → give it a synthetic, lineno-based label
+            plain = f"{self._modnames[unit.path]}.<lambda>@{lineno}"
+        self._def_syms.setdefault(self._graph.intern(plain), did)
+
+    def to_networkx(self):
+        """
+        The def-to-def call graph as a ``networkx.DiGraph`` keyed by qualname
+        (plain ``module.name`` references are resolved to their def).  Built
+        on demand – networkx is only needed for export.
+        """
+        import networkx as nx
+
+        def _def(sid: int) -> int | None:
+            if sid not in self._def_syms:
+                return None
+            target = self._def_syms[sid]
+            return sid if target is None else target
+
+        g = self._graph
+        graph = nx.DiGraph()
+        graph.add_nodes_from(
+            g.name(sid) for sid, target in self._def_syms.items() if target is None
         )
+        for src in g.callers_ids():
+            a = _def(src)
+            if a is None:
+                continue
+            for dst in g.callees(src):
+                b = _def(dst)
+                if b is not None:
+                    graph.add_edge(g.name(a), g.name(b))
+        return graph
 
     # ------------------------------------------------------------------
     def _propagate_ai_tags(self):
         """Propagate AI tags up the call graph to mark wrapper functions."""
         # 1️⃣  start set = every *direct* sink's enclosing def (or module)
-        sink_funcs: Set[str] = set()
-        for call in self._ai_sinks:
-            # Walk parents until FunctionDef / AsyncFunctionDef or Module
-            unit = next(u for u in self.units if u.path == call.file)
-            node = _node_at_lineno(unit.tree, call.lineno)
-            while node and not isinstance(
-                node, (ast.FunctionDef, ast.AsyncFunctionDef)
-            ):
-                node = getattr(node, "parent", None)
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                sink_funcs.add(f"{self._modnames[unit.path]}.{node.name}")
-            else:  # module-level statement
-                sink_funcs.add(self._modnames[unit.path])
+        # (recorded by Phase-1 – no tree lookups needed here)
+        g = self._graph
+        sink_funcs: Set[int] = {g.intern(call.scope) for call in self._ai_sinks}
 
         # but we can do better: when PhaseTwo built edges caller->callee
-        for caller, callees in self._call_graph.items():
-            if any(_PROVIDER_RX.search(c) for c in callees):
-                sink_funcs.add(caller)
+        for callee in g.callees_ids():
+            if _PROVIDER_RX.search(g.name(callee)):
+                sink_funcs.update(g.callers(callee))
 
-        self._ai_funcs = set(sink_funcs)
+        ai_funcs = set(sink_funcs)
         # BFS up the graph
         frontier = set(sink_funcs)
         depth = 0
+        callees_by_basename: dict[str, list[int]] | None = None
         while frontier and depth < self.call_depth:
             # ① try strict match first ------------------------------------
-            parents = {
-                caller
-                for caller, callees in self._call_graph.items()
-                if callees & frontier
-            }
+            parents = {c for f in frontier for c in g.callers(f)}
 
             # ② fallback: match on *basename* (last segment) ---------------
             if not parents:
-                frontier_basenames = {f.split(".")[-1] for f in frontier}
+                if callees_by_basename is None:
+                    callees_by_basename = defaultdict(list)
+                    for callee in g.callees_ids():
+                        base = g.name(callee).split(".")[-1]
+                        callees_by_basename[base].append(callee)
                 parents = {
-                    caller
-                    for caller, callees in self._call_graph.items()
-                    if {c.split(".")[-1] for c in callees} & frontier_basenames
+                    c
+                    for base in {g.name(f).split(".")[-1] for f in frontier}
+                    for callee in callees_by_basename.get(base, ())
+                    for c in g.callers(callee)
                 }
 
-            new = parents - self._ai_funcs
+            new = parents - ai_funcs
             if not new:
                 break
-            self._ai_funcs.update(new)
+            ai_funcs.update(new)
             frontier = new
             depth += 1
+        self._ai_funcs = {g.name(sid) for sid in ai_funcs}
         self.log.info(
             "Propagated AI tags to %d functions (depth %d)", len(self._ai_funcs), depth
         )
@@ -536,17 +917,16 @@ class ProjectAnalyzer:
 
         # 2️⃣ files defining an AI-tagged function
         for fn in self._ai_funcs:
-            entry = self._where.get(fn)
-            if entry:
-                u, _ = entry
+            u = self._where.unit_of(fn)
+            if u:
                 self.ai_modules.add(u.path.as_posix())
 
-        # 3️⃣ one-hop callers
-        for caller, callees in self._call_graph.items():
-            entry = self._where.get(caller)
-            if entry:
-                u, _ = entry
-                self.ai_modules.add(u.path.as_posix())
+        # 3️⃣ one-hop callers of the AI-tagged functions
+        for fn in self._ai_funcs:
+            for caller in self.callers_of(fn):
+                u = self._where.unit_of(caller)
+                if u:
+                    self.ai_modules.add(u.path.as_posix())
 
         # tag the unit as an ai module for quick lookups
         for u in self.units:
@@ -555,45 +935,48 @@ class ProjectAnalyzer:
     def _build_component_inventories(self):
         """Build component inventories for backward compatibility with existing code."""
         for unit in self.units:
+            facts = self._cached.get(unit.path) or self._fresh[unit.path]
+            frameworks, records = facts["frameworks"], facts["components"]
+
             inventory = FileInventory(
                 file_path=str(unit.path),
-                frameworks=detect_frameworks(unit.tree),
+                frameworks=frameworks,
                 components=[],
             )
             self.inventories[str(unit.path)] = inventory
 
-            for node in ast.walk(unit.tree):
-                component = self._node_to_component(node, unit)
-                if component:
-                    # Deduplication: if a component with this name exists, merge/replace as needed
-                    existing = self._component_map.get(component.name)
-                    if existing:
-                        # Prefer real location/code_snippet over stub
-                        if (
-                            existing.location == "unknown" or not existing.code_snippet
-                        ) and (
-                            component.location != "unknown" and component.code_snippet
-                        ):
-                            existing.location = component.location
-                            existing.code_snippet = component.code_snippet
-                            existing.component_type = component.component_type
-                        # Always merge call_chain and relationships
-                        existing.call_chain = list(
-                            set(existing.call_chain + component.call_chain)
-                        )
-                        existing.relationships.extend(
-                            [
-                                r
-                                for r in component.relationships
-                                if r not in existing.relationships
-                            ]
-                        )
-                    else:
-                        inventory.add_component(component)
-                        self._component_map[component.name] = component
-                    self._map_relationships(
-                        self._component_map[component.name], node, unit
+            for record in records:
+                component = Component(
+                    name=record["name"],
+                    component_type=record["component_type"],
+                    location=record["location"],
+                    code_snippet=record["code_snippet"],
+                )
+                # Deduplication: if a component with this name exists, merge/replace as needed
+                existing = self._component_map.get(component.name)
+                if existing:
+                    # Prefer real location/code_snippet over stub
+                    if (
+                        existing.location == "unknown" or not existing.code_snippet
+                    ) and (component.location != "unknown" and component.code_snippet):
+                        existing.location = component.location
+                        existing.code_snippet = component.code_snippet
+                        existing.component_type = component.component_type
+                    # Always merge call_chain and relationships
+                    existing.call_chain = list(
+                        set(existing.call_chain + component.call_chain)
+                    )
+                    existing.relationships.extend(
+                        [
+                            r
+                            for r in component.relationships
+                            if r not in existing.relationships
+                        ]
                     )
+                else:
+                    inventory.add_component(component)
+                    self._component_map[component.name] = component
+                self._map_relationships(self._component_map[component.name], record)
 
         # === Populate Call Chains from Graph ===
         for inventory in self.inventories.values():
@@ -601,12 +984,26 @@ class ProjectAnalyzer:
                 # Use our sophisticated call graph instead of NetworkX
                 if component.name in self._ai_funcs:
                     # Find callers of this component
-                    callers = [
-                        caller
-                        for caller, callees in self._call_graph.items()
-                        if component.name in callees
-                    ]
-                    component.call_chain = callers
+                    component.call_chain = self.callers_of(component.name)
+
+    def _component_record(self, node: ast.AST, unit: PythonASTUnit) -> Optional[dict]:
+        """
+        Cacheable, file-local description of the component (if any) for
+        *node*: its fields, the names it "uses" and – for defs – the qualname
+        whose call-graph edges become "calls" relationships.
+        """
+        component = self._node_to_component(node, unit)
+        if component is None:
+            return None
+        is_def = isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+        return {
+            "name": component.name,
+            "component_type": component.component_type,
+            "location": component.location,
+            "code_snippet": component.code_snippet,
+            "calls_of": unit.qualname(node) if is_def else None,
+            "uses": self._uses_of(node),
+        }
 
     def _node_to_component(
         self, node: ast.AST, unit: PythonASTUnit
@@ -672,10 +1069,24 @@ class ProjectAnalyzer:
             code_snippet=get_code_snippet(unit.source, node),
         )
 
-    def _map_relationships(
-        self, component: Component, node: ast.AST, unit: PythonASTUnit
-    ):
+    def _map_relationships(self, component: Component, record: dict):
         """Map relationships between components using our sophisticated call graph."""
+        # Function definitions "call" whatever the call graph says they call
+        func_qualname = record["calls_of"]
+        if func_qualname is not None:
+            for callee in self.callees_of(func_qualname):
+                component.relationships.append(
+                    Relationship(target_name=callee, type="calls")
+                )
+        for target in record["uses"]:
+            component.relationships.append(
+                Relationship(target_name=target, type="uses")
+            )
+
+    @staticmethod
+    def _uses_of(node: ast.AST) -> list[str]:
+        """Names a component node "uses" (call args, LCEL operands, parameters)."""
+        uses: list[str] = []
         # This is the node that contains the core logic (e.g., the Call or BinOp)
         node_to_inspect = node
         if isinstance(node, ast.Assign):
@@ -686,84 +1097,115 @@ class ProjectAnalyzer:
             args = [kw.value for kw in node_to_inspect.keywords] + node_to_inspect.args
             for arg_node in args:
                 if isinstance(arg_node, ast.Name):
-                    # This check should be against the component map, not just appending
-                    component.relationships.append(
-                        Relationship(target_name=arg_node.id, type="uses")
-                    )
+                    uses.append(arg_node.id)
 
         # Find "uses" relationships from the LCEL Pipe Operator
         elif isinstance(node_to_inspect, ast.BinOp) and isinstance(
             node_to_inspect.op, ast.BitOr
         ):
             if isinstance(node_to_inspect.left, ast.Name):
-                component.relationships.append(
-                    Relationship(target_name=node_to_inspect.left.id, type="uses")
-                )
+                uses.append(node_to_inspect.left.id)
             if isinstance(node_to_inspect.right, ast.Name):
-                component.relationships.append(
-                    Relationship(target_name=node_to_inspect.right.id, type="uses")
-                )
+                uses.append(node_to_inspect.right.id)
 
-        # --- THIS IS THE COMBINED BLOCK FOR FUNCTION DEFINITIONS ---
+        # Find "uses" relationships for the function's parameters
         if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            # Use our sophisticated call graph to find relationships
-            func_qualname = unit.qualname(node)
-            if func_qualname in self._call_graph:
-                for callee in self._call_graph[func_qualname]:
-                    component.relationships.append(
-                        Relationship(target_name=callee, type="calls")
-                    )
-
-            # Find "uses" relationships for the function's parameters
             for arg in node.args.args:
                 if arg.arg == "self":
                     continue
-                component.relationships.append(
-                    Relationship(target_name=arg.arg, type="uses")
-                )
+                uses.append(arg.arg)
+        return uses
 
-    # ------------------------------------------------------------------
-    # Exposed properties for compatibility with ai_call_analysis
-    # ------------------------------------------------------------------
-    @property
-    def ai_calls(self) -> list[AICall]:
-        return self._ai_sinks
+    def ai_status_by_file(self) -> dict[Path, tuple[bool, tuple[str, ...]]]:
+        """
+        Per file: whether it is an AI module and which AI-tagged functions it
+        defines or calls – what detectors learn about a file from the rest of
+        the project.  The LLM audit also reads the *source* of neighbouring
+        functions; see `context_files_by_file()`.
+        """
+        touched: dict[Path, set[str]] = defaultdict(set)
+        for fn in self._ai_funcs:
+            u = self._where.unit_of(fn)
+            if u:
+                touched[u.path].add(fn)
+            for caller in self.callers_of(fn):
+                u = self._where.unit_of(caller)
+                if u:
+                    touched[u.path].add(fn)
+        return {
+            u.path: (u.is_ai_module, tuple(sorted(touched[u.path]))) for u in self.units
+        }
 
-    @property
-    def ai_functions(self) -> Set[str]:
-        return self._ai_funcs
+    def context_files_by_file(self) -> dict[Path, frozenset[Path]]:
+        """
+        Per file: the other files defining a direct caller or callee of one of
+        its AI-tagged functions – the source the LLM audit sends along with
+        them as context.
+        """
+        context: dict[Path, set[Path]] = defaultdict(set)
+        for fn in self._ai_funcs:
+            home = self._where.unit_of(fn)
+            if not home:
+                continue
+            for other in (*self.callers_of(fn), *self.callees_of(fn)):
+                u = self._where.unit_of(other)
+                if u and u.path != home.path:
+                    context[home.path].add(u.path)
+        return {path: frozenset(paths) for path, paths in context.items()}
 
-    @property
-    def call_graph(self) -> Mapping[str, Set[str]]:
-        return self._call_graph
+    def snapshot(self) -> "AnalyzerSnapshot":
+        """Picklable, read-only copy of the results for worker processes."""
+        return AnalyzerSnapshot(self)
 
-    @property
-    def qualname_to_node(self) -> Dict[str, ast.AST]:
-        """Mapping from qualified function name to AST node for detector compatibility."""
-        return self._qualname_to_node
 
-    # ------------------------------------------------------------------
-    # Additional methods for llm_code_audit.py compatibility
-    # ------------------------------------------------------------------
-    def callers_of(self, qname: str) -> List[str]:
-        """Return list of function names that call the given qualified name."""
-        callers = []
-        for caller, callees in self._call_graph.items():
-            if qname in callees:
-                callers.append(caller)
-        return callers
+class AnalyzerSnapshot(_AnalyzerView):
+    """
+    What detectors can ask a finished `ProjectAnalyzer` – AI calls and
+    functions, AI modules, inventories, import aliases and the call graph –
+    without its units and trees, so it pickles cheaply to worker processes.
 
-    def callees_of(self, qname: str) -> List[str]:
-        """Return list of function names called by the given qualified name."""
-        return list(self._call_graph.get(qname, []))
+    Def sites are kept as ``(path, lineno, col)``; `attach()` binds them to
+    the worker's own units (re-parsed from source there) so `source_of()`
+    and `qualname_to_node` work as in the parent.
+    """
 
-    def source_of(self, qname: str) -> tuple[PythonASTUnit, ast.AST]:
-        """Return (unit, node) tuple for the given qualified function name."""
-        if qname in self._where:
-            return self._where[qname]
-        # If not found, try to construct a dummy response to avoid crashes
-        # This shouldn't happen in practice if call graph is correctly built
-        raise KeyError(f"No source found for qualified name: {qname}")
+    def __init__(self, analyzer: ProjectAnalyzer):
+        self._ai_sinks = list(analyzer._ai_sinks)
+        self._ai_funcs = frozenset(analyzer._ai_funcs)
+        self.ai_modules = frozenset(analyzer.ai_modules)
+        self.inventories = dict(analyzer.inventories)
+        self._trackers = dict(analyzer._trackers)
+        self._graph = analyzer._graph  # frozen – only read from here on
+        self._def_sites = _sites_by_path(analyzer._where)
+        self._node_sites = _sites_by_path(analyzer._qualname_to_node)
+        self._where = _DefSites()
+        self._qualname_to_node = _DefSites(nodes_only=True)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_where"], state["_qualname_to_node"]  # bound to local units
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._where = _DefSites()
+        self._qualname_to_node = _DefSites(nodes_only=True)
+
+    def attach(self, units: Iterable[PythonASTUnit]) -> None:
+        """Resolve def sites against *units* (those of other files stay unknown)."""
+        by_path = {u.path: u for u in units}
+        for table, sites in (
+            (self._where, self._def_sites),
+            (self._qualname_to_node, self._node_sites),
+        ):
+            for qname, (path, lineno, col) in sites.items():
+                unit = by_path.get(path)
+                if unit is not None:
+                    table.add(qname, unit, lineno, col)
+
+
+def _sites_by_path(sites: _DefSites) -> dict[str, tuple[Path, int, int]]:
+    return {q: (u.path, lineno, col) for q, (u, lineno, col) in sites._sites.items()}
 
 
 # ---------------------------------------------------------------------------
@@ -797,7 +1239,7 @@ def is_ai_call(node: ast.Call) -> bool:
         return True
 
     # match functions that were tagged by the call-graph pass
-    unit = getattr(node, "_unit", None)  # type: PythonASTUnit | None
+    unit = unit_of(node)
     if unit is not None:
 
         def _resolve_to_qname(parts: list[str]) -> str:
@@ -816,7 +1258,6 @@ def is_ai_call(node: ast.Call) -> bool:
             return True
 
     # alias-aware match
-    unit = getattr(node, "_unit", None)
     if unit and unit.path in analyzer._trackers:
         tracker = analyzer._trackers[unit.path]
         base, *rest = parts
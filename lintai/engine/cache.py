@@ -0,0 +1,117 @@
+"""
+lintai.engine.cache
+-------------------
+Persistent on-disk cache of *per-file* analysis facts.
+
+`ProjectAnalyzer` stores what its module / link passes learn about a file
+(import aliases, direct AI sinks, call-graph edges, def locations and raw
+inventory components) so that an unchanged file can skip those visitors on
+the next run – and, when nothing else needs its AST, skip parsing too.
+
+Entries are keyed by ``sha256(salt + path + source)``; the salt folds in the
+lintai version and the active ruleset, so upgrading lintai or editing rules
+invalidates everything.  Each entry is one JSON file under
+``<cache-dir>/<key[:2]>/<key>.json``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+#: bump whenever the layout of a cached entry changes
+_SCHEMA = 2
+
+DEFAULT_CACHE_DIR = Path(".lintai_cache")
+
+
+def ruleset_digest(ruleset: Path | None) -> str:
+    """Stable digest of a ruleset file / folder (empty string when none)."""
+    if ruleset is None:
+        return ""
+    p = Path(ruleset)
+    files = (
+        sorted(f for f in p.iterdir() if f.suffix in {".yml", ".yaml", ".json"})
+        if p.is_dir()
+        else [p]
+    )
+    h = hashlib.sha256()
+    for f in files:
+        h.update(f.name.encode())
+        h.update(f.read_bytes())
+    return h.hexdigest()
+
+
+def ensure_cache_dir(directory: Path) -> None:
+    """Create *directory* (and a catch-all ``.gitignore``) if it is missing."""
+    if directory.is_dir():
+        return
+    directory.mkdir(parents=True, exist_ok=True)
+    # keep the cache out of version control, like .pytest_cache / .ruff_cache
+    (directory / ".gitignore").write_text("# created by lintai\n*\n")
+
+
+class AnalysisCache:
+    """Content-addressed store for per-file analysis facts."""
+
+    def __init__(self, directory: Path, salt: str = "") -> None:
+        self.dir = Path(directory)
+        self.salt = f"{_SCHEMA}:{salt}"
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def for_run(cls, directory: Path, ruleset: Path | None = None) -> "AnalysisCache":
+        """Cache salted with the installed lintai version and *ruleset*."""
+        from lintai import __version__
+
+        return cls(directory, salt=f"{__version__}:{ruleset_digest(ruleset)}")
+
+    # ------------------------------------------------------------------ keys
+    def key(self, path: Path, text: str) -> str:
+        h = hashlib.sha256(self.salt.encode())
+        h.update(b"\0")
+        h.update(str(path).encode("utf-8", "surrogatepass"))
+        h.update(b"\0")
+        h.update(text.encode("utf-8", "surrogatepass"))
+        return h.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.dir / key[:2] / f"{key}.json"
+
+    # ------------------------------------------------------------------ I/O
+    def has(self, key: str) -> bool:
+        return self._path(key).is_file()
+
+    def load(self, key: str) -> dict | None:
+        """Return the cached facts for *key*, or None on a miss."""
+        try:
+            facts = json.loads(self._path(key).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError) as exc:  # corrupt entry → treat as miss
+            logger.debug("analysis cache: unreadable entry %s – %s", key, exc)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return facts
+
+    def store(self, key: str, facts: dict) -> None:
+        """Atomically write *facts* for *key*; failures are logged, never raised."""
+        target = self._path(key)
+        try:
+            ensure_cache_dir(self.dir)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(facts, fh, separators=(",", ":"))
+            os.replace(tmp, target)
+        except OSError as exc:
+            logger.warning("analysis cache: could not write %s – %s", target, exc)
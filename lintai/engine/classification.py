@@ -2,6 +2,7 @@
 
 import re
 import ast
+from typing import Iterable
 
 # Using the more comprehensive regex from your original ai_tags.py
 PROVIDER_RX = re.compile(
@@ -154,15 +155,20 @@ def classify_component_type(name: str) -> str:
 
 def detect_frameworks(tree: ast.AST) -> list[str]:
     """Detects frameworks from import statements."""
-    detected = set()
-    imports = set()
+    imports = []
     for node in ast.walk(tree):
         if isinstance(node, ast.Import):
             for alias in node.names:
-                imports.add(alias.name)
+                imports.append(alias.name)
         elif isinstance(node, ast.ImportFrom) and node.module:
-            imports.add(node.module)
+            imports.append(node.module)
+    return frameworks_from_imports(imports)
+
 
+def frameworks_from_imports(imported: Iterable[str]) -> list[str]:
+    """Detects frameworks from already collected imported module names."""
+    detected = set()
+    imports = set(imported)
     for fw, sig in FRAMEWORK_SIGNATURES.items():
         for lib in sig["imports"]:
             for imp in imports:
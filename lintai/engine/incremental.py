@@ -0,0 +1,156 @@
+"""
+lintai.engine.incremental
+-------------------------
+Support for ``lintai find-issues --since <git-ref>``.
+
+The whole project is still analysed (cheaply, via the analysis cache) so the
+call graph and AI tags are complete, but detectors only need to run on:
+
+1.  files changed since *ref* (tracked modifications + untracked new files);
+2.  unchanged files whose AI status *flips* because of those changes – e.g.
+    a helper in ``a.py`` stops calling OpenAI, so ``b.py`` which wraps the
+    helper is no longer an AI module;
+3.  unchanged files whose AI functions call, or are called by, a function
+    in a changed file – the LLM audit sends that source along as context.
+
+(2) and (3) are found by re-analysing the project with the changed files as
+they were at *ref* – files deleted or renamed since then included – and
+comparing `ProjectAnalyzer.ai_status_by_file()` /
+`ProjectAnalyzer.context_files_by_file()` of both runs.
+"""
+
+from __future__ import annotations
+
+import logging
+import subprocess
+from pathlib import Path
+from typing import List, Sequence
+
+from lintai.engine.analysis import ProjectAnalyzer
+from lintai.engine.cache import AnalysisCache
+from lintai.engine.python_ast_unit import PythonASTUnit
+
+logger = logging.getLogger(__name__)
+
+
+class GitError(RuntimeError):
+    """Raised when the git working tree / ref cannot be inspected."""
+
+
+def _git(args: Sequence[str], cwd: Path) -> str:
+    try:
+        res = subprocess.run(
+            ["git", *args], cwd=cwd, capture_output=True, text=True, check=True
+        )
+    except FileNotFoundError as exc:
+        raise GitError("git executable not found") from exc
+    except subprocess.CalledProcessError as exc:
+        raise GitError(exc.stderr.strip() or str(exc)) from exc
+    return res.stdout
+
+
+def git_toplevel(cwd: Path) -> Path:
+    return Path(_git(["rev-parse", "--show-toplevel"], cwd).strip())
+
+
+def changed_paths(ref: str, toplevel: Path) -> set[Path]:
+    """Absolute paths of files changed since *ref*, including untracked ones."""
+    out = _git(["diff", "--name-only", "--no-renames", "-z", ref, "--"], toplevel)
+    out += _git(["ls-files", "--others", "--exclude-standard", "-z"], toplevel)
+    return {(toplevel / p).resolve() for p in out.split("\0") if p}
+
+
+def deleted_paths(ref: str, toplevel: Path) -> set[Path]:
+    """Absolute paths of files that existed at *ref* but are gone now."""
+    out = _git(["diff", "--name-status", "--no-renames", "-z", ref, "--"], toplevel)
+    fields = out.split("\0")
+    # -z --name-status: "<status>\0<path>\0" per file (renames show as D + A)
+    return {
+        (toplevel / path).resolve()
+        for status, path in zip(fields[::2], fields[1::2])
+        if status == "D"
+    }
+
+
+def _source_at(ref: str, path: Path, toplevel: Path) -> str | None:
+    """Content of *path* at *ref*, or None when it did not exist there."""
+    rel = path.relative_to(toplevel).as_posix()
+    try:
+        return _git(["show", f"{ref}:{rel}"], toplevel)
+    except GitError:
+        return None
+
+
+def units_to_rescan(
+    units: List[PythonASTUnit],
+    analyzer: ProjectAnalyzer,
+    ref: str,
+    cache: AnalysisCache | None = None,
+) -> List[PythonASTUnit]:
+    """
+    Subset of *units* (already analysed by *analyzer*) whose findings may
+    differ from a scan at *ref*.  Order of *units* is preserved.
+    """
+    if not units:
+        return []
+    toplevel = git_toplevel(units[0].path.resolve().parent).resolve()
+    changed = changed_paths(ref, toplevel)
+
+    # Same project, but with every changed file as it was at <ref>
+    baseline: list[PythonASTUnit] = []
+    for u in units:
+        resolved = u.path.resolve()
+        if resolved in changed:
+            text = _source_at(ref, resolved, toplevel)
+            if text is None:  # new file – nothing to compare against
+                continue
+            try:
+                baseline.append(PythonASTUnit(u.path, text, u.path.parent))
+            except SyntaxError:
+                continue
+        else:
+            baseline.append(PythonASTUnit(u.path, u.source, u.path.parent, lazy=True))
+
+    # files gone since <ref> – a dependent may owe its AI status to them
+    root = analyzer.root.resolve()
+    for path in sorted(deleted_paths(ref, toplevel)):
+        if path.suffix != ".py" or not path.is_relative_to(root):
+            continue
+        text = _source_at(ref, path, toplevel)
+        if text is None:
+            continue
+        try:
+            baseline.append(PythonASTUnit(path, text, path.parent))
+        except SyntaxError:
+            continue
+
+    before = ProjectAnalyzer(
+        baseline, call_depth=analyzer.call_depth, cache=cache, root=analyzer.root
+    ).analyze()
+    old_status = before.ai_status_by_file()
+    new_status = analyzer.ai_status_by_file()
+    old_context = before.context_files_by_file()
+    new_context = analyzer.context_files_by_file()
+
+    selected = []
+    n_flipped = 0
+    for u in units:
+        if u.path.resolve() in changed:
+            selected.append(u)
+            continue
+        context = old_context.get(u.path, frozenset()) | new_context.get(
+            u.path, frozenset()
+        )
+        if old_status.get(u.path) != new_status.get(u.path) or any(
+            p.resolve() in changed for p in context
+        ):
+            n_flipped += 1
+            selected.append(u)
+    logger.info(
+        "Incremental scan since %s: %d changed + %d AI dependents of %d files",
+        ref,
+        len(selected) - n_flipped,
+        n_flipped,
+        len(units),
+    )
+    return selected
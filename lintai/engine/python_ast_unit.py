@@ -9,32 +9,57 @@ It:
 
 from __future__ import annotations
 import ast
+import bisect
+import heapq
+import weakref
+from array import array
+from contextlib import contextmanager
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Iterable, List
+from typing import Iterable, Iterator, List
 
 from lintai.detectors.base import SourceUnit
 
 
 class PythonASTUnit(SourceUnit):
     __slots__ = (
-        "tree",
+        "_tree",
+        "_defs_by_pos",
+        "_scopes",
+        "_intervals",
         "source",
+        "_by_type",
+        "_order",
+        "_owned",
         "_current",
-        "_call_nodes",
-        "_fstring_nodes",
         "modname",
         "is_ai_module",
     )
 
-    def __init__(self, path: Path, text: str, project_root: Path):
+    def __init__(
+        self,
+        path: Path,
+        text: str,
+        project_root: Path,
+        tree: ast.Module | None = None,
+        *,
+        lazy: bool = False,
+    ):
         super().__init__(path)
         self.source = text
-        self.tree = ast.parse(text, filename=str(path))
-        for parent in ast.walk(self.tree):
-            for child in ast.iter_child_nodes(parent):
-                setattr(child, "parent", parent)
-                # let helpers (is_ai_call) reach the tracker for this module
-                setattr(child, "_unit", self)
+        self._tree = None
+        self._defs_by_pos = None
+        self._scopes = None
+        self._intervals = None
+        self._by_type = None
+        self._order = None
+        self._owned = None
+        # *tree* may be handed in pre-parsed (e.g. by a worker process);
+        # with *lazy* parsing is deferred until somebody touches `.tree`
+        if tree is not None:
+            self._attach(tree)
+        elif not lazy:
+            self._attach(ast.parse(text, filename=str(path)))
 
         # --- NEW LOGIC for cleaner module names ---
         try:
@@ -45,14 +70,167 @@ class PythonASTUnit(SourceUnit):
             self.modname = ".".join(path.with_suffix("").parts[-2:])
 
         self._current = None
-        self._call_nodes = None  # lazy build
-        self._fstring_nodes = []  # filled by visitor
         # e.g.  path src/app/foo.py →  src.app.foo
         self.modname: str = ".".join(path.with_suffix("").parts).lstrip(".")
 
         # will be set by ProjectAnalyzer._mark_ai_modules()
         self.is_ai_module: bool = False
 
+        _LIVE_UNITS.add(self)
+
+    # ──────────────────────────────────────────────────────────────
+    #  AST access
+    # ──────────────────────────────────────────────────────────────
+    @property
+    def tree(self) -> ast.Module:
+        if self._tree is None:
+            self._attach(ast.parse(self.source, filename=str(self.path)))
+        return self._tree
+
+    @property
+    def is_parsed(self) -> bool:
+        return self._tree is not None
+
+    def _attach(self, tree: ast.Module) -> None:
+        # Nodes are *not* stamped with ``parent`` / ``_unit`` attributes –
+        # on big trees that was the single largest memory cost.  Scope
+        # lookups go through `enclosing_def()`, node → unit through the
+        # module-level `unit_of()`.
+        if self._owned is not None:
+            _forget(*self._owned)
+            self._owned = None
+        self._tree = tree
+        self._scopes = None
+        self._intervals = None
+        self._by_type = None
+        self._order = None
+
+    # ──────────────────────────────────────────────────────────────
+    #  Single traversal + node-type index
+    # ──────────────────────────────────────────────────────────────
+    def walk(self) -> Iterator[tuple[ast.AST, int]]:
+        """
+        Yield ``(node, depth)`` for every node in source order (depth-first,
+        pre-order), building the node-type and scope indexes on the way.
+
+        This is *the* traversal of a file: `ProjectAnalyzer` collects all of
+        its per-file facts from one pass of it, and `nodes_of()` (which the
+        detector dispatcher and helpers use) is served from the index it
+        leaves behind.  The index is only kept when the walk runs to the end.
+        """
+        by_type: dict[type, list[ast.AST]] = {}
+        order: dict[type, array] = {}
+        scopes: dict[ast.AST, ast.AST | None] = {}
+        stack: list[tuple[ast.AST, int, ast.AST | None]] = [(self.tree, 0, None)]
+        i = 0
+        while stack:
+            node, depth, scope = stack.pop()
+            t = type(node)
+            if t not in by_type:
+                by_type[t] = []
+                order[t] = array("I")
+            by_type[t].append(node)
+            order[t].append(i)
+            i += 1
+            if t in _SCOPE_TYPES:
+                scopes[node] = scope
+                scope = node
+            yield node, depth
+            children = list(ast.iter_child_nodes(node))
+            children.reverse()
+            stack.extend((c, depth + 1, scope) for c in children)
+        self._by_type, self._order, self._scopes = by_type, order, scopes
+
+    def _claim(self, node_type: type) -> None:
+        """Register this unit's nodes of *node_type* for `unit_of()`."""
+        # per type, on first query: helpers only ever ask about a few types,
+        # and a map of every node would cost more than the old per-node
+        # ``_unit`` attribute.  Dropped again when the tree is replaced or
+        # the unit dies.
+        self._ensure_index()
+        if self._owned is None:
+            self._owned = (self._by_type, set(), weakref.ref(self))
+            weakref.finalize(self, _forget, *self._owned)
+        by_type, claimed, ref = self._owned
+        if node_type not in claimed:
+            claimed.add(node_type)
+            _OWNERS.update(dict.fromkeys(by_type.get(node_type, ()), ref))
+
+    def _ensure_index(self) -> None:
+        if self._by_type is None:
+            for _ in self.walk():
+                pass
+
+    def nodes_of(self, *types: type) -> List[ast.AST]:
+        """
+        All nodes whose class is exactly one of *types*, in source order.
+        Served from the index built by `walk()` – no tree traversal.
+        """
+        self._ensure_index()
+        present = [t for t in types if t in self._by_type]
+        if not present:
+            return []
+        if len(present) == 1:
+            return self._by_type[present[0]]
+        merged = heapq.merge(*(zip(self._order[t], self._by_type[t]) for t in present))
+        return [node for _, node in merged]
+
+    def ordered_nodes_of(self, *types: type) -> List[tuple[int, ast.AST]]:
+        """`nodes_of()`, each node paired with its position in the traversal."""
+        self._ensure_index()
+        present = [t for t in types if t in self._by_type]
+        return list(
+            heapq.merge(*(zip(self._order[t], self._by_type[t]) for t in present))
+        )
+
+    def _scope_index(self) -> dict[ast.AST, ast.AST | None]:
+        """Map every FunctionDef / AsyncFunctionDef / Lambda to its enclosing one."""
+        if self._scopes is None:
+            self._ensure_index()
+        return self._scopes
+
+    def enclosing_def(self, node: ast.AST) -> ast.AST | None:
+        """
+        Innermost FunctionDef / AsyncFunctionDef / Lambda containing *node*
+        (*node* itself when it is one), or None at module level.
+        """
+        scopes = self._scope_index()
+        if node in scopes:
+            return node
+        pos = _start(node)
+        if pos is None:
+            return None
+        if self._intervals is None:
+            self._intervals = _DefIntervals(scopes)
+        return self._intervals.innermost(pos)
+
+    def enclosing_function(self, node: ast.AST) -> ast.AST | None:
+        """Like `enclosing_def()`, but climbs out of lambdas to the named def."""
+        fn = self.enclosing_def(node)
+        while isinstance(fn, ast.Lambda):
+            fn = self.parent_def(fn)
+        return fn
+
+    def parent_def(self, fn: ast.AST) -> ast.AST | None:
+        """Enclosing def of the def / lambda *fn* (None at module level)."""
+        return self._scope_index().get(fn)
+
+    def owns(self, node: ast.AST) -> bool:
+        """True when *node* belongs to this unit's (already parsed) tree."""
+        if self._tree is None:
+            return False
+        self._claim(type(node))
+        ref = _OWNERS.get(node)
+        return ref is not None and ref() is self
+
+    def def_at(self, lineno: int, col: int) -> ast.AST | None:
+        """Return the FunctionDef / AsyncFunctionDef / Lambda starting at *lineno:col*."""
+        if self._defs_by_pos is None:
+            self._defs_by_pos = {
+                (n.lineno, n.col_offset): n for n in self.nodes_of(*_SCOPE_TYPES)
+            }
+        return self._defs_by_pos.get((lineno, col))
+
     # ──────────────────────────────────────────────────────────────
     #  Public helper: get dotted qualname of a node
     # ──────────────────────────────────────────────────────────────
@@ -64,45 +242,26 @@ class PythonASTUnit(SourceUnit):
         • If node is not one of those, climbs to the nearest enclosing
           function; returns just ``self.modname`` when nothing matches.
         """
-        # climb up until we're outside every nested function
-        fn = node
-        while fn and not isinstance(
-            fn, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)
-        ):
-            fn = getattr(fn, "parent", None)
-
-        if not fn:  # top-level statement
+        fn = self.enclosing_def(node)
+        if fn is None:  # top-level statement
             return self.modname
 
         parts: list[str] = []
         cur = fn
-        while cur and isinstance(
-            cur, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)
-        ):
+        while cur is not None:
             parts.append(cur.name if hasattr(cur, "name") else "<lambda>")
-            cur = getattr(cur, "parent", None)
+            cur = self.parent_def(cur)
 
         parts.reverse()
         return ".".join([self.modname, *parts])
 
     # ---- helpers detectors already use ----------------------------------
     def joined_fstrings(self) -> Iterable[ast.JoinedStr]:
-        """
-        Return a cached list of all JoinedStr (f‑string) nodes.
-        We build it only once with ast.walk ‑‑ cheap and correct.
-        """
-        if not self._fstring_nodes:  # first call → populate
-            self._fstring_nodes = [
-                n for n in ast.walk(self.tree) if isinstance(n, ast.JoinedStr)
-            ]
-        return self._fstring_nodes
+        """Return all JoinedStr (f‑string) nodes, from the node-type index."""
+        return self.nodes_of(ast.JoinedStr)
 
     def calls(self) -> Iterable[ast.Call]:
-        if self._call_nodes is None:  # only build once if somebody needs it
-            self._call_nodes = [
-                n for n in ast.walk(self.tree) if isinstance(n, ast.Call)
-            ]
-        return self._call_nodes
+        return self.nodes_of(ast.Call)
 
     def has_call(self, name: str, node: ast.AST) -> bool:
         """Does *node* (or its children) contain a Call whose dotted name ends‑with *name*?"""
@@ -146,6 +305,119 @@ class PythonASTUnit(SourceUnit):
         return False
 
 
+_SCOPE_TYPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)
+
+
+class _DefIntervals:
+    """
+    Source ranges of a unit's defs / lambdas, sorted by start.
+
+    Ranges of AST nodes nest or are disjoint, so the innermost def holding
+    a position is the last one starting before it – or, when that one has
+    already ended, its closest enclosing range still open there: a bisect
+    plus a climb of at most the nesting depth, instead of a scan of every
+    def.  A def's range starts at its first decorator, so calls in
+    decorators belong to the def they decorate (as in the call graph).
+    """
+
+    __slots__ = ("starts", "ends", "defs", "parents")
+
+    def __init__(self, defs: Iterable[ast.AST]):
+        self.defs = sorted(defs, key=_def_start)
+        self.starts = [_def_start(fn) for fn in self.defs]
+        self.ends = [_end(fn) for fn in self.defs]
+        self.parents: list[int] = []  # index of the enclosing range, or -1
+        open_: list[int] = []
+        for i, start in enumerate(self.starts):
+            while open_ and self.ends[open_[-1]] <= start:
+                open_.pop()
+            self.parents.append(open_[-1] if open_ else -1)
+            open_.append(i)
+
+    def innermost(self, pos: tuple[int, int]) -> ast.AST | None:
+        """Innermost def with ``start < pos <= end``, or None."""
+        i = bisect.bisect_left(self.starts, pos) - 1
+        while i >= 0 and self.ends[i] < pos:
+            i = self.parents[i]
+        return self.defs[i] if i >= 0 else None
+
+
+def _start(node: ast.AST) -> tuple[int, int] | None:
+    if not hasattr(node, "lineno"):
+        return None
+    return (node.lineno, node.col_offset)
+
+
+def _def_start(fn: ast.AST) -> tuple[int, int]:
+    # the "@" before a decorator is one column left of its expression
+    decorators = getattr(fn, "decorator_list", ())
+    return min([_start(fn), *((d.lineno, d.col_offset - 1) for d in decorators)])
+
+
+def _end(node: ast.AST) -> tuple[int, int]:
+    return (node.end_lineno or node.lineno, node.end_col_offset or 0)
+
+
+# ------------------------------------------------------------------------- #
+# node → unit lookup                                                        #
+# ------------------------------------------------------------------------- #
+_LIVE_UNITS: "weakref.WeakSet[PythonASTUnit]" = weakref.WeakSet()
+# node → owning unit, for the node types `unit_of()` was asked about so far
+_OWNERS: dict[ast.AST, "weakref.ref[PythonASTUnit]"] = {}
+_ACTIVE_UNIT: ContextVar[PythonASTUnit | None] = ContextVar(
+    "lintai_active_unit", default=None
+)
+
+
+@contextmanager
+def active_unit(unit: PythonASTUnit) -> Iterator[PythonASTUnit]:
+    """Mark *unit* as the file currently being visited (see `unit_of`)."""
+    token = _ACTIVE_UNIT.set(unit)
+    try:
+        yield unit
+    finally:
+        _ACTIVE_UNIT.reset(token)
+
+
+def unit_of(node: ast.AST) -> PythonASTUnit | None:
+    """
+    Return the `PythonASTUnit` whose tree contains *node*.
+
+    Inside a detector run this is the unit being visited; otherwise it is a
+    dictionary lookup.  The first query for a node type registers that
+    type's nodes of every parsed unit (from their node-type index).
+    """
+    unit = _ACTIVE_UNIT.get()
+    if unit is not None and unit.owns(node):
+        return unit
+    unit = _owner(node)
+    if unit is not None:
+        return unit
+    t = type(node)
+    unclaimed = [
+        u
+        for u in list(_LIVE_UNITS)
+        if u.is_parsed and (u._owned is None or t not in u._owned[1])
+    ]
+    if not unclaimed:
+        return None
+    for u in unclaimed:
+        u._claim(t)
+    return _owner(node)
+
+
+def _owner(node: ast.AST) -> PythonASTUnit | None:
+    ref = _OWNERS.get(node)
+    return ref() if ref is not None else None
+
+
+def _forget(by_type: dict, claimed: set, ref: "weakref.ref[PythonASTUnit]") -> None:
+    for t in claimed:
+        for node in by_type.get(t, ()):
+            if _OWNERS.get(node) is ref:
+                del _OWNERS[node]
+
+
 # ------------------------------------------------------------------------- #
 # helpers                                                                   #
 # ------------------------------------------------------------------------- #
@@ -3,52 +3,188 @@
 Single‑pass AST dispatcher that feeds every registered detector.
 
 Keeps detectors totally unchanged – they still accept a `SourceUnit`
-and can call helpers like `unit.joined_fstrings()`.
+and can call helpers like `unit.joined_fstrings()`.  The detectors are
+compiled once into a `DispatchTable` (node type → detectors) that every unit
+of a scan shares.  Units that carry a node-type index
+(`PythonASTUnit.nodes_of`) are not walked at all: node-level detectors are
+fed straight from the index.  Other units are walked iteratively, and
+detectors are only called on the node types they subscribed to.
 """
 
 import ast, logging
-from collections import defaultdict
-from typing import Callable, Iterable, List
+from types import MappingProxyType
+from typing import Callable, Iterable, List, Mapping, NamedTuple, Optional, Sequence
 from lintai.core.finding import Finding
 from lintai.detectors.base import SourceUnit
 
 logger = logging.getLogger(__name__)
 
 
-class _DispatchVisitor(ast.NodeVisitor):
-    def __init__(self, unit: SourceUnit, detectors: Iterable[Callable]):
-        self.unit = unit
-        self.findings: List[Finding] = []
+class _Batch:
+    """
+    Adjacent detectors sharing a ``_lintai_group`` (the DSL rules of one
+    combined matcher), dispatched as one call.  The group is called as
+    ``group(unit, members)`` and yields ``(member, finding)`` pairs in member
+    order, so the findings come out as if each member had been called.
+    """
+
+    def __init__(self, group: Callable, members: tuple) -> None:
+        self.group = group
+        self.members = members
+        self.__name__ = getattr(group, "__name__", repr(group))
+
+    def pairs(self, unit: SourceUnit) -> Iterable[tuple[Callable, Finding]]:
+        return self.group(unit, self.members)
+
+    def __call__(self, unit: SourceUnit) -> Iterable[Finding]:
+        return (f for _, f in self.pairs(unit))
+
 
-        # split detectors by declared scope
-        self.module_detectors = []
-        self.node_detectors = defaultdict(list)
+def _batched(detectors: Iterable[Callable]) -> tuple:
+    out: list = []
+    for d in detectors:
+        group = getattr(d, "_lintai_group", None)
+        if group is None:
+            out.append(d)
+        elif out and isinstance(out[-1], _Batch) and out[-1].group is group:
+            out[-1].members += (d,)
+        else:
+            out.append(_Batch(group, (d,)))
+    return tuple(out)
 
+
+class DispatchTable(NamedTuple):
+    """
+    Detectors split by scope, in registration order – immutable, so one
+    table serves every unit (and thread) of a scan.  Runs of detectors that
+    share a ``_lintai_group`` are folded into one `_Batch` entry; *ranks*
+    stay per detector.
+    """
+
+    module: tuple  # module-level detectors
+    by_type: Mapping[type, tuple]  # node type → node-level detectors
+    ranks: Mapping[Callable, int]  # detector → position among *all* detectors
+
+    @classmethod
+    def compile(
+        cls, detectors: Iterable[Callable], ranks: Optional[Sequence[int]] = None
+    ) -> "DispatchTable":
+        """*ranks* default to the detectors' positions in *detectors*."""
+        detectors = tuple(detectors)
+        module, by_type = [], {}
         for d in detectors:
             scope = getattr(d, "_lintai_scope", "module")
             if scope == "module":
-                self.module_detectors.append(d)
+                module.append(d)
             elif scope == "node":
                 for node_type in getattr(d, "_lintai_node_types", ()):
-                    self.node_detectors[node_type].append(d)
+                    by_type.setdefault(node_type, []).append(d)
+        ranks = range(len(detectors)) if ranks is None else ranks
+        return cls(
+            _batched(module),
+            MappingProxyType({t: _batched(fns) for t, fns in by_type.items()}),
+            MappingProxyType(dict(zip(detectors, ranks))),
+        )
+
+
+class _DispatchVisitor:
+    def __init__(
+        self,
+        unit: SourceUnit,
+        detectors: "DispatchTable | Iterable[Callable]",
+        *,
+        keyed: bool = False,
+    ):
+        """
+        *detectors* is a compiled `DispatchTable` (or detectors to compile
+        one from).  With *keyed* every finding also gets a sort key in
+        `keys` – ``(node, rank)``, node -1 for module-level detectors – so
+        findings of the same unit collected by separate visitors (worker
+        processes) merge back into the order one visitor running every
+        detector would produce.
+        """
+        if not isinstance(detectors, DispatchTable):
+            detectors = DispatchTable.compile(detectors)
+        self.unit = unit
+        self.table = detectors
+        self.findings: List[Finding] = []
+        self.keys: Optional[List[tuple[int, int]]] = [] if keyed else None
+        self._pos = -1
 
     # --- run once per file ------------------------------------------------
-    def visit_Module(self, node):
-        self.unit._current = node
-        for fn in self.module_detectors:
-            self._safe_call(fn)
-        self.generic_visit(node)
-
-    # --- dispatch node‑level detectors ------------------------------------
-    def generic_visit(self, node):
-        self.unit._current = node
-        for fn in self.node_detectors.get(type(node), ()):
-            self._safe_call(fn)
-        super().generic_visit(node)
+    def visit(self, tree: ast.AST) -> None:
+        from lintai.engine.python_ast_unit import active_unit  # avoid import cycle
+
+        # lets node-only helpers (analysis.is_ai_call) find their unit
+        with active_unit(self.unit):
+            self.unit._current = tree
+            self._pos = -1
+            for fn in self.table.module:
+                self._safe_call(fn)
+            if not self.table.by_type:
+                return
+            if hasattr(self.unit, "nodes_of"):
+                self._dispatch_indexed()
+            else:
+                self._dispatch_walk(tree)
+
+    # --- node-level detectors straight from the unit's node-type index ----
+    def _dispatch_indexed(self):
+        # only nodes somebody registered for are touched, in source order
+        by_type = self.table.by_type
+        if self.keys is None:
+            nodes = enumerate(self.unit.nodes_of(*by_type))
+        else:  # keyed by traversal position – independent of the node types
+            nodes = self.unit.ordered_nodes_of(*by_type)
+        for pos, node in nodes:
+            self.unit._current = node
+            self._pos = pos
+            for fn in by_type[type(node)]:
+                self._safe_call(fn)
+
+    # --- units without an index: iterative pre-order walk ------------------
+    def _dispatch_walk(self, tree: ast.AST):
+        by_type = self.table.by_type
+        stack = [tree]
+        pos = -1
+        while stack:
+            node = stack.pop()
+            pos += 1
+            fns = by_type.get(type(node))
+            if fns:
+                self.unit._current = node
+                self._pos = pos
+                for fn in fns:
+                    self._safe_call(fn)
+            children = list(ast.iter_child_nodes(node))
+            children.reverse()
+            stack.extend(children)
 
     # --- helper for safe calling the detectors -----------------------------
     def _safe_call(self, fn):
+        if self.keys is not None:
+            return self._keyed_call(fn)
+        try:
+            self.findings.extend(fn(self.unit))
+        except Exception as exc:
+            logger.error("Detector %s crashed: %s", fn.__name__, exc)
+
+    def _keyed_call(self, fn):
+        if isinstance(fn, _Batch):
+            return self._keyed_batch(fn)
+        before = len(self.findings)
         try:
             self.findings.extend(fn(self.unit))
         except Exception as exc:
             logger.error("Detector %s crashed: %s", fn.__name__, exc)
+        key = (self._pos, self.table.ranks[fn])
+        self.keys.extend([key] * (len(self.findings) - before))
+
+    def _keyed_batch(self, batch: _Batch):
+        ranks = self.table.ranks
+        try:
+            for member, finding in batch.pairs(self.unit):
+                self.findings.append(finding)
+                self.keys.append((self._pos, ranks[member]))
+        except Exception as exc:
+            logger.error("Detector %s crashed: %s", batch.__name__, exc)
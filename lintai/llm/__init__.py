@@ -1,6 +1,6 @@
 from __future__ import annotations
-import os, importlib, logging, sys
-from typing import Dict
+import os, importlib, logging, sys, threading
+from typing import Dict, Optional, Tuple
 from lintai.llm.base import LLMClient
 
 logger = logging.getLogger(__name__)
@@ -17,7 +17,50 @@ _PROVIDERS: Dict[str, str] = {
 }
 
 
+# env-var prefixes that decide which provider client get_client() builds
+_CLIENT_ENV = (
+    "LINTAI_LLM_",
+    "LLM_",
+    "OPENAI_",
+    "AZURE_OPENAI_",
+    "ANTHROPIC_",
+    "GEMINI_",
+    "GOOGLE_",
+    "COHERE_",
+)
+
+# long-lived processes (`lintai ui --warm-worker`) keep one client – and with it
+# the SDK's HTTP connection pool – per provider configuration; None → disabled
+_WARM: Optional[Dict[Tuple[Tuple[str, str], ...], LLMClient]] = None
+_WARM_LOCK = threading.Lock()
+
+
+def keep_clients_warm(enabled: bool = True) -> None:
+    """Make get_client() reuse clients across runs instead of building anew."""
+    global _WARM
+    with _WARM_LOCK:
+        _WARM = {} if enabled else None
+
+
+def _client_config() -> Tuple[Tuple[str, str], ...]:
+    return tuple(
+        sorted((k, v) for k, v in os.environ.items() if k.startswith(_CLIENT_ENV))
+    )
+
+
 def get_client() -> LLMClient:
+    if _WARM is None:
+        return _create_client()
+    key = _client_config()
+    with _WARM_LOCK:
+        client = _WARM.get(key)
+        if client is None:
+            client = _WARM[key] = _create_client()
+            logger.debug("LLM client pool: new %s client", type(client).__name__)
+    return client
+
+
+def _create_client() -> LLMClient:
     choice = os.getenv("LINTAI_LLM_PROVIDER", "dummy").lower()
     module_path = _PROVIDERS.get(choice, _PROVIDERS["dummy"])
 
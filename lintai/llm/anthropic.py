@@ -1,4 +1,5 @@
 import os, json, importlib.util
+from typing import Iterator
 from lintai.llm.base import LLMClient
 from lintai.llm.token_util import estimate_tokens
 from lintai.llm.errors import BudgetExceededError
@@ -18,6 +19,8 @@ _ERROR_JSON = json.dumps(
 
 
 class _AnthropicClient(LLMClient):
+    rate_env = "ANTHROPIC"
+
     def __init__(self):
         if anthropic is None:
             raise ImportError(_ERROR_JSON)
@@ -29,52 +32,118 @@ class _AnthropicClient(LLMClient):
 
         if not key:
             raise ImportError("ANTHROPIC_API_KEY env var missing")
-        self.client = anthropic.Anthropic(api_key=key)
+        # LLMClient._send() retries
+        self.client = anthropic.Anthropic(api_key=key, max_retries=0)
         self.model = (
             os.getenv("ANTHROPIC_MODEL")  # specific Anthropic model variable
             or os.getenv("LLM_MODEL_NAME")  # generic LLM model name variable
             or "claude-3-sonnet-20240229"  # default model
         )
 
+    def _request(self, prompt: str, max_tokens: int, system, kw) -> dict:
+        """messages.create() arguments – the static system block is marked
+        cacheable so repeated audits read it from the prompt cache."""
+        extra = {}
+        if system:
+            extra["system"] = [
+                {
+                    "type": "text",
+                    "text": system,
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ]
+        return dict(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=max_tokens,
+            temperature=kw.get("temperature", 0.2),
+            **extra,
+        )
+
     def ask(
-        self, prompt: str, max_tokens: int = 256, **kw
+        self, prompt: str, max_tokens: int = 256, *, system: str | None = None, **kw
     ) -> str:  # kw: temperature, max_tokens ...
         try:
             # ①  budget check
-            self._preflight_budget(prompt, max_tokens)
+            self._preflight_budget(self._joined(system, prompt), max_tokens)
 
             # ②  call provider and get response
-            resp = self.client.messages.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=max_tokens,
-                temperature=kw.get("temperature", 0.2),
-            )
+            request = self._request(prompt, max_tokens, system, kw)
+            resp = self._send(lambda: self.client.messages.create(**request))
 
             # ③  extract usage for *real* accounting
             usage = getattr(resp, "usage", None)
             completion_tok = (
-                usage.completion_tokens
+                usage.output_tokens
                 if usage
-                else estimate_tokens(resp.choices[0].message.content, self.model)
+                else estimate_tokens(resp.content[0].text, self.model)
             )
-            cost_usd = None  # OpenAI API v2 doesn’t return cost – leave None
+            cost_usd = None  # the API doesn’t return cost – leave None
 
             # ④  commit to budget
-            self._post_commit_budget(completion_tok, cost_usd)
+            self._post_commit_budget(
+                completion_tok, cost_usd, **(_prompt_usage(usage) if usage else {})
+            )
 
             # ⑤  return the message content
             return resp.content[0].text
         except BudgetExceededError:
             raise
         except Exception as exc:
-            return json.dumps(
-                {
-                    "issue": f"Anthropic error: {exc.__class__.__name__}",
-                    "sev": "info",
-                    "fix": "Check API key, model, or rate limits",
-                }
+            self._abort_budget()
+            return _error_reply(exc)
+
+    def stream(
+        self, prompt: str, max_tokens: int = 256, *, system: str | None = None, **kw
+    ) -> Iterator[str]:
+        try:
+            self._preflight_budget(self._joined(system, prompt), max_tokens)
+            request = self._request(prompt, max_tokens, system, kw)
+            resp = self._send(
+                lambda: self.client.messages.create(stream=True, **request)
             )
+        except BudgetExceededError:
+            raise
+        except Exception as exc:
+            self._abort_budget()
+            yield _error_reply(exc)
+            return
+        usage: dict = {}
+        yield from self._relay(
+            _event_pieces(resp, usage), usage, getattr(resp, "close", None)
+        )
+
+
+def _prompt_usage(usage) -> dict:
+    """``prompt_tok`` / ``cached_tok``; input_tokens excludes cache reads /
+    writes, so they are added back."""
+    cached = getattr(usage, "cache_read_input_tokens", None) or 0
+    written = getattr(usage, "cache_creation_input_tokens", None) or 0
+    return {"prompt_tok": usage.input_tokens + cached + written, "cached_tok": cached}
+
+
+def _event_pieces(resp, usage: dict) -> Iterator[str]:
+    """Text of a streamed message; token usage is stored in *usage*."""
+    for event in resp:
+        kind = getattr(event, "type", None)
+        if kind == "message_start" and getattr(event.message, "usage", None):
+            usage.update(_prompt_usage(event.message.usage))
+        elif kind == "content_block_delta":
+            text = getattr(event.delta, "text", None)
+            if text:
+                yield text
+        elif kind == "message_delta" and getattr(event, "usage", None):
+            usage["completion_tok"] = event.usage.output_tokens
+
+
+def _error_reply(exc: Exception) -> str:
+    return json.dumps(
+        {
+            "issue": f"Anthropic error: {exc.__class__.__name__}",
+            "sev": "info",
+            "fix": "Check API key, model, or rate limits",
+        }
+    )
 
 
 def create():
@@ -1,8 +1,15 @@
 from __future__ import annotations
 import json, os, importlib.util, types
+from typing import Iterator
 from lintai.llm.base import LLMClient
 from lintai.llm.token_util import estimate_tokens
 from lintai.llm.errors import BudgetExceededError
+from lintai.llm.openai import (
+    _chat_pieces,
+    _messages,
+    _prompt_usage,
+    _stream_options,
+)
 
 _spec = importlib.util.find_spec("openai")
 openai: types.ModuleType | None = importlib.import_module("openai") if _spec else None
@@ -16,7 +23,19 @@ _ERROR_JSON = json.dumps(
 )
 
 
+def _error_reply(exc: Exception) -> str:
+    return json.dumps(
+        {
+            "issue": f"AzureOpenAI error: {exc.__class__.__name__}",
+            "sev": "info",
+            "fix": "Check endpoint/deployment or API version",
+        }
+    )
+
+
 class _AzureClient(LLMClient):
+    rate_env = "AZURE_OPENAI"
+
     def __init__(self):
         if openai is None or not hasattr(openai, "AzureOpenAI"):
             raise ImportError(_ERROR_JSON)
@@ -49,6 +68,7 @@ class _AzureClient(LLMClient):
             api_key=key,
             api_version=version,
             azure_endpoint=endpoint,
+            max_retries=0,  # LLMClient._send() retries
         )
         # deployment name, not model family
         self.model = (
@@ -57,18 +77,22 @@ class _AzureClient(LLMClient):
             or "gpt-4.1-mini"  # default model
         )
 
-    def ask(self, prompt: str, max_tokens: int = 256, **kw) -> str:
+    def ask(
+        self, prompt: str, max_tokens: int = 256, *, system: str | None = None, **kw
+    ) -> str:
         try:
             # ①  budget check
-            self._preflight_budget(prompt, max_tokens)
+            self._preflight_budget(self._joined(system, prompt), max_tokens)
 
             # ②  call provider and get response
-            resp = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=max_tokens,
-                temperature=kw.get("temperature", 0.2),
-                response_format={"type": "json_object"},
+            resp = self._send(
+                lambda: self.client.chat.completions.create(
+                    model=self.model,
+                    messages=_messages(system, prompt),
+                    max_tokens=max_tokens,
+                    temperature=kw.get("temperature", 0.2),
+                    response_format={"type": "json_object"},
+                )
             )
 
             # ③  extract usage for *real* accounting
@@ -80,21 +104,42 @@ class _AzureClient(LLMClient):
             )
             cost_usd = None  # OpenAI API v2 doesn’t return cost – leave None
 
-            # ④  commit to budget
-            self._post_commit_budget(completion_tok, cost_usd)
+            # ④  commit to budget (prefix-cache hits are billed at a discount)
+            self._post_commit_budget(completion_tok, cost_usd, **_prompt_usage(usage))
 
             # ⑤  return the message content
             return resp.choices[0].message.content
         except BudgetExceededError:
             raise
         except Exception as exc:
-            return json.dumps(
-                {
-                    "issue": f"AzureOpenAI error: {exc.__class__.__name__}",
-                    "sev": "info",
-                    "fix": "Check endpoint/deployment or API version",
-                }
+            self._abort_budget()
+            return _error_reply(exc)
+
+    def stream(
+        self, prompt: str, max_tokens: int = 256, *, system: str | None = None, **kw
+    ) -> Iterator[str]:
+        try:
+            self._preflight_budget(self._joined(system, prompt), max_tokens)
+            resp = self._send(
+                lambda: self.client.chat.completions.create(
+                    model=self.model,
+                    messages=_messages(system, prompt),
+                    max_tokens=max_tokens,
+                    temperature=kw.get("temperature", 0.2),
+                    response_format={"type": "json_object"},
+                    **_stream_options(),
+                )
             )
+        except BudgetExceededError:
+            raise
+        except Exception as exc:
+            self._abort_budget()
+            yield _error_reply(exc)
+            return
+        usage: dict = {}
+        yield from self._relay(
+            _chat_pieces(resp, usage), usage, getattr(resp, "close", None)
+        )
 
 
 def create():
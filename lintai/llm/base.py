@@ -1,10 +1,13 @@
 # lintai/llm/base.py
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Any
+from contextvars import ContextVar
+from typing import Any, Callable, Iterable, Iterator, Optional, TypeVar
 from decimal import Decimal
 import logging
-from lintai.llm.budget import manager as _budget
+import threading
+from lintai.llm.budget import Reservation, manager as _budget
+from lintai.llm.ratelimit import RateLimiter, call_with_retries
 from lintai.llm.token_util import estimate_tokens
 from lintai.llm.errors import BudgetExceededError
 
@@ -12,6 +15,24 @@ DEFAULT_MAX_CONTEXT_SIZE = 8192  # fallback for providers that don’t expose th
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+_LIMITER_LOCK = threading.Lock()
+
+# budget reservation of the request in flight – clients are shared by
+# concurrent audits (threads or asyncio tasks), so it cannot live on the instance
+_RESERVATION: ContextVar[Optional[Reservation]] = ContextVar(
+    "lintai_llm_reservation", default=None
+)
+_BILLED: ContextVar[bool] = ContextVar("lintai_llm_billed", default=False)
+
+
+def reply_was_billed() -> bool:
+    """
+    True when the last `ask()` in this thread / task got a real provider reply
+    (and settled it with the budget) rather than an offline / error JSON stub.
+    """
+    return _BILLED.get()
+
 
 class LLMClient(ABC):
     """
@@ -21,6 +42,7 @@ class LLMClient(ABC):
 
     is_dummy: bool = False  # real providers don’t touch it
     model: str = "unknown"  # override in concrete subclasses
+    rate_env: str = "LINTAI_LLM"  # <rate_env>_RPM / _TPM configure the limiter
 
     # ------------------------------------------------------------------ #
     # public helpers                                                     #
@@ -34,36 +56,141 @@ class LLMClient(ABC):
     # convenience: subclasses call this *before* the network roundtrip   #
     # ------------------------------------------------------------------ #
     def _preflight_budget(self, prompt: str, max_completion: int) -> None:
-        prompt_tok = estimate_tokens(prompt, self.model)
-        if not _budget.allow(prompt_tok, max_completion, self.model):
+        _BILLED.set(False)
+        # far from the limits a chars-per-token estimate is good enough
+        headroom = _budget.headroom(self.model) - max_completion
+        prompt_tok = estimate_tokens(prompt, self.model, headroom=headroom)
+        reservation = _budget.reserve(prompt_tok, max_completion, self.model)
+        if reservation is None:
             raise BudgetExceededError(
                 "LLM budget exceeded – set higher limits via "
                 "LINTAI_MAX_LLM_* environment variables if needed."
             )
-        # store for post-commit
-        self._tmp_prompt_tok = prompt_tok
-        self._tmp_max_completion = max_completion
+        # settled by _post_commit_budget, or cancelled by _abort_budget
+        _RESERVATION.set(reservation)
 
-    def _post_commit_budget(self, completion_tok: int, real_cost: float | None):
-        _budget.commit(
-            self._tmp_prompt_tok,
+    def _post_commit_budget(
+        self,
+        completion_tok: int,
+        real_cost: float | None,
+        *,
+        prompt_tok: int | None = None,
+        cached_tok: int = 0,
+        reservation: Reservation | None = None,
+    ):
+        """
+        *prompt_tok* is the provider-reported input size (default: the
+        preflight estimate); *cached_tok* of it were served from the
+        provider's prompt cache and are billed at the cached-input rate.
+        *reservation* defaults to the one this context's preflight made.
+        """
+        if reservation is None:
+            reservation = _RESERVATION.get()
+            _RESERVATION.set(None)
+        _BILLED.set(True)
+        if prompt_tok is None:
+            prompt_tok = reservation.prompt_tok
+        reservation.settle(
+            prompt_tok,
             completion_tok,
-            self.model,
             None if real_cost is None else Decimal(str(real_cost)),
+            cached_tok=cached_tok,
         )
         logger.debug(
-            "Budget commit: prompt=%s, completion=%s, model=%s, usd=%s",
-            self._tmp_prompt_tok,
+            "Budget commit: prompt=%s (cached %s), completion=%s, model=%s, usd=%s",
+            prompt_tok,
+            cached_tok,
             completion_tok,
             self.model,
             real_cost,
         )
 
-        # clean-up
-        del self._tmp_prompt_tok, self._tmp_max_completion
+    def _abort_budget(self) -> None:
+        """Cancel the preflight reservation of a request that failed (if any)."""
+        reservation = _RESERVATION.get()
+        if reservation is not None:
+            _RESERVATION.set(None)
+            reservation.cancel()
+
+    def _send(self, request: Callable[[], T]) -> T:
+        """
+        Perform *request* – one provider round-trip – under this client's
+        RPM / TPM limits, retrying rate-limit and transient errors (see
+        `lintai.llm.ratelimit`).  Call it between the *_budget helpers.
+        """
+        reservation = _RESERVATION.get()
+        tokens = 0 if reservation is None else reservation.tokens
+        return call_with_retries(request, self._limiter(), tokens)
+
+    def _limiter(self) -> RateLimiter:
+        # providers don't call super().__init__(), so create it on first use
+        limiter = self.__dict__.get("_rate_limiter")
+        if limiter is None:
+            with _LIMITER_LOCK:
+                limiter = self.__dict__.setdefault(
+                    "_rate_limiter", RateLimiter.from_env(self.rate_env)
+                )
+        return limiter
+
+    def _relay(
+        self,
+        pieces: Iterable[str],
+        usage: dict,
+        close: Optional[Callable[[], None]] = None,
+    ) -> Iterator[str]:
+        """
+        Yield the text *pieces* of a streamed reply, then settle the budget.
+
+        The provider's piece generator fills *usage* (``completion_tok``, and
+        optionally ``prompt_tok`` / ``cached_tok``) when the stream reports
+        it; if the consumer stops early, the tokens received so far are
+        estimated instead.  *close* cancels the underlying HTTP stream.
+        """
+        # the consumer may close (or drop) the stream from another thread or
+        # context, so keep the reservation this request was preflighted with
+        reservation = _RESERVATION.get()
+        _RESERVATION.set(None)
+        received = []
+        try:
+            for piece in pieces:
+                received.append(piece)
+                yield piece
+        except Exception as exc:
+            logger.warning("LLM stream interrupted: %s", exc)
+        finally:
+            if close is not None:
+                close()
+            completion_tok = usage.pop("completion_tok", None)
+            if completion_tok is None:
+                completion_tok = estimate_tokens("".join(received), self.model)
+            self._post_commit_budget(
+                completion_tok, None, reservation=reservation, **usage
+            )
+
+    @staticmethod
+    def _joined(system: str | None, prompt: str) -> str:
+        """*system* + *prompt* as one text, for providers without a system slot."""
+        return f"{system}\n\n{prompt}" if system else prompt
 
     # ------------------------------------------------------------------ #
     # abstract interface – provider must call *_budget helpers           #
     # ------------------------------------------------------------------ #
     @abstractmethod
-    def ask(self, prompt: str, max_tokens: int, **kwargs: Any) -> str: ...
+    def ask(
+        self, prompt: str, max_tokens: int, *, system: str | None = None, **kwargs: Any
+    ) -> str:
+        """
+        Send *system* (a static prefix – instructions shared by many calls)
+        followed by *prompt* (the variable part).  Providers with prompt
+        caching mark *system* cacheable, so keep it byte-identical across calls.
+        """
+
+    def stream(
+        self, prompt: str, max_tokens: int, *, system: str | None = None, **kwargs: Any
+    ) -> Iterator[str]:
+        """
+        Like `ask`, but yields the reply in pieces as the provider produces
+        them; closing the iterator early cancels the request and bills only
+        what was received.  Providers without streaming yield `ask`'s reply.
+        """
+        yield self.ask(prompt, max_tokens, system=system, **kwargs)
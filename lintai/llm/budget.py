@@ -1,10 +1,12 @@
 # lintai/llm/budget.py
 from __future__ import annotations
-import os, threading
+import logging, os, threading
 from contextlib import contextmanager
 from decimal import Decimal
 from typing import Optional, Final
 
+logger = logging.getLogger(__name__)
+
 # --------------------------------------------------------------------------- #
 # helper: price table  (USD / 1000 tok)                                        #
 # --------------------------------------------------------------------------- #
@@ -20,6 +22,15 @@ _DEFAULT_PRICES: Final[dict[str, Decimal]] = {
     "command-r": Decimal("0.002"),  # Cohere
 }
 
+# Share of the input price charged for prompt tokens served from the
+# provider's prompt cache (OpenAI: automatic prefix cache, Anthropic:
+# cache_control reads).  Models not listed get no discount.
+_CACHED_INPUT_RATES: Final[dict[str, Decimal]] = {
+    "gpt-4.1": Decimal("0.25"),
+    "gpt-4o": Decimal("0.5"),
+    "claude-3": Decimal("0.1"),
+}
+
 # --------------------------------------------------------------------------- #
 # helpers                                                                     #
 # --------------------------------------------------------------------------- #
@@ -27,25 +38,81 @@ _DEFAULT_PRICES: Final[dict[str, Decimal]] = {
 _KILO = Decimal("1000")  # one place only
 
 
-def _usd_for_tokens(tokens: int, model: str) -> Decimal:
+def _usd_for_tokens(tokens: int, model: str, cached: int = 0) -> Decimal:
     """
-    Convert *tokens* to a *Decimal* USD cost for *model* using the price table.
+    Convert *tokens* to a *Decimal* USD cost for *model* using the price table;
+    *cached* of them are prompt-cache hits billed at the cached-input rate.
     Keeps all math in `Decimal` to avoid float/Decimal TypeErrors.
     """
-    return (Decimal(tokens) / _KILO) * _price_for(model)
+    usd = (Decimal(tokens - cached) / _KILO) * _price_for(model)
+    if cached:
+        usd += (Decimal(cached) / _KILO) * _price_for(model, cached=True)
+    return usd
 
 
-def _price_for(model: str) -> Decimal:
+def _price_for(model: str, cached: bool = False) -> Decimal:
     model = model.lower()
+    price = Decimal("0.002")  # safe default
     for prefix, usd in _DEFAULT_PRICES.items():
         if model.startswith(prefix):
-            return usd
-    return Decimal("0.002")  # safe default
+            price = usd
+            break
+    if cached:
+        for prefix, rate in _CACHED_INPUT_RATES.items():
+            if model.startswith(prefix):
+                return price * rate
+    return price
 
 
 # --------------------------------------------------------------------------- #
 # main manager                                                                 #
 # --------------------------------------------------------------------------- #
+class Reservation:
+    """
+    Budget admitted by `BudgetManager.reserve()` for one request.
+
+    Exactly one of `settle()` (the call returned) or `cancel()` (it failed)
+    takes effect; later calls are no-ops, so a reservation can never be
+    returned twice.
+    """
+
+    __slots__ = ("manager", "model", "prompt_tok", "completion_tok", "usd", "_open")
+
+    def __init__(self, manager, model, prompt_tok, completion_tok, usd) -> None:
+        self.manager = manager
+        self.model = model
+        self.prompt_tok = prompt_tok
+        self.completion_tok = completion_tok
+        self.usd = usd
+        self._open = True
+
+    @property
+    def tokens(self) -> int:
+        return self.prompt_tok + self.completion_tok
+
+    def settle(
+        self,
+        prompt_tok: Optional[int] = None,
+        completion_tok: Optional[int] = None,
+        real_cost_usd: Optional[Decimal] = None,
+        *,
+        cached_tok: int = 0,
+    ) -> None:
+        """Replace the reservation by *actual* usage (default: the estimate)."""
+        self.manager._settle(
+            self,
+            self.model,
+            self.prompt_tok if prompt_tok is None else prompt_tok,
+            self.completion_tok if completion_tok is None else completion_tok,
+            real_cost_usd,
+            cached_tok,
+        )
+
+    def cancel(self) -> None:
+        """Give the reserved budget back unused."""
+        self.manager._settle(self, self.model, 0, 0, None, 0, record=False)
+
+
 class BudgetManager:
     """
     Thread-safe singleton that tracks tokens / cost / request count **for the
@@ -54,67 +121,150 @@ class BudgetManager:
       LINTAI_MAX_LLM_TOKENS      (int, default 50 000)
       LINTAI_MAX_LLM_COST_USD    (float, default 10.00)
       LINTAI_MAX_LLM_REQUESTS    (int, default 500)
+
+    Requests `reserve()` their estimate before the call and `settle()` it with
+    the real usage afterwards; reserved budget counts against the limits, so
+    concurrent requests cannot be admitted past them.  The lock only guards a
+    few additions – costs are priced and debug lines formatted outside it.
     """
 
     def __init__(self) -> None:
-        self._tok_used = 0
-        self._usd_used = Decimal("0")
-        self._req_used = 0
         self._lock = threading.Lock()
+        self.reset()
         self.reload()  # <─ read env the first time
 
+    def reset(self) -> None:
+        """Forget all usage – for processes that run several scans."""
+        with self._lock:
+            self._tok_used = 0
+            self._cached_tok_used = 0  # prompt tokens read from provider caches
+            self._usd_used = Decimal("0")
+            self._req_used = 0
+            # open reservations – admitted requests that have not settled yet
+            self._tok_held = 0
+            self._usd_held = Decimal("0")
+            self._req_held = 0
+            # replies served from the response cache – reported, never limited
+            self._cache_hits = 0
+            self._cache_tok = 0
+            self._cache_usd = Decimal("0")
+            # audits the static pre-filter proved clean – never sent
+            self._skips: dict[str, int] = {}
+            self._skip_tok = 0
+            self._skip_usd = Decimal("0")
+
     def reload(self) -> None:
         """(Re)read max_* limits from os.environ."""
-        import logging
-
         self.max_tokens = int(os.getenv("LINTAI_MAX_LLM_TOKENS", "50000"))
         self.max_cost_usd = Decimal(os.getenv("LINTAI_MAX_LLM_COST_USD", "10"))
         self.max_requests = int(os.getenv("LINTAI_MAX_LLM_REQUESTS", "500"))
-
-        logging.debug(
-            f"Budget limits reloaded - tokens: {self.max_tokens}, cost_usd: {self.max_cost_usd}, requests: {self.max_requests}"
-        )
-        logging.debug(
-            f"Environment variables - LINTAI_MAX_LLM_TOKENS: {os.getenv('LINTAI_MAX_LLM_TOKENS')}, LINTAI_MAX_LLM_COST_USD: {os.getenv('LINTAI_MAX_LLM_COST_USD')}, LINTAI_MAX_LLM_REQUESTS: {os.getenv('LINTAI_MAX_LLM_REQUESTS')}"
+        logger.debug(
+            "Budget limits reloaded - tokens: %s, cost_usd: %s, requests: %s",
+            self.max_tokens,
+            self.max_cost_usd,
+            self.max_requests,
         )
 
     # ──────────────────────────────────────────────────────────────────────
-    #  public helpers
+    #  reservations
     # ──────────────────────────────────────────────────────────────────────
-    def allow(self, est_prompt_tok: int, est_completion_tok: int, model: str) -> bool:
-        """Return True if the *estimate* would stay within budget."""
-        import logging
-
-        est_cost = _usd_for_tokens(est_prompt_tok + est_completion_tok, model)
+    def reserve(
+        self, est_prompt_tok: int, est_completion_tok: int, model: str
+    ) -> Optional[Reservation]:
+        """
+        Atomically set aside the *estimate* if it fits the remaining budget.
+        Returns the `Reservation` to settle or cancel, or None when it does not.
+        """
+        est_tok = est_prompt_tok + est_completion_tok
+        est_usd = _usd_for_tokens(est_tok, model)
         with self._lock:
-            total_est_tokens = self._tok_used + est_prompt_tok + est_completion_tok
-            total_est_cost = self._usd_used + est_cost
-            total_est_requests = self._req_used + 1
+            admitted, usage = self._fits(est_tok, est_usd)
+            if admitted:
+                self._tok_held += est_tok
+                self._usd_held += est_usd
+                self._req_held += 1
 
-            logging.debug(
-                f"Budget check - Current usage: tokens={self._tok_used}, cost_usd={self._usd_used}, requests={self._req_used}"
-            )
-            logging.debug(
-                f"Budget check - Estimated: prompt_tok={est_prompt_tok}, completion_tok={est_completion_tok}, cost={est_cost}"
-            )
-            logging.debug(
-                f"Budget check - Total estimated: tokens={total_est_tokens}, cost_usd={total_est_cost}, requests={total_est_requests}"
+        self._log_check("reserved" if admitted else "exceeded", *usage)
+        if not admitted:
+            return None
+        return Reservation(self, model, est_prompt_tok, est_completion_tok, est_usd)
+
+    def _fits(self, est_tok: int, est_usd: Decimal) -> tuple[bool, tuple]:
+        # caller holds the lock; open reservations count as spent
+        tokens = self._tok_used + self._tok_held + est_tok
+        usd = self._usd_used + self._usd_held + est_usd
+        requests = self._req_used + self._req_held + 1
+        admitted = (
+            tokens <= self.max_tokens
+            and usd <= self.max_cost_usd
+            and requests <= self.max_requests
+        )
+        return admitted, (tokens, usd, requests)
+
+    def _log_check(self, outcome: str, tokens: int, usd: Decimal, requests: int):
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Budget %s - would use tokens=%s/%s, cost_usd=%s/%s, requests=%s/%s",
+                outcome,
+                tokens,
+                self.max_tokens,
+                usd,
+                self.max_cost_usd,
+                requests,
+                self.max_requests,
             )
-            logging.debug(
-                f"Budget check - Limits: tokens={self.max_tokens}, cost_usd={self.max_cost_usd}, requests={self.max_requests}"
+
+    def _settle(
+        self,
+        res: Optional[Reservation],
+        model: str,
+        prompt_tok: int,
+        completion_tok: int,
+        real_cost_usd: Optional[Decimal],
+        cached_tok: int,
+        record: bool = True,
+    ) -> None:
+        if record and real_cost_usd is None:
+            real_cost_usd = _usd_for_tokens(
+                prompt_tok + completion_tok, model, cached_tok
             )
+        with self._lock:
+            if res is not None:
+                if not res._open:  # already settled or cancelled
+                    return
+                res._open = False
+                self._tok_held -= res.tokens
+                self._usd_held -= res.usd
+                self._req_held -= 1
+            if record:
+                self._tok_used += prompt_tok + completion_tok
+                self._cached_tok_used += cached_tok
+                self._usd_used += real_cost_usd
+                self._req_used += 1
 
-            if (
-                total_est_tokens > self.max_tokens
-                or total_est_cost > self.max_cost_usd
-                or total_est_requests > self.max_requests
-            ):
-                logging.debug(
-                    f"Budget exceeded - tokens: {total_est_tokens > self.max_tokens}, cost: {total_est_cost > self.max_cost_usd}, requests: {total_est_requests > self.max_requests}"
-                )
-                return False
-            logging.debug("Budget check passed")
-            return True
+    def headroom(self, model: str) -> int:
+        """Tokens of *model* still affordable under the token and USD limits."""
+        with self._lock:
+            tokens = self.max_tokens - self._tok_used - self._tok_held
+            usd = self.max_cost_usd - self._usd_used - self._usd_held
+        affordable = int(usd / _price_for(model) * _KILO)
+        return max(0, min(tokens, affordable))
+
+    # ──────────────────────────────────────────────────────────────────────
+    #  estimate-based helpers (pre-reservation API)
+    # ──────────────────────────────────────────────────────────────────────
+    def allow(self, est_prompt_tok: int, est_completion_tok: int, model: str) -> bool:
+        """
+        Return True if the *estimate* would stay within budget.
+
+        A check only – nothing is set aside, so a concurrent request may take
+        the budget first; use `reserve()` to hold it.
+        """
+        est_tok = est_prompt_tok + est_completion_tok
+        with self._lock:
+            admitted, usage = self._fits(est_tok, _usd_for_tokens(est_tok, model))
+        self._log_check("check passed" if admitted else "exceeded", *usage)
+        return admitted
 
     def commit(
         self,
@@ -122,31 +272,63 @@ class BudgetManager:
         completion_tok: int,
         model: str,
         real_cost_usd: Optional[Decimal] = None,
+        *,
+        cached_tok: int = 0,
+    ) -> None:
+        """
+        Record *actual* usage of a request made without a reservation.
+        *cached_tok* of the *prompt_tok* were prompt-cache hits.
+        """
+        self._settle(None, model, prompt_tok, completion_tok, real_cost_usd, cached_tok)
+
+    def record_cache_hit(self, prompt_tok: int, completion_tok: int, model: str):
+        """Note a reply served from cache; it does not count against the limits."""
+        usd = _usd_for_tokens(prompt_tok + completion_tok, model)
+        with self._lock:
+            self._cache_hits += 1
+            self._cache_tok += prompt_tok + completion_tok
+            self._cache_usd += usd
+
+    def record_skip(
+        self, prompt_tok: int, completion_tok: int, model: str, reason: str
     ) -> None:
-        """Record *actual* usage once a call returns."""
+        """Note an audit skipped as provably clean; the tokens are an estimate."""
+        usd = _usd_for_tokens(prompt_tok + completion_tok, model)
         with self._lock:
-            self._tok_used += prompt_tok + completion_tok
-            self._usd_used += (
-                real_cost_usd
-                if real_cost_usd is not None
-                else _usd_for_tokens(prompt_tok + completion_tok, model)
-            )
-            self._req_used += 1
+            self._skips[reason] = self._skips.get(reason, 0) + 1
+            self._skip_tok += prompt_tok + completion_tok
+            self._skip_usd += usd
 
     # handy wrapper – useful if you need manual guard outside the client
     @contextmanager
     def guard(self, est_prompt_tok: int, est_completion_tok: int, model: str):
-        ok = self.allow(est_prompt_tok, est_completion_tok, model)
-        yield ok
-        # detectors don’t commit – only the LLM client does afterwards.
+        res = self.reserve(est_prompt_tok, est_completion_tok, model)
+        try:
+            yield res is not None
+        finally:
+            # detectors don’t commit – only the LLM client does afterwards.
+            if res is not None:
+                res.cancel()
 
     # diagnostic
     def snapshot(self) -> dict:
         with self._lock:
             return {
                 "tokens_used": self._tok_used,
+                "cached_prompt_tokens": self._cached_tok_used,
                 "usd_used": float(self._usd_used),
                 "requests": self._req_used,
+                "cache": {
+                    "hits": self._cache_hits,
+                    "tokens_saved": self._cache_tok,
+                    "usd_saved": float(self._cache_usd),
+                },
+                "prefilter": {
+                    "skipped": sum(self._skips.values()),
+                    "reasons": dict(self._skips),
+                    "tokens_saved": self._skip_tok,
+                    "usd_saved": float(self._skip_usd),
+                },
                 "limits": {
                     "tokens": self.max_tokens,
                     "usd": float(self.max_cost_usd),
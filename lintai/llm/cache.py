@@ -0,0 +1,151 @@
+"""
+lintai.llm.cache
+----------------
+Persistent cache of LLM replies, so re-scanning an unchanged function does not
+pay for the same audit twice.
+
+Replies are keyed by ``sha256(provider, model, template, prompt)`` where
+*template* is the caller's prompt-template version – bumping it invalidates
+every reply built from the old wording.  Entries live in one SQLite file
+(``<cache-dir>/llm_responses.sqlite3``) and are evicted when older than
+``LINTAI_LLM_CACHE_TTL_DAYS`` (default 30) or, least recently used first, when
+there are more than ``LINTAI_LLM_CACHE_MAX_ENTRIES`` (default 20 000).
+
+Like the analysis cache, every I/O failure is logged and treated as a miss.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from lintai.engine.cache import ensure_cache_dir
+
+logger = logging.getLogger(__name__)
+
+FILENAME = "llm_responses.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS replies (
+    key            TEXT PRIMARY KEY,
+    reply          TEXT NOT NULL,
+    prompt_tok     INTEGER NOT NULL,
+    completion_tok INTEGER NOT NULL,
+    created        REAL NOT NULL,
+    used           REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS replies_used ON replies (used);
+"""
+
+#: set by ``lintai find-issues`` (``--llm-cache``); None → caching disabled
+response_cache: Optional["ResponseCache"] = None
+
+
+class CachedReply(NamedTuple):
+    reply: str
+    prompt_tok: int
+    completion_tok: int
+
+
+class ResponseCache:
+    """Thread-safe SQLite store of LLM replies with TTL and LRU-size eviction."""
+
+    def __init__(
+        self, path: Path, ttl_seconds: float, max_entries: int, clock=time.time
+    ) -> None:
+        self.path = Path(path)
+        self.ttl = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._db.execute(
+            "DELETE FROM replies WHERE created < ?", (self._clock() - self.ttl,)
+        )
+        self._db.commit()
+        (self._count,) = self._db.execute("SELECT COUNT(*) FROM replies").fetchone()
+
+    @classmethod
+    def open(cls, directory: Path) -> Optional["ResponseCache"]:
+        """Cache under *directory* with limits from the environment, or None."""
+        ttl_days = float(os.getenv("LINTAI_LLM_CACHE_TTL_DAYS", "30"))
+        max_entries = int(os.getenv("LINTAI_LLM_CACHE_MAX_ENTRIES", "20000"))
+        try:
+            ensure_cache_dir(Path(directory))
+            return cls(Path(directory) / FILENAME, ttl_days * 86400, max_entries)
+        except (OSError, sqlite3.Error) as exc:
+            logger.warning("LLM cache unavailable (%s) – replies not cached", exc)
+            return None
+
+    # ------------------------------------------------------------------ keys
+    @staticmethod
+    def key(provider: str, model: str, template: str, prompt: str) -> str:
+        h = hashlib.sha256()
+        for part in (provider, model, template, prompt):
+            h.update(part.encode("utf-8", "surrogatepass"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    # ------------------------------------------------------------------ I/O
+    def get(self, key: str) -> Optional[CachedReply]:
+        """The cached reply for *key*, or None when missing or expired."""
+        now = self._clock()
+        try:
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT reply, prompt_tok, completion_tok, created "
+                    "FROM replies WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if row is not None and row[3] < now - self.ttl:
+                    self._db.execute("DELETE FROM replies WHERE key = ?", (key,))
+                    self._count -= 1
+                    row = None
+                elif row is not None:
+                    self._db.execute(
+                        "UPDATE replies SET used = ? WHERE key = ?", (now, key)
+                    )
+                self._db.commit()
+        except sqlite3.Error as exc:
+            logger.debug("LLM cache: lookup failed – %s", exc)
+            row = None
+
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return CachedReply(row[0], row[1], row[2])
+
+    def put(self, key: str, reply: str, prompt_tok: int, completion_tok: int) -> None:
+        """Store *reply*, evicting the least recently used entries over the cap."""
+        now = self._clock()
+        try:
+            with self._lock:
+                cur = self._db.execute(
+                    "INSERT OR IGNORE INTO replies VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, reply, prompt_tok, completion_tok, now, now),
+                )
+                self._count += cur.rowcount
+                if self._count > self.max_entries:
+                    self._db.execute(
+                        "DELETE FROM replies WHERE key IN (SELECT key FROM replies "
+                        "ORDER BY used LIMIT ?)",
+                        (self._count - self.max_entries,),
+                    )
+                    self._count = self.max_entries
+                self._db.commit()
+        except sqlite3.Error as exc:
+            logger.warning("LLM cache: could not store reply – %s", exc)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
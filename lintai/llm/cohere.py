@@ -18,6 +18,8 @@ _ERROR_JSON = json.dumps(
 
 
 class _CohereClient(LLMClient):
+    rate_env = "COHERE"
+
     def __init__(self):
         if cohere is None:
             raise ImportError(_ERROR_JSON)
@@ -37,15 +39,18 @@ class _CohereClient(LLMClient):
         )
 
     def ask(
-        self, prompt: str, max_tokens: int = 256, **kw
+        self, prompt: str, max_tokens: int = 256, *, system: str | None = None, **kw
     ) -> str:  # kw: temperature, max_tokens ...
         try:
             # ①  budget check
-            self._preflight_budget(prompt, max_tokens)
+            self._preflight_budget(self._joined(system, prompt), max_tokens)
 
             # ②  call provider and get response
-            resp = self.client.chat(
-                model=self.model, message=prompt, max_tokens=max_tokens
+            extra = {"preamble": system} if system else {}
+            resp = self._send(
+                lambda: self.client.chat(
+                    model=self.model, message=prompt, max_tokens=max_tokens, **extra
+                )
             )
 
             # ③  extract usage for *real* accounting
@@ -65,6 +70,7 @@ class _CohereClient(LLMClient):
         except BudgetExceededError:
             raise
         except Exception as exc:
+            self._abort_budget()
             return json.dumps(
                 {
                     "issue": f"Cohere error: {exc.__class__.__name__}",
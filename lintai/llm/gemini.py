@@ -18,6 +18,8 @@ _ERROR_JSON = json.dumps(
 
 
 class _GeminiClient(LLMClient):
+    rate_env = "GEMINI"
+
     def __init__(self):
         if genai is None:
             raise ImportError(_ERROR_JSON)
@@ -37,16 +39,19 @@ class _GeminiClient(LLMClient):
         )
 
     def ask(
-        self, prompt: str, max_tokens: int = 256, **kw
+        self, prompt: str, max_tokens: int = 256, *, system: str | None = None, **kw
     ) -> str:  # kw: temperature, max_tokens ...
+        prompt = self._joined(system, prompt)  # no per-request system slot
         try:
             # ①  budget check
             self._preflight_budget(prompt, max_tokens)
 
             # ②  call provider and get response
-            resp = self.model.generate_content(
-                prompt,
-                generation_config={"max_output_tokens": max_tokens},
+            resp = self._send(
+                lambda: self.model.generate_content(
+                    prompt,
+                    generation_config={"max_output_tokens": max_tokens},
+                )
             )
 
             # ③  extract usage for *real* accounting
@@ -66,6 +71,7 @@ class _GeminiClient(LLMClient):
         except BudgetExceededError:
             raise
         except Exception as exc:
+            self._abort_budget()
             return json.dumps(
                 {
                     "issue": f"Gemini error: {exc.__class__.__name__}",
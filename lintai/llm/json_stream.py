@@ -0,0 +1,96 @@
+"""
+lintai.llm.json_stream
+----------------------
+Incremental parser for a JSON object arriving in chunks (a streamed reply).
+
+`IncrementalJSON.feed()` takes each chunk as it comes; `fields` holds every
+top-level member whose value is complete so far, so a caller can act on
+``{"issue": "clean", ...`` without waiting for – or paying for – the rest.
+Text before the first ``{`` (prose, a ```json fence) is skipped; members are
+decoded with `json.loads` once their raw text is complete.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Optional
+
+_OPEN = "{["
+_CLOSE = "}]"
+
+
+class IncrementalJSON:
+    """Top-level members of the first JSON object in a stream of text."""
+
+    def __init__(self) -> None:
+        self.text = ""
+        self.fields: Dict[str, Any] = {}
+        self.done = False  # the object's closing brace has been read
+        self._pos = 0
+        self._start = -1  # offset of the opening brace
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._key: Optional[str] = None
+        self._token = -1  # start of the key / value being read at depth 1
+
+    def feed(self, chunk: str) -> Dict[str, Any]:
+        """Consume *chunk*; returns `fields`."""
+        self.text += chunk
+        text = self.text
+        for i in range(self._pos, len(text)):
+            if self.done:
+                break
+            c = text[i]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif c == "\\":
+                    self._escaped = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._end_token(i + 1)
+                continue
+            if self._start < 0:
+                if c == "{":
+                    self._start, self._depth = i, 1
+                continue
+            if c == '"':
+                self._in_string = True
+                if self._depth == 1 and self._token < 0:
+                    self._token = i
+            elif c in _OPEN:
+                if self._depth == 1 and self._token < 0:
+                    self._token = i
+                self._depth += 1
+            elif c in _CLOSE:
+                self._depth -= 1
+                if self._depth == 1:
+                    self._end_token(i + 1)
+                elif self._depth == 0:
+                    self._end_token(i)  # bare last value: `"n": 1}`
+                    self.done = True
+            elif self._depth == 1:
+                if c in ",:":
+                    self._end_token(i)
+                elif not c.isspace() and self._token < 0:
+                    self._token = i  # number / true / false / null
+        self._pos = len(text)
+        return self.fields
+
+    def _end_token(self, end: int) -> None:
+        if self._token < 0:
+            return
+        raw = self.text[self._token : end].strip()
+        self._token = -1
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            return
+        if self._key is None:
+            if isinstance(value, str):
+                self._key = value
+        else:
+            self.fields[self._key] = value
+            self._key = None
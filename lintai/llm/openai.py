@@ -1,6 +1,6 @@
 from __future__ import annotations
 import json, os, importlib.util, types
-from typing import Any
+from typing import Any, Iterator
 from lintai.llm.base import LLMClient
 from lintai.llm.token_util import estimate_tokens
 from lintai.llm.errors import BudgetExceededError
@@ -43,16 +43,70 @@ def _make_client() -> Any:
             or os.getenv("LLM_API_KEY")  # generic LLM API key variable
             or ""
         )
-        return openai.OpenAI(api_key=key or None, base_url=base or None)
+        # retries are LLMClient._send()'s job – it honours Retry-After across
+        # concurrent audits and respects the client-side rate limits
+        return openai.OpenAI(api_key=key or None, base_url=base or None, max_retries=0)
 
     # 0.x – module‑level functions
     return openai  # type: ignore[return-value]
 
 
+def _messages(system: str | None, prompt: str) -> list[dict]:
+    """
+    Chat messages with the static *system* part first.  OpenAI caches prompt
+    prefixes (≥1024 tokens) automatically, so a byte-identical system message
+    is what makes repeated audits hit the cache.
+    """
+    messages = [{"role": "user", "content": prompt}]
+    if system:
+        messages.insert(0, {"role": "system", "content": system})
+    return messages
+
+
+def _prompt_usage(usage: Any) -> dict:
+    """``prompt_tok`` / ``cached_tok`` for `_post_commit_budget` from *usage*."""
+    if usage is None:
+        return {}
+    details = getattr(usage, "prompt_tokens_details", None)
+    return {
+        "prompt_tok": usage.prompt_tokens,
+        "cached_tok": getattr(details, "cached_tokens", None) or 0,
+    }
+
+
+def _chat_pieces(resp: Any, usage: dict) -> Iterator[str]:
+    """Text deltas of a streamed chat completion; the final chunk's usage
+    (``stream_options.include_usage``) is stored in *usage*."""
+    for chunk in resp:
+        if getattr(chunk, "usage", None):
+            usage.update(_prompt_usage(chunk.usage))
+            usage["completion_tok"] = chunk.usage.completion_tokens
+        for choice in chunk.choices or ():
+            if choice.delta.content:
+                yield choice.delta.content
+
+
+def _stream_options() -> dict:
+    return {"stream": True, "stream_options": {"include_usage": True}}
+
+
+def _error_reply(exc: Exception) -> str:
+    # Surface a JSON stub so detector won't crash the scan
+    return json.dumps(
+        {
+            "issue": f"OpenAI SDK error: {exc.__class__.__name__}",
+            "sev": "info",
+            "fix": "Check OPENAI_API_KEY / network or pin openai<1.0",
+        }
+    )
+
+
 # ------------------------------------------------------------------ #
 # 3. Provider implementation
 # ------------------------------------------------------------------ #
 class _OpenAIClient(LLMClient):
+    rate_env = "OPENAI"
+
     def __init__(self):
         if openai is None:
             raise ImportError(_ERROR_JSON)
@@ -64,19 +118,21 @@ class _OpenAIClient(LLMClient):
         )
 
     def ask(
-        self, prompt: str, max_tokens: int = 256, **kw
+        self, prompt: str, max_tokens: int = 256, *, system: str | None = None, **kw
     ) -> str:  # kw: temperature, max_tokens ...
         try:
             # ①  budget check
-            self._preflight_budget(prompt, max_tokens)
+            self._preflight_budget(self._joined(system, prompt), max_tokens)
 
             # ②  call provider and get response
-            resp = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=max_tokens,
-                temperature=kw.get("temperature", 0.2),
-                response_format={"type": "json_object"},
+            resp = self._send(
+                lambda: self.client.chat.completions.create(
+                    model=self.model,
+                    messages=_messages(system, prompt),
+                    max_tokens=max_tokens,
+                    temperature=kw.get("temperature", 0.2),
+                    response_format={"type": "json_object"},
+                )
             )
             message = (
                 resp.choices[0].message.content
@@ -93,22 +149,42 @@ class _OpenAIClient(LLMClient):
             )
             cost_usd = None  # OpenAI API v2 doesn’t return cost – leave None
 
-            # ④  commit to budget
-            self._post_commit_budget(completion_tok, cost_usd)
+            # ④  commit to budget (prefix-cache hits are billed at a discount)
+            self._post_commit_budget(completion_tok, cost_usd, **_prompt_usage(usage))
 
             # ⑤  return the message content
             return message
         except BudgetExceededError:
             raise
         except Exception as exc:
-            # Surface a JSON stub so detector won't crash the scan
-            return json.dumps(
-                {
-                    "issue": f"OpenAI SDK error: {exc.__class__.__name__}",
-                    "sev": "info",
-                    "fix": "Check OPENAI_API_KEY / network or pin openai<1.0",
-                }
+            self._abort_budget()
+            return _error_reply(exc)
+
+    def stream(
+        self, prompt: str, max_tokens: int = 256, *, system: str | None = None, **kw
+    ) -> Iterator[str]:
+        try:
+            self._preflight_budget(self._joined(system, prompt), max_tokens)
+            resp = self._send(
+                lambda: self.client.chat.completions.create(
+                    model=self.model,
+                    messages=_messages(system, prompt),
+                    max_tokens=max_tokens,
+                    temperature=kw.get("temperature", 0.2),
+                    response_format={"type": "json_object"},
+                    **_stream_options(),
+                )
             )
+        except BudgetExceededError:
+            raise
+        except Exception as exc:
+            self._abort_budget()
+            yield _error_reply(exc)
+            return
+        usage: dict = {}
+        yield from self._relay(
+            _chat_pieces(resp, usage), usage, getattr(resp, "close", None)
+        )
 
 
 def create():
@@ -0,0 +1,173 @@
+"""
+lintai.llm.ratelimit
+--------------------
+Client-side rate limiting and retries for provider round-trips.
+
+Every `LLMClient` owns a `RateLimiter`: a requests-per-minute and a
+tokens-per-minute token bucket, read from ``<PROVIDER>_RPM`` / ``<PROVIDER>_TPM``
+(e.g. ``OPENAI_TPM``) or the generic ``LINTAI_LLM_RPM`` / ``LINTAI_LLM_TPM``;
+unset or 0 means unlimited.  Concurrent audits wait on the buckets instead of
+tripping the provider's own limits.
+
+Rate-limit (429), overload (5xx, 529) and timeout / connection errors are
+retried up to ``LINTAI_LLM_MAX_RETRIES`` times (default 4).  A ``Retry-After``
+header is honoured and pauses every request of the client; without one the
+delay backs off exponentially with jitter.  Anything else is raised at once.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRY_STATUS = frozenset({408, 409, 429, 500, 502, 503, 504, 529})
+BACKOFF_BASE = 1.0  # longest wait before the first retry without Retry-After
+BACKOFF_CAP = 60.0  # longest wait between two attempts
+
+# indirection so tests can skip the waiting
+_clock = time.monotonic
+_sleep = time.sleep
+
+
+class TokenBucket:
+    """
+    Refills *per_minute* units per minute, holding at most that many.
+
+    `take()` never refuses: it debits the bucket (possibly below zero) and
+    returns how long the caller must wait for the debt to refill, so waiters
+    are served in the order they arrived.
+    """
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = None):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self._clock = clock or _clock
+        self._level = self.capacity
+        self._stamp = self._clock()
+
+    def take(self, amount: float) -> float:
+        now = self._clock()
+        self._level = min(self.capacity, self._level + (now - self._stamp) * self.rate)
+        self._stamp = now
+        self._level -= min(amount, self.capacity)  # oversized requests still pass
+        return 0.0 if self._level >= 0 else -self._level / self.rate
+
+
+class RateLimiter:
+    """RPM + TPM buckets and the retry allowance shared by one client."""
+
+    def __init__(
+        self, rpm: float = 0, tpm: float = 0, max_retries: int = 4, clock=None
+    ) -> None:
+        self.max_retries = max_retries
+        self._clock = clock or _clock
+        self._requests = TokenBucket(rpm, self._clock) if rpm > 0 else None
+        self._tokens = TokenBucket(tpm, self._clock) if tpm > 0 else None
+        self._resume_at = 0.0  # set by a Retry-After pause
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, prefix: str) -> "RateLimiter":
+        def limit(name: str) -> float:
+            raw = os.getenv(f"{prefix}_{name}") or os.getenv(f"LINTAI_LLM_{name}")
+            return float(raw or 0)
+
+        retries = int(os.getenv("LINTAI_LLM_MAX_RETRIES", "4"))
+        return cls(limit("RPM"), limit("TPM"), retries)
+
+    def acquire(self, tokens: int) -> None:
+        """Block until one request of *tokens* tokens fits the limits."""
+        with self._lock:
+            wait = max(0.0, self._resume_at - self._clock())
+            if self._requests is not None:
+                wait = max(wait, self._requests.take(1))
+            if self._tokens is not None:
+                wait = max(wait, self._tokens.take(tokens))
+        if wait > 0:
+            logger.debug("LLM rate limit: waiting %.2fs", wait)
+            _sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every request of this client for *seconds*."""
+        with self._lock:
+            self._resume_at = max(self._resume_at, self._clock() + seconds)
+
+
+# ---------------------------------------------------------------------------
+# error classification – provider SDKs share no exception hierarchy
+# ---------------------------------------------------------------------------
+def _status(exc: BaseException) -> Optional[int]:
+    for owner in (exc, getattr(exc, "response", None)):
+        for attr in ("status_code", "status", "code"):
+            value = getattr(owner, attr, None)
+            if isinstance(value, int) and 100 <= value < 600:
+                return value
+    return None
+
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    """Seconds requested by the error's ``Retry-After`` header, if any."""
+    headers = getattr(exc, "headers", None)
+    if headers is None:
+        headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:  # HTTP-date
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    status = _status(exc)
+    if status is not None:
+        return status in RETRY_STATUS
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    name = type(exc).__name__
+    return "Timeout" in name or "Connection" in name
+
+
+def call_with_retries(request: Callable[[], T], limiter: RateLimiter, tokens: int) -> T:
+    """Run *request* under *limiter*, retrying transient provider errors."""
+    attempt = 0
+    while True:
+        limiter.acquire(tokens)
+        try:
+            return request()
+        except Exception as exc:
+            if not is_retryable(exc):
+                raise
+            if attempt >= limiter.max_retries:
+                logger.warning("LLM request failed after %d retries: %s", attempt, exc)
+                raise
+            attempt += 1
+            delay = retry_after(exc)
+            if delay is not None:
+                limiter.pause(min(delay, BACKOFF_CAP))  # acquire() waits it out
+            else:
+                backoff = min(BACKOFF_CAP, BACKOFF_BASE * 2 ** (attempt - 1))
+                _sleep(random.uniform(0, backoff))  # full jitter
+            logger.info(
+                "LLM request failed (%s) – retry %d/%d",
+                type(exc).__name__,
+                attempt,
+                limiter.max_retries,
+            )
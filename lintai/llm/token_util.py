@@ -1,48 +1,115 @@
 # lintai/llm/token_util.py
 from __future__ import annotations
+import functools
 import logging
+import math
+import threading
 
 log = logging.getLogger(__name__)
 
-# optional dependency – fall back gracefully
-try:
-    import tiktoken
-except ModuleNotFoundError:  # pragma: no cover
-    tiktoken = None
-
+# optional dependency – imported (and cl100k_base loaded) on first use only:
+# tiktoken pulls in requests and may fetch the encoding, which used to cost
+# every `lintai` invocation hundreds of ms at import time
+tiktoken = None
 _CL100K = None
-if tiktoken:
+_LOADED = False
+
+# cheap mode: characters per token, seeded with typical values for source code
+# and re-calibrated from every exact count of at least _CALIBRATE_MIN chars
+_SEED_RATIOS = {"cl100k_base": 3.5, "o200k_base": 3.7}
+_DEFAULT_RATIO = 4.0  # also the no-tiktoken heuristic: len(text) // 4
+_CALIBRATE_MIN = 256
+_SAMPLES: dict[str, list[int]] = {}  # encoding name → [chars, tokens]
+_SAMPLES_LOCK = threading.Lock()
+
+# a cheap estimate is trusted only while it uses at most this share of the
+# remaining budget – close to the limit the prompt is counted exactly
+FAR_FROM_LIMIT = 0.5
+
+
+def _load_tiktoken() -> None:
+    global tiktoken, _CL100K, _LOADED
+    if _LOADED:
+        return
+    _LOADED = True
+    try:
+        import tiktoken as _tiktoken
+    except ModuleNotFoundError:  # pragma: no cover
+        return
+    tiktoken = _tiktoken
     try:
         _CL100K = tiktoken.get_encoding("cl100k_base")
     except Exception:  # pragma: no cover
         pass
 
 
-def estimate_tokens(text: str, model_hint: str | None = None) -> int:
+@functools.lru_cache(maxsize=64)
+def _encoder(model_hint: str | None):
+    """
+    The tiktoken encoding for *model_hint* (``cl100k_base`` if unknown), or
+    None without tiktoken.  Memoised: the lookup – and, offline, its failed
+    download attempt – happens once per model, not once per prompt.
+    """
+    _load_tiktoken()
+    if not tiktoken:
+        return None
+    if model_hint:
+        try:
+            return tiktoken.encoding_for_model(model_hint)
+        except KeyError:  # model unknown to tiktoken
+            pass
+        except Exception as exc:  # e.g. encoding file cannot be downloaded
+            log.debug("tiktoken: no encoding for %s (%s)", model_hint, exc)
+    return _CL100K
+
+
+def chars_per_token(model_hint: str | None = None) -> float:
+    """Calibrated characters-per-token ratio of *model_hint*'s encoding."""
+    enc = _encoder(model_hint)
+    if enc is None:
+        return _DEFAULT_RATIO
+    sample = _SAMPLES.get(enc.name)
+    if sample and sample[1]:
+        return sample[0] / sample[1]
+    return _SEED_RATIOS.get(enc.name, _DEFAULT_RATIO)
+
+
+def approx_tokens(text: str, model_hint: str | None = None) -> int:
+    """Token count from the calibrated ratio – no encoding pass."""
+    return max(1, math.ceil(len(text) / chars_per_token(model_hint)))
+
+
+def estimate_tokens(
+    text: str, model_hint: str | None = None, *, headroom: int | None = None
+) -> int:
     """
     Best-effort token estimator.
 
     1.  If *tiktoken* is available & knows the model, use that.
     2.  Else fall back to `cl100k_base` (handles GPT-4/-3.5 roughly).
     3.  Else len(text) // 4 heuristic.
-    """
-    if not tiktoken:
-        return max(1, len(text) // 4)
 
-    try:
-        enc = (
-            tiktoken.encoding_for_model(model_hint) if model_hint else None  # fast path
-        )
-    except KeyError:
-        enc = None
-
-    if not enc:
-        enc = _CL100K
+    With *headroom* (tokens the budget can still afford) the cheap
+    `approx_tokens` estimate is returned while it is far below it; the text is
+    encoded only when the answer could decide whether the budget holds.
+    """
+    if headroom is not None:
+        approx = approx_tokens(text, model_hint)
+        if approx <= headroom * FAR_FROM_LIMIT:
+            return approx
 
+    enc = _encoder(model_hint)
     if enc:
         try:
-            return len(enc.encode(text))
+            tokens = len(enc.encode(text))
         except Exception:  # defensive
             pass
+        else:
+            if len(text) >= _CALIBRATE_MIN and tokens:
+                with _SAMPLES_LOCK:
+                    sample = _SAMPLES.setdefault(enc.name, [0, 0])
+                    sample[0] += len(text)
+                    sample[1] += tokens
+            return tokens
 
     return max(1, len(text) // 4)
@@ -0,0 +1,127 @@
+"""
+lintai/ui/audit_worker.py – run ``lintai`` commands inside the UI process
+-------------------------------------------------------------------------
+The UI normally starts a fresh ``lintai`` subprocess for every scan, which
+pays for interpreter start-up, provider-SDK imports and a new TLS connection
+to the LLM endpoint each time.  With ``lintai ui --warm-worker`` scans run
+in-process instead: provider clients (and their HTTP connection pools) are
+kept per provider configuration and reused by every later scan.
+
+Runs are serialised under one process-wide lock – the CLI keeps per-scan
+state in module globals – and each one starts from the same state a
+subprocess would: LLM budget and audit de-duplication are reset before it,
+and the environment variables, root log level and detector-registry entries
+it changes are put back afterwards, key by key, so the server's own request
+handlers never see them replaced wholesale.  Scans always run with
+``--jobs 1``: forking a process pool from the threaded server is unsafe.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Sequence
+
+import typer
+
+logger = logging.getLogger(__name__)
+
+# commands that take --jobs; in the worker they must not start a process pool
+_POOLED_COMMANDS = ("find-issues", "catalog-ai")
+# shared by every worker: the state a run touches is process-global
+_RUN_LOCK = threading.Lock()
+
+
+@contextmanager
+def _scoped_environ() -> Iterator[None]:
+    """Undo the run's changes to ``os.environ`` (e.g. from ``--env-file``)."""
+    saved = dict(os.environ)
+    try:
+        yield
+    finally:
+        for key in [k for k in os.environ if k not in saved]:
+            os.environ.pop(key, None)
+        for key, value in saved.items():
+            if os.environ.get(key) != value:
+                os.environ[key] = value
+
+
+@contextmanager
+def _scoped_log_level() -> Iterator[None]:
+    """Undo the run's ``--log-level`` on the root logger."""
+    root = logging.getLogger()
+    level = root.level
+    try:
+        yield
+    finally:
+        root.setLevel(level)
+
+
+@contextmanager
+def _scoped_registry(registry: dict) -> Iterator[None]:
+    """Drop rules the run registered (DSL rulesets) and undo edits in place."""
+    saved = {rid: list(fns) for rid, fns in registry.items()}
+    try:
+        yield
+    finally:
+        for rid in [r for r in registry if r not in saved]:
+            del registry[rid]
+        for rid, fns in saved.items():
+            if registry.get(rid) != fns:
+                registry.setdefault(rid, [])[:] = fns
+
+
+class AuditWorker:
+    """Executes ``lintai`` argument lists in-process, one at a time."""
+
+    def __init__(self) -> None:
+        from lintai.llm import keep_clients_warm
+
+        keep_clients_warm()
+
+    def run(self, argv: Sequence[str]) -> int:
+        """Run ``lintai <argv>`` and return its exit code."""
+        from lintai.cli import app
+        from lintai.core.loader import load_plugins
+        from lintai.detectors import _REGISTRY, _discover_builtin, llm_code_audit
+        from lintai.llm import cache as llm_cache
+        from lintai.llm.budget import manager
+
+        argv = list(argv)
+        if argv and argv[0] in _POOLED_COMMANDS:
+            argv += ["--jobs", "1"]  # the last --jobs given wins
+
+        with _RUN_LOCK:
+            # detectors that register on import do so only once per process,
+            # so they must be in the snapshot that is restored after each run
+            _discover_builtin()
+            load_plugins()
+            manager.reset()
+            llm_code_audit.reset_run_state()
+            try:
+                with (
+                    _scoped_environ(),
+                    _scoped_log_level(),
+                    _scoped_registry(_REGISTRY),
+                ):
+                    code = app(args=argv, prog_name="lintai", standalone_mode=False)
+            except typer.Abort:
+                code = 1
+            except SystemExit as exc:
+                code = exc.code if isinstance(exc.code, int) else 1
+            except Exception as exc:
+                # usage errors / ctx.fail() – typer may vendor its own click,
+                # so recognise them by shape rather than by class
+                code = getattr(exc, "exit_code", None)
+                if isinstance(code, int) and hasattr(exc, "show"):
+                    exc.show()
+                else:
+                    logger.exception("lintai %s crashed", " ".join(argv))
+                    code = 2
+            finally:
+                if llm_cache.response_cache is not None:
+                    llm_cache.response_cache.close()
+                    llm_cache.response_cache = None
+            return code or 0
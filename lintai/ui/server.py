@@ -52,6 +52,25 @@ def set_server_log_level(level: str) -> None:
     log.setLevel(numeric_level)
 
 
+# ──────────────────── warm audit worker ──────────────────────
+# None → every job is a `lintai` subprocess; set by `lintai ui --warm-worker`,
+# which also exports LINTAI_UI_WARM_WORKER so --reload's server process sees it
+_AUDIT_WORKER = None
+
+
+def enable_audit_worker() -> None:
+    """Run find-issues jobs in-process, reusing warm LLM provider clients."""
+    global _AUDIT_WORKER
+    from lintai.ui.audit_worker import AuditWorker
+
+    if _AUDIT_WORKER is None:
+        _AUDIT_WORKER = AuditWorker()
+
+
+if os.getenv("LINTAI_UI_WARM_WORKER") == "1":
+    enable_audit_worker()
+
+
 # ──────────────────── workspace root ──────────────────────────
 ROOT = Path(os.getenv("LINTAI_SRC_CODE_ROOT", Path.cwd()))
 if not ROOT.is_dir():
@@ -237,17 +256,21 @@ def _common_flags(depth: int | None, log_level: str | None):
 
 
 #  helpers: background job wrapper ----------------------------------------
-def _kick(cmd: list[str], rid: str, bg: BackgroundTasks):
+def _run_subprocess(cmd: list[str]) -> int:
+    return subprocess.run(cmd, check=False).returncode
+
+
+def _kick(cmd: list[str], rid: str, bg: BackgroundTasks, runner=_run_subprocess):
     def task():
         try:
             # Run the command and capture the exit code
-            result = subprocess.run(cmd, check=False)
+            returncode = runner(cmd)
 
             # Exit codes 0 and 1 are both considered successful for lintai:
             # - 0: scan completed with no blocking findings
             # - 1: scan completed with blocking findings (still a successful scan)
             # Only exit codes > 1 indicate actual errors
-            if result.returncode <= 1:
+            if returncode <= 1:
                 _set_status(rid, "done")
 
                 # Add to enhanced history when job completes successfully
@@ -267,7 +290,7 @@ def _kick(cmd: list[str], rid: str, bg: BackgroundTasks):
                         _add_catalog_history_entry(run, report)
             else:
                 # Only treat exit codes > 1 as actual errors
-                log.error("lintai failed with exit code %d", result.returncode)
+                log.error("lintai failed with exit code %d", returncode)
                 _set_status(rid, "error")
 
                 # Store error message for failed analyses
@@ -275,10 +298,8 @@ def _kick(cmd: list[str], rid: str, bg: BackgroundTasks):
                 if run:
                     error_report = {
                         "error": True,
-                        "error_message": f"Command failed with exit code {result.returncode}",
-                        "errors": [
-                            f"Command failed with exit code {result.returncode}"
-                        ],
+                        "error_message": f"Command failed with exit code {returncode}",
+                        "errors": [f"Command failed with exit code {returncode}"],
                     }
                     error_path = _report_path(rid, run.type)
                     error_path.write_text(json.dumps(error_report))
@@ -752,7 +773,10 @@ async def find_issues(
         + _common_flags(depth, log_level)
         + _env_cli_flags()
     )
-    _kick(cmd, rid, bg)
+    if _AUDIT_WORKER is None:
+        _kick(cmd, rid, bg)
+    else:
+        _kick(cmd, rid, bg, runner=lambda c: _AUDIT_WORKER.run(c[1:]))
 
     # 5) record & return the pending run
     run = RunSummary(
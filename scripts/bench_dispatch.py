@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for per-file detector dispatch (lintai.detectors.run_all).
+
+Registers no-op detectors – module-level ones and node-level ones on common
+node types – in place of the real registry and times `run_all()` on
+lintai's own source files, so what is measured is the dispatcher: building
+the per-file detector split, finding the subscribed nodes, calling each
+detector.  Trees are parsed and indexed up front.
+
+    python scripts/bench_dispatch.py [--detectors 12] [--repeat 20]
+
+``indexed`` feeds node detectors from `PythonASTUnit.nodes_of`; ``walk``
+uses a unit without a node-type index, so the tree is traversed.
+"""
+
+import argparse
+import ast
+import time
+from pathlib import Path
+
+import lintai.detectors as detectors
+from lintai.detectors.base import SourceUnit
+from lintai.engine.python_ast_unit import PythonASTUnit
+
+_NODE_TYPES = (ast.Call, ast.JoinedStr, ast.Assign, ast.FunctionDef)
+
+
+class _WalkUnit(SourceUnit):
+    """A unit without `nodes_of()`: the dispatcher has to walk its tree."""
+
+    def __init__(self, unit: PythonASTUnit):
+        super().__init__(unit.path)
+        self.tree = unit.tree
+        self._current = None
+
+    def joined_fstrings(self):
+        return ()
+
+    def is_user_tainted(self, node):
+        return False
+
+    def has_call(self, name, node):
+        return False
+
+
+def _registry(n: int) -> dict:
+    registry = {}
+    for i in range(n):
+        fn = lambda unit: ()  # noqa: E731 – one distinct object per detector
+        if i % 3 == 0:
+            fn._lintai_scope, fn._lintai_node_types = "module", ()
+        else:
+            fn._lintai_scope = "node"
+            fn._lintai_node_types = (_NODE_TYPES[i % len(_NODE_TYPES)],)
+        fn._lintai_parallel = True
+        registry[f"BENCH{i:02d}"] = [fn]
+    return registry
+
+
+def _units() -> list[PythonASTUnit]:
+    root = Path(__file__).parent.parent / "lintai"
+    units = []
+    for p in sorted(root.rglob("*.py")):
+        unit = PythonASTUnit(p, p.read_text(), project_root=root)
+        unit.nodes_of(ast.Module)  # build the node-type index now
+        units.append(unit)
+    return units
+
+
+def _time(units, repeat) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for unit in units:
+            detectors.run_all(unit)
+    return (time.perf_counter() - start) / (repeat * len(units))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--detectors", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    detectors._discover_builtin()  # so the real detectors never get imported
+    detectors._REGISTRY = _registry(args.detectors)
+
+    units = _units()
+    nodes = sum(1 for u in units for _ in ast.walk(u.tree))
+    print(f"files: {len(units)}, {nodes} nodes, {args.detectors} detectors")
+
+    for label, batch in (("indexed", units), ("walk", [_WalkUnit(u) for u in units])):
+        _time(batch, 1)  # warm-up
+        print(f"{label:8}: {_time(batch, args.repeat) * 1e6:10.1f} µs / file")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for DSL rule matching (lintai.dsl.loader).
+
+Generates *N* rules in the shape of the bundled ones – a keyword, an
+alternation of keywords or a prefix followed by a character class – over
+``Constant`` / ``JoinedStr`` nodes, loads them into a fresh registry and
+times the dispatch entry they are folded into (one shared matcher) on every
+string literal of lintai's own sources, against searching each rule's regex
+separately (what one detector per rule used to do).
+
+    python scripts/bench_dsl.py [--rules 300] [--repeat 5]
+"""
+
+import argparse
+import ast
+import random
+import re
+import time
+from pathlib import Path
+
+import lintai.detectors as detectors
+from lintai.dsl import loader
+from lintai.engine.visitor import DispatchTable
+
+_WORDS = [
+    "secret", "password", "api_key", "token", "bearer", "private", "ssn",
+    "credit", "session", "cookie", "oauth", "jwt", "aws", "ssh", "pgp",
+]  # fmt: skip
+
+
+def _rules(n: int) -> list[dict]:
+    rnd = random.Random(0)
+    rules = []
+    for i in range(n):
+        a, b = rnd.sample(_WORDS, 2)
+        pattern = rnd.choice(
+            [
+                rf"{a}_{i}\b",
+                rf"\{{[^}}]*({a}|{b}){i}[^}}]*\}}",
+                rf"(?i){b}-{i}[0-9a-f]{{8,}}",
+            ]
+        )
+        rules.append(
+            {
+                "id": f"B{i:03d}",
+                "scope": "node",
+                "node_types": ["Constant", "JoinedStr"],
+                "pattern": pattern,
+                "message": "bench",
+            }
+        )
+    return rules
+
+
+def _nodes() -> list[ast.AST]:
+    root = Path(__file__).parent.parent / "lintai"
+    nodes = []
+    for p in sorted(root.rglob("*.py")):
+        for node in ast.walk(ast.parse(p.read_text())):
+            if isinstance(node, ast.JoinedStr) or (
+                isinstance(node, ast.Constant) and isinstance(node.value, str)
+            ):
+                nodes.append(node)
+    return nodes
+
+
+class _Unit:
+    path = "bench.py"
+    _current = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rules", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    detectors._discover_builtin()  # so the real detectors never get imported
+    detectors._REGISTRY = {}
+    for rule in _rules(args.rules):
+        loader._load_one(rule)
+    table = DispatchTable.compile(detectors._detectors())
+    (batch,) = table.by_type[ast.Constant]
+    regexes = [re.compile(r["pattern"]) for r in _rules(args.rules)]
+
+    nodes = _nodes()
+    texts = [loader._extract_text(n) for n in nodes]
+    print(f"strings: {len(nodes)}, rules: {args.rules}")
+
+    unit = _Unit()
+
+    def grouped():
+        for node in nodes:
+            unit._current = node
+            for _ in batch(unit):
+                pass
+
+    def per_rule():
+        for node in nodes:
+            text = loader._extract_text(node)
+            for regex in regexes:
+                regex.search(text)
+
+    for label, fn in (("grouped", grouped), ("per-rule", per_rule)):
+        fn()  # warm-up
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            fn()
+        elapsed = (time.perf_counter() - start) / (args.repeat * len(texts))
+        print(f"{label:8}: {elapsed * 1e6:10.1f} µs / string")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for lintai.llm.token_util.estimate_tokens.
+
+Times exact counting (tiktoken encode) against the cheap chars-per-token
+estimate on prompts built from lintai's own source files, and reports how far
+the cheap estimate is from the exact count.
+
+    python scripts/bench_token_estimate.py [--model gpt-4.1-mini] [--repeat 20]
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from lintai.llm import token_util
+
+
+def _prompts() -> list[str]:
+    root = Path(__file__).parent.parent / "lintai"
+    return [p.read_text() for p in sorted(root.rglob("*.py")) if p.stat().st_size]
+
+
+def _time(fn, prompts, repeat) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in prompts:
+            fn(text)
+    return (time.perf_counter() - start) / (repeat * len(prompts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model", default="gpt-4.1-mini")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    prompts = _prompts()
+    enc = token_util._encoder(args.model)
+    print(f"encoder: {enc.name if enc else 'none (len // 4 heuristic)'}")
+    print(f"prompts: {len(prompts)}, {sum(map(len, prompts)) // 1024} KiB")
+
+    exact = [token_util.estimate_tokens(p, args.model) for p in prompts]  # warm-up
+    cheap = [token_util.approx_tokens(p, args.model) for p in prompts]
+
+    t_exact = _time(
+        lambda p: token_util.estimate_tokens(p, args.model), prompts, args.repeat
+    )
+    t_cheap = _time(
+        lambda p: token_util.estimate_tokens(p, args.model, headroom=10**12),
+        prompts,
+        args.repeat,
+    )
+    error = abs(sum(cheap) - sum(exact)) / max(1, sum(exact))
+
+    print(f"exact : {t_exact * 1e6:10.1f} µs / prompt")
+    print(f"cheap : {t_cheap * 1e6:10.1f} µs / prompt ({t_exact / t_cheap:.0f}x)")
+    print(f"ratio : {token_util.chars_per_token(args.model):.2f} chars / token")
+    print(f"error : {error:.1%} of the exact total")
+
+
+if __name__ == "__main__":
+    main()
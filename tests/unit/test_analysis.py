@@ -0,0 +1,71 @@
+import textwrap
+
+from lintai.engine.analysis import ProjectAnalyzer
+from lintai.engine.python_ast_unit import PythonASTUnit
+
+
+def _units(tmp_path, files):
+    units = []
+    for name, src in files.items():
+        fp = tmp_path / name
+        fp.write_text(textwrap.dedent(src))
+        units.append(PythonASTUnit(fp, fp.read_text(), project_root=tmp_path))
+    return units
+
+
+_FILES = {
+    "bot.py": """
+        import openai
+
+        def ask(q):
+            return openai.ChatCompletion.create(prompt=q)
+
+        def helper(q):
+            return ask(q)
+        """,
+    "app.py": """
+        from bot import ask, helper
+
+        def main():
+            ask("a")
+            helper("b")
+
+        def other():
+            main()
+        """,
+}
+
+
+def test_reverse_call_graph_mirrors_call_graph(tmp_path):
+    pa = ProjectAnalyzer(_units(tmp_path, _FILES), call_depth=3).analyze()
+
+    forward = {(a, b) for a, bs in pa.call_graph.items() for b in bs}
+    reverse = {(a, b) for b, a_s in pa.reverse_call_graph.items() for a in a_s}
+    assert forward == reverse
+
+    assert pa.callers_of("bot.ask") == ["bot.helper", "app.main"]
+    assert pa.callers_of("nowhere") == []
+    assert {"bot.ask", "bot.helper", "app.main", "app.other"} <= pa.ai_functions
+
+
+def test_call_graph_is_interned_and_exports_to_networkx(tmp_path):
+    pa = ProjectAnalyzer(_units(tmp_path, _FILES)).analyze()
+
+    assert pa.call_graph["app.main"] == {"bot.ask", "bot.helper"}
+    assert "app.nothing" not in pa.call_graph
+    assert pa.callees_of("app.other") == ["app.main"]
+
+    graph = pa.to_networkx()
+    assert {"bot.ask", "bot.helper", "app.main", "app.other"} <= set(graph.nodes)
+    assert graph.has_edge("bot.helper", "bot.ask")
+    assert graph.has_edge("app.other", "app.main")
+
+
+def test_ai_modules_are_sinks_and_their_callers_only(tmp_path):
+    files = dict(_FILES, **{"util.py": "def local():\n    return len([])\n"})
+    pa = ProjectAnalyzer(_units(tmp_path, files), call_depth=0).analyze()
+
+    assert len(pa.call_graph) == len(list(pa.call_graph))
+    assert len(pa.reverse_call_graph) == len(list(pa.reverse_call_graph))
+    names = {p.rsplit("/", 1)[-1] for p in pa.ai_modules}
+    assert names == {"bot.py", "app.py"}
@@ -0,0 +1,91 @@
+import json
+import textwrap
+
+import pathspec
+
+from lintai.cli_support import build_ast_units
+from lintai.engine.analysis import ProjectAnalyzer
+from lintai.engine.cache import AnalysisCache
+
+_EMPTY_SPEC = pathspec.PathSpec.from_lines("gitwildmatch", [])
+
+
+def _project(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "bot.py").write_text(
+        textwrap.dedent(
+            """
+            import openai
+
+            def ask(user_prompt):
+                return openai.ChatCompletion.create(prompt=user_prompt)
+            """
+        )
+    )
+    (src / "app.py").write_text(
+        textwrap.dedent(
+            """
+            from bot import ask
+
+            def main():
+                prompt_text = "hi"
+                ask(prompt_text)
+            """
+        )
+    )
+    return src
+
+
+def _analyse(src, cache):
+    units = build_ast_units(src, _EMPTY_SPEC, jobs=1, cache=cache, defer_cached=True)
+    return units, ProjectAnalyzer(units, cache=cache).analyze()
+
+
+def _snapshot(pa):
+    return (
+        [c.as_dict() for c in pa.ai_calls],
+        {k: sorted(v) for k, v in pa.call_graph.items()},
+        sorted(pa.ai_functions),
+        sorted(pa.ai_modules),
+        json.dumps(
+            [inv.model_dump() for inv in pa.inventories.values()], sort_keys=True
+        ),
+    )
+
+
+def test_warm_cache_matches_cold_run_without_parsing(tmp_path):
+    src = _project(tmp_path)
+    cache_dir = tmp_path / "cache"
+
+    _, cold = _analyse(src, AnalysisCache(cache_dir))
+    warm_cache = AnalysisCache(cache_dir)
+    units, warm = _analyse(src, warm_cache)
+
+    assert warm_cache.hits == len(units) == 2
+    # sinks carry their enclosing function, so nothing needs an AST
+    assert not any(u.is_parsed for u in units)
+    assert _snapshot(warm) == _snapshot(cold)
+    assert [c.scope for c in warm.ai_calls] == [c.scope for c in cold.ai_calls]
+
+    # def nodes are still reachable – the tree is parsed on demand
+    unit, node = warm.source_of(next(q for q in warm.ai_functions if "ask" in q))
+    assert node.name == "ask" and unit.is_parsed
+
+    # detectors need every tree: without defer_cached they are parsed up front
+    units = build_ast_units(src, _EMPTY_SPEC, jobs=1, cache=AnalysisCache(cache_dir))
+    assert all(u.is_parsed for u in units)
+
+
+def test_changed_file_is_reanalysed(tmp_path):
+    src = _project(tmp_path)
+    cache_dir = tmp_path / "cache"
+    _analyse(src, AnalysisCache(cache_dir))
+
+    (src / "app.py").write_text("def main():\n    return 1\n")
+    cache = AnalysisCache(cache_dir)
+    _, pa = _analyse(src, cache)
+
+    assert cache.hits == 1
+    assert "app.main" not in {c for cs in pa.call_graph.values() for c in cs}
+    assert not pa.call_graph.get("app.main")
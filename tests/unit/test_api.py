@@ -124,6 +124,25 @@ def test_full_flow(client, monkeypatch, tmp_path):
     ).json()["nodes"] == [{"id": "A"}]
 
 
+def test_find_issues_runs_in_warm_worker(client, monkeypatch, tmp_path):
+    class _Worker:
+        argv = None
+
+        def run(self, argv):
+            self.argv = argv
+            return 1  # blocking findings still count as a finished scan
+
+    worker = _Worker()
+    monkeypatch.setattr(ui, "_AUDIT_WORKER", worker)
+    monkeypatch.setattr(ui.subprocess, "run", pytest.fail)
+
+    run = client.post("/api/find-issues", params={"path": str(tmp_path)}).json()
+
+    assert worker.argv[:2] == ["find-issues", str(tmp_path)]
+    assert client.get("/api/runs").json()[0]["status"] == "done"
+    assert run["run_id"]
+
+
 def test_list_root(client, tmp_path):
     resp = client.get("/api/fs")
     assert resp.status_code == 200
@@ -0,0 +1,73 @@
+import json
+import os
+import textwrap
+
+import lintai.llm as llm
+from lintai.detectors import _REGISTRY, llm_code_audit
+from lintai.ui.audit_worker import AuditWorker
+
+_BOT = """
+    import openai
+
+    def ask(user_input):
+        prompt = f"Answer this: {user_input}"
+        return openai.ChatCompletion.create(messages=[prompt])
+
+    def run(code):
+        return eval(code)
+    """
+
+
+def _scan(worker, out):
+    code = worker.run(["find-issues", "bot.py", "--no-cache", "--output", str(out)])
+    report = json.loads(out.read_text())
+    found = [(f["detector_id"], f["line"]) for f in report["findings"]]
+    return code, llm_code_audit._CLIENT, found
+
+
+def test_worker_reuses_client_and_starts_each_run_fresh(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm, "_WARM", None)
+    monkeypatch.setenv("LINTAI_LLM_PROVIDER", "dummy")
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "bot.py").write_text(textwrap.dedent(_BOT))
+    (tmp_path / ".env").write_text("LINTAI_MAX_LLM_REQUESTS=7\n")
+    worker = AuditWorker()
+
+    code0, client0, found0 = _scan(worker, tmp_path / "first.json")
+    detectors = sum(map(len, _REGISTRY.values()))
+    code1, client1, found1 = _scan(worker, tmp_path / "second.json")
+
+    assert code0 == code1 == 1  # blocking findings, as from the subprocess
+    assert client0 is client1 and client0.is_dummy
+    assert found0 == found1 == [("LLM01", 5), ("PY01", 9)]
+    assert sum(map(len, _REGISTRY.values())) == detectors
+    assert "LINTAI_MAX_LLM_REQUESTS" not in os.environ  # .env did not leak
+
+
+def test_worker_reports_usage_errors(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm, "_WARM", None)
+
+    assert AuditWorker().run(["find-issues", "--no-such-flag"]) == 2
+
+
+def test_worker_never_forks_and_restores_log_level(tmp_path, monkeypatch):
+    import logging
+
+    from lintai import cli_support
+    from lintai.detectors import _workers
+
+    def no_pool(*a, **kw):
+        raise AssertionError("the warm worker must not start a process pool")
+
+    monkeypatch.setattr(llm, "_WARM", None)
+    monkeypatch.setenv("LINTAI_LLM_PROVIDER", "dummy")
+    monkeypatch.setattr(cli_support, "ProcessPoolExecutor", no_pool)
+    monkeypatch.setattr(_workers, "ProcessPoolExecutor", no_pool)
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "bot.py").write_text(textwrap.dedent(_BOT))
+    root = logging.getLogger()
+    monkeypatch.setattr(root, "level", logging.WARNING)
+
+    argv = ["find-issues", "bot.py", "--no-cache", "--jobs", "4", "-l", "DEBUG"]
+    assert AuditWorker().run(argv) == 1
+    assert root.level == logging.WARNING
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+
+from lintai.llm.budget import BudgetManager
+
+
+def _manager(**limits):
+    manager = BudgetManager()
+    for k, v in limits.items():
+        setattr(manager, k, v)
+    return manager
+
+
+def test_concurrent_reservations_never_over_admit():
+    manager = _manager(max_tokens=1000)
+    start = threading.Barrier(16)
+    admitted = []
+
+    def worker():
+        start.wait()
+        for _ in range(10):
+            res = manager.reserve(40, 10, "fake-model")
+            if res is not None:
+                admitted.append(res)
+
+    threads = [threading.Thread(target=worker) for _ in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(admitted) == 20  # 1000 tokens / 50 per reservation
+    assert manager.headroom("fake-model") == 0
+
+    for res in admitted[:5]:
+        res.settle(20, 5)  # used half of what was reserved
+    for res in admitted[5:]:
+        res.cancel()
+        res.settle()  # no-op: a reservation is returned only once
+
+    usage = manager.snapshot()
+    assert usage["tokens_used"] == 125 and usage["requests"] == 5
+    assert manager.headroom("fake-model") == 875
+
+
+def test_concurrent_settles_release_a_reservation_once():
+    manager = _manager(max_tokens=1000)
+    reservations = [manager.reserve(40, 10, "fake-model") for _ in range(20)]
+    start = threading.Barrier(8)
+
+    def worker(i):
+        start.wait()
+        for res in reservations:
+            res.settle() if i % 2 else res.cancel()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    usage = manager.snapshot()
+    assert usage["tokens_used"] == 50 * usage["requests"]
+    assert manager.headroom("fake-model") == 1000 - usage["tokens_used"]
+
+
+def test_reservations_across_asyncio_tasks():
+    manager = _manager(max_requests=3)
+
+    async def call():
+        res = manager.reserve(10, 10, "fake-model")
+        await asyncio.sleep(0)  # other tasks run while the request is in flight
+        if res is not None:
+            res.settle(5, 5)
+        return res is not None
+
+    async def main():
+        return await asyncio.gather(*(call() for _ in range(5)))
+
+    assert sum(asyncio.run(main())) == 3
+    assert manager.snapshot()["requests"] == 3
+
+
+def test_allow_is_a_check_only():
+    manager = _manager(max_requests=2)
+    for _ in range(5):
+        assert manager.allow(10, 10, "fake-model")  # probing holds nothing
+    manager.commit(10, 10, "fake-model")  # allow() → commit() as before
+    assert manager.snapshot()["requests"] == 1
+
+    res = manager.reserve(10, 10, "fake-model")
+    assert not manager.allow(0, 0, "fake-model")  # the reservation counts
+    res.cancel()
+    assert manager.allow(0, 0, "fake-model")
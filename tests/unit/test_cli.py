@@ -25,6 +25,7 @@ def test_cli_runs(tmp_path, monkeypatch):
         str(tmp_path),
         "--output",
         str(output_file),
+        "--no-cache",
     ]
 
     result = subprocess.run(
@@ -54,7 +55,7 @@ def main():
     src.write_text(code)
 
     runner = CliRunner()
-    result = runner.invoke(app, ["catalog-ai", str(src)])
+    result = runner.invoke(app, ["catalog-ai", str(src), "--no-cache"])
 
     assert result.exit_code == 0
     inventory_data = json.loads(result.stdout)
@@ -80,3 +81,14 @@ def main():
     assert (
         "user_prompt" in ask_openai_uses
     )  # Note: This will require further refinement of the logic
+
+
+def test_no_cache_leaves_no_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("LINTAI_LLM_PROVIDER", "dummy")
+    (tmp_path / "bot.py").write_text("import openai\n")
+
+    result = CliRunner().invoke(app, ["find-issues", "bot.py", "--no-cache"])
+
+    assert result.exit_code == 0, result.output
+    assert not (tmp_path / ".lintai_cache").exists()  # nor the LLM reply cache
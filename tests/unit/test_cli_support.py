@@ -0,0 +1,78 @@
+import ast
+from pathlib import Path
+
+import pathspec
+
+from lintai.cli_support import build_ast_units
+import lintai.cli_support as cli_support
+
+_EMPTY_SPEC = pathspec.PathSpec.from_lines("gitwildmatch", [])
+
+
+def _make_tree(root: Path, n: int = 40) -> None:
+    for i in range(n):
+        pkg = root / f"pkg{i % 4}"
+        pkg.mkdir(exist_ok=True)
+        (pkg / f"mod{i}.py").write_text(f"def f{i}():\n    return {i}\n")
+    (root / "broken.py").write_text("def oops(:\n")
+    (root / "latin1.py").write_bytes(b"x = '\xe9'\n")
+
+
+def test_parallel_parse_matches_serial(tmp_path, monkeypatch):
+    _make_tree(tmp_path)
+    monkeypatch.setattr(cli_support, "_MIN_FILES_FOR_POOL", 1)
+
+    serial = build_ast_units(tmp_path, _EMPTY_SPEC, jobs=1)
+    parallel = build_ast_units(tmp_path, _EMPTY_SPEC, jobs=3)
+
+    assert [u.path for u in parallel] == [u.path for u in serial]
+    assert [u.modname for u in parallel] == [u.modname for u in serial]
+    assert [ast.dump(u.tree) for u in parallel] == [ast.dump(u.tree) for u in serial]
+    # broken / non-utf8 files are skipped in both modes
+    assert len(serial) == 40
+
+
+def test_ignored_dirs_are_pruned_and_nested_ignores_apply(tmp_path, monkeypatch):
+    for rel in (
+        "app.py",
+        "node_modules/dep/x.py",
+        "sub/keep.py",
+        "sub/gen/out.py",
+        "sub/skip_me.py",
+        "other/skip_me.py",
+    ):
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text("x = 1\n")
+    (tmp_path / "sub" / ".gitignore").write_text("gen/\nskip_me.py\n")
+    spec = pathspec.PathSpec.from_lines("gitwildmatch", ["node_modules/"])
+
+    listed = []
+    real = cli_support.os.scandir
+    monkeypatch.setattr(
+        cli_support.os, "scandir", lambda p: listed.append(Path(p).name) or real(p)
+    )
+    found = [
+        p.relative_to(tmp_path).as_posix()
+        for p in cli_support.iter_python_files(tmp_path, spec)
+    ]
+
+    assert found == ["app.py", "other/skip_me.py", "sub/keep.py"]
+    assert "node_modules" not in listed and "gen" not in listed
+
+
+def test_scan_root_ignore_applies_when_cwd_ignore_was_loaded(tmp_path, monkeypatch):
+    proj = tmp_path / "proj"
+    for rel in ("keep.py", "gen/out.py", "vendor/x.py"):
+        (proj / rel).parent.mkdir(parents=True, exist_ok=True)
+        (proj / rel).write_text("x = 1\n")
+    (tmp_path / ".lintaiignore").write_text("vendor/\n")
+    (proj / ".gitignore").write_text("gen/\n")
+    monkeypatch.chdir(tmp_path)
+
+    spec = cli_support._load_ignore(proj)  # picks the CWD's .lintaiignore
+    found = [
+        p.relative_to(proj).as_posix()
+        for p in cli_support.iter_python_files(proj, spec)
+    ]
+
+    assert found == ["keep.py"]
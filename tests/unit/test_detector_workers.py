@@ -0,0 +1,147 @@
+import ast
+import pickle
+
+import pathspec
+import pytest
+
+import lintai.detectors as detectors
+import lintai.detectors._workers as workers
+import lintai.engine as engine
+from lintai.cli_support import build_ast_units
+from lintai.core.finding import Finding
+from lintai.detectors import run_units
+
+_EMPTY_SPEC = pathspec.PathSpec.from_lines("gitwildmatch", [])
+
+_SRC = """
+import openai
+from mod_0 import helper
+
+def ask_{i}(q):
+    return openai.ChatCompletion.create(prompt=helper(q))
+
+def helper(q):
+    return q.strip()
+"""
+
+
+def _finding(rule, unit, line, message):
+    return Finding(rule, "A01", [], "low", message, unit.path, line)
+
+
+def callers(unit):
+    # reads the analyzer: answered from the snapshot inside a worker
+    name = f"{unit.modname}.helper"
+    src_unit, node = engine.ai_analyzer.source_of(name)
+    callers = sorted(engine.ai_analyzer.callers_of(name))
+    yield _finding("T1", unit, node.lineno, f"{src_unit.path.name} {callers}")
+
+
+def calls(unit):
+    if unit.modname.endswith("_3"):
+        raise RuntimeError("boom")  # contained per detector, as in-process
+    yield _finding("T2", unit, unit._current.lineno, "call")
+
+
+def in_main_process(unit):
+    yield _finding("T3", unit, unit._current.lineno, "main")
+
+
+def _registry():
+    def closure(unit):  # not picklable → stays in the parent
+        yield _finding("T4", unit, 1, "closure")
+
+    callers._lintai_scope = closure._lintai_scope = "module"
+    calls._lintai_scope = in_main_process._lintai_scope = "node"
+    calls._lintai_node_types = in_main_process._lintai_node_types = (ast.Call,)
+    in_main_process._lintai_parallel = False
+    return {"T1": [callers], "T2": [calls], "T3": [in_main_process], "T4": [closure]}
+
+
+def test_workers_match_a_serial_run(tmp_path, monkeypatch):
+    for i in range(6):
+        (tmp_path / f"mod_{i}.py").write_text(_SRC.format(i=i))
+    units = build_ast_units(tmp_path, _EMPTY_SPEC, jobs=1)
+    monkeypatch.setattr(engine, "ai_analyzer", None)
+    engine.initialise(units)
+    monkeypatch.setattr(detectors, "_REGISTRY", _registry())
+    monkeypatch.setattr(detectors, "_DISCOVERED", True)
+    monkeypatch.setattr(workers, "_MIN_UNITS_FOR_POOL", 2)
+
+    serial = run_units(units)
+    assert len(serial) == 6 * (1 + 1 + 3 * 2) - 3  # T2 crashed on mod_3's calls
+
+    monkeypatch.setattr(workers, "_collect", lambda *a: pytest.fail("ran in-process"))
+    assert run_units(units, jobs=2) == serial
+
+
+def test_main_process_skips_units_no_local_detector_handles(tmp_path, monkeypatch):
+    for i in range(4):
+        src = _SRC.format(i=i) if i % 2 else "X = 1\n"
+        (tmp_path / f"mod_{i}.py").write_text(src)
+    units = build_ast_units(tmp_path, _EMPTY_SPEC, jobs=1)
+    monkeypatch.setattr(engine, "ai_analyzer", None)
+    engine.initialise(units)
+    registry = _registry()
+    del registry["T1"], registry["T4"]  # T3 (Call nodes) is the only local one
+    monkeypatch.setattr(detectors, "_REGISTRY", registry)
+    monkeypatch.setattr(detectors, "_DISCOVERED", True)
+    monkeypatch.setattr(workers, "_MIN_UNITS_FOR_POOL", 2)
+    serial = run_units(units)
+
+    visited = []
+    visitor = workers._DispatchVisitor
+    monkeypatch.setattr(
+        workers,
+        "_DispatchVisitor",
+        lambda unit, *a, **kw: visited.append(unit.modname) or visitor(unit, *a, **kw),
+    )
+    assert run_units(units, jobs=2) == serial
+    assert sorted(m.rsplit(".", 1)[-1] for m in visited) == ["mod_1", "mod_3"]
+
+
+def test_snapshot_pickles_without_units(tmp_path):
+    for i in range(2):
+        (tmp_path / f"mod_{i}.py").write_text(_SRC.format(i=i))
+    units = build_ast_units(tmp_path, _EMPTY_SPEC, jobs=1)
+    analyzer = engine.analysis.ProjectAnalyzer(units).analyze()
+
+    snapshot = pickle.loads(pickle.dumps(analyzer.snapshot()))
+    assert snapshot.ai_functions == analyzer.ai_functions
+    assert snapshot.callers_of("mod_0.helper") == ["mod_0.ask_0", "mod_1.ask_1"]
+    with pytest.raises(KeyError):
+        snapshot.source_of("mod_0.helper")  # not attached to any unit yet
+
+    snapshot.attach(units)
+    assert snapshot.source_of("mod_0.helper")[1].name == "helper"
+
+
+class _UnindexedUnit:
+    """A unit without `nodes_of()`: the dispatcher walks its tree."""
+
+    def __init__(self, unit):
+        self.path, self.tree, self.modname = unit.path, unit.tree, unit.modname
+        self._current = None
+
+
+def test_dispatch_table_is_compiled_once_and_walks_in_index_order(
+    tmp_path, monkeypatch
+):
+    (tmp_path / "mod_0.py").write_text(_SRC.format(i=0))
+    (unit,) = build_ast_units(tmp_path, _EMPTY_SPEC, jobs=1)
+    monkeypatch.setattr(detectors, "_REGISTRY", _registry())
+    monkeypatch.setattr(detectors, "_DISCOVERED", True)
+    monkeypatch.setattr(engine, "ai_analyzer", None)
+    del detectors._REGISTRY["T1"]  # needs the analyzer
+
+    table = detectors._dispatch_table()
+    assert detectors._dispatch_table() is table
+    assert table.by_type[ast.Call] == (calls, in_main_process)
+
+    indexed = detectors.run_all(unit)
+    assert [f.detector_id for f in indexed] == ["T4"] + ["T2", "T3"] * 3
+    assert detectors.run_all(_UnindexedUnit(unit)) == indexed
+    assert detectors._dispatch_table() is table
+
+    detectors._REGISTRY["T5"] = [callers]
+    assert detectors._dispatch_table() is not table  # registry changed
@@ -1,11 +1,14 @@
 # In tests/unit/test_dsl.py
 
 import json
+import re
 import os
 import subprocess
 import pytest
 from pathlib import Path
 
+from lintai.engine.python_ast_unit import PythonASTUnit
+
 ROOT = Path(__file__).parent.parent.parent
 
 
@@ -32,6 +35,7 @@ def test_secret_in_prompt_finding(tmp_path):
             str(tmp_path),
             "--log-level",
             "DEBUG",
+            "--no-cache",
         ],
         env=dict(os.environ, LINTAI_LLM_PROVIDER="dummy"),
         capture_output=True,
@@ -54,3 +58,88 @@ def test_secret_in_prompt_finding(tmp_path):
     # Checking that "A02" is IN the owasp_id makes the test more robust.
     assert findings, "Findings list should not be empty"
     assert any("A02" in f["owasp_id"] for f in findings)
+
+
+_RULES = [
+    {"pattern": r"\{[^}]*(secret|password|api_key)[^}]*\}"},  # bundled AI001
+    {"pattern": r"(?i)bearer\s+\w+"},
+    {"pattern": r"(?:AKIA|ASIA)[A-Z0-9]{4}", "node_types": ["Constant"]},
+    {"pattern": r"sk-[A-Za-z0-9]{8,}"},
+    {"pattern": r"\d{16}"},  # no literal: checked on every string
+]
+
+_TEXTS = [
+    "Hi {user}, your {password} please",
+    "Authorization: BEARER abc",
+    "key sk-abcdefgh1234 and 4111111111111111",
+    "AKIA1234",
+    "nothing to see {here}",
+    "ASIA",
+    "bearer xyz AKIA1234 sk-abcdefgh1234",  # groups interleave
+]
+
+
+def test_dsl_rules_keep_their_ids_and_share_one_matcher(tmp_path, monkeypatch):
+    import ast
+    import lintai.detectors as detectors
+    from lintai.dsl import loader
+    from lintai.engine.visitor import DispatchTable, _Batch, _DispatchVisitor
+
+    monkeypatch.setattr(detectors, "_REGISTRY", {})
+    rules = [
+        {
+            "id": f"R{i}",
+            "scope": "node",
+            "node_types": ["Constant", "JoinedStr"],
+            "message": "m",
+            **rule,
+        }
+        for i, rule in enumerate(_RULES)
+    ]
+    (tmp_path / "rules.json").write_text(json.dumps(rules))
+    loader.load_rules(tmp_path / "rules.json")
+
+    assert list(detectors._REGISTRY) == ["R0", "R1", "R2", "R3", "R4"]
+    registered = [fn for fns in detectors._REGISTRY.values() for fn in fns]
+    table = DispatchTable.compile(registered)
+    # R2 (Constant only) splits the run of shared-matcher rules in two
+    assert [len(b.members) for b in table.by_type[ast.Constant]] == [2, 1, 2]
+    (batch,) = table.by_type[ast.JoinedStr]
+    assert isinstance(batch, _Batch) and len(batch.group.rules) == 4
+
+    class _Unit:
+        path = "x.py"
+
+    unit = _Unit()
+    for text in _TEXTS:
+        unit._current = ast.Constant(text, lineno=1)
+        expected = [f"Rule {r['id']}" for r in rules if re.search(r["pattern"], text)]
+        found = [f for fn in table.by_type[ast.Constant] for f in fn(unit)]
+        assert [f.detector_id for f in found] == expected, text
+        alone = [f for fn in registered for f in fn(unit)]  # undispatched
+        assert [f.detector_id for f in alone] == expected, text
+
+    # keyed dispatch (worker processes) keeps each rule's own rank
+    unit = PythonASTUnit(
+        tmp_path / "x.py", "\n".join(map(repr, _TEXTS)), project_root=tmp_path
+    )
+    plain = _DispatchVisitor(unit, table)
+    plain.visit(unit.tree)
+    keyed = _DispatchVisitor(unit, table, keyed=True)
+    keyed.visit(unit.tree)
+    assert keyed.findings == plain.findings and keyed.keys == sorted(keyed.keys)
+    assert len({rank for _, rank in keyed.keys}) == 5
+
+
+def test_required_literals():
+    from lintai.dsl.loader import _required_literals
+
+    assert _required_literals(r"\{[^}]*(secret|password)[^}]*\}") == {
+        "secret",
+        "password",
+    }
+    assert _required_literals(r"api[_-]?key\s*=") == {"api"}
+    assert _required_literals(r"ya?ml") == {"ml"}
+    assert _required_literals(r"sk-[a-z]{20,}") == {"sk-"}
+    for pattern in (r"a|b", r"\x41BC", r"\d+", r"(?=foo)"):
+        assert _required_literals(pattern) is None, pattern
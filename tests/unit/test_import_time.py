@@ -0,0 +1,45 @@
+import subprocess
+import sys
+
+# modules that `lintai --version` / `--help` must not pay for
+_HEAVY = (
+    "uvicorn",
+    "fastapi",
+    "networkx",
+    "tiktoken",
+    "requests",
+    "pydantic",
+    "yaml",
+    "lintai.engine.analysis",
+    "lintai.detectors.llm_code_audit",
+    "lintai.ui.server",
+)
+
+# generous – a cold import was ~250 ms before heavy imports were deferred
+_BUDGET_US = 500_000
+
+
+def _importtime(module: str) -> dict[str, int]:
+    """Cumulative import time (µs) per module, from ``python -X importtime``."""
+    res = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in res.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_cli_import_stays_light():
+    times = _importtime("lintai.cli")
+
+    loaded = {m for m in _HEAVY if m in times}
+    assert not loaded, f"imported at CLI start-up: {sorted(loaded)}"
+    assert times["lintai.cli"] < _BUDGET_US
@@ -0,0 +1,108 @@
+import os
+import subprocess
+import textwrap
+
+import pathspec
+import pytest
+
+from lintai.cli_support import build_ast_units
+from lintai.engine.analysis import ProjectAnalyzer
+from lintai.engine.cache import AnalysisCache
+from lintai.engine.incremental import GitError, units_to_rescan
+
+_EMPTY_SPEC = pathspec.PathSpec.from_lines("gitwildmatch", [])
+_GIT_ENV = {
+    **os.environ,
+    "GIT_AUTHOR_NAME": "t",
+    "GIT_AUTHOR_EMAIL": "t@example.com",
+    "GIT_COMMITTER_NAME": "t",
+    "GIT_COMMITTER_EMAIL": "t@example.com",
+}
+
+
+def _git(repo, *args):
+    subprocess.run(
+        ["git", *args], cwd=repo, env=_GIT_ENV, check=True, capture_output=True
+    )
+
+
+def _write(path, code):
+    path.write_text(textwrap.dedent(code))
+
+
+@pytest.fixture
+def repo(tmp_path):
+    _write(
+        tmp_path / "helper.py",
+        """
+        import openai
+
+        def helper(q):
+            return openai.ChatCompletion.create(prompt=q)
+        """,
+    )
+    _write(
+        tmp_path / "app.py",
+        """
+        from helper import helper
+
+        def main():
+            return helper("hi")
+        """,
+    )
+    _write(tmp_path / "util.py", "def add(a, b):\n    return a + b\n")
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "init")
+    return tmp_path
+
+
+def _rescan(repo, cache):
+    units = build_ast_units(repo, _EMPTY_SPEC, jobs=1, cache=cache)
+    pa = ProjectAnalyzer(units, cache=cache).analyze()
+    return [u.path.name for u in units_to_rescan(units, pa, "HEAD", cache=cache)]
+
+
+def test_only_changed_files_are_rescanned(repo):
+    cache = AnalysisCache(repo / ".lintai_cache")
+    assert _rescan(repo, cache) == []
+
+    (repo / "util.py").write_text("def add(a, b):\n    return b + a\n")
+    (repo / "new.py").write_text("x = 1\n")
+    assert sorted(_rescan(repo, cache)) == ["new.py", "util.py"]
+
+
+def test_ai_status_flip_pulls_in_dependents(repo):
+    cache = AnalysisCache(repo / ".lintai_cache")
+    (repo / "helper.py").write_text("def helper(q):\n    return q\n")
+    # app.py is unchanged, but no longer wraps an AI call
+    assert sorted(_rescan(repo, cache)) == ["app.py", "helper.py"]
+
+
+def test_deleted_module_pulls_in_dependents(repo):
+    cache = AnalysisCache(repo / ".lintai_cache")
+    (repo / "helper.py").unlink()
+    # app.py owed its AI status to a module that only exists at HEAD
+    assert _rescan(repo, cache) == ["app.py"]
+
+
+def test_neighbour_source_change_pulls_in_audited_callee(repo):
+    cache = AnalysisCache(repo / ".lintai_cache")
+    _write(
+        repo / "app.py",
+        """
+        from helper import helper
+
+        def main():
+            return helper("hello")
+        """,
+    )
+    # helper()'s audit sends its caller main() along as context
+    assert sorted(_rescan(repo, cache)) == ["app.py", "helper.py"]
+
+
+def test_bad_ref_raises(repo):
+    units = build_ast_units(repo, _EMPTY_SPEC, jobs=1)
+    pa = ProjectAnalyzer(units).analyze()
+    with pytest.raises(GitError):
+        units_to_rescan(units, pa, "no-such-ref")
@@ -0,0 +1,286 @@
+import ast
+import json
+import re
+import threading
+import time
+
+import lintai.detectors.llm_code_audit as audit
+import lintai.llm.base as llm_base
+from lintai.detectors import run_units
+from lintai.engine.python_ast_unit import PythonASTUnit
+from lintai.llm.base import LLMClient
+from lintai.llm.budget import BudgetManager
+
+_SRC = """
+import openai
+
+def ask_{i}(q):
+    data = openai.ChatCompletion.create(prompt=q)
+    print(data)
+    return data
+"""
+
+
+class _SlowClient(LLMClient):
+    """Replies with the audited function's name; earlier prompts finish last."""
+
+    model = "fake-model"
+
+    def __init__(self):
+        self.active = self.peak = 0
+        self._lock = threading.Lock()
+
+    def ask(self, prompt, max_tokens=256, **kw):
+        self._preflight_budget(prompt, max_tokens)
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        i = int(re.search(r"def ask_(\d+)", prompt).group(1))
+        time.sleep(0.02 * (6 - i))
+        with self._lock:
+            self.active -= 1
+        self._post_commit_budget(10, None)
+        return json.dumps({"issue": f"issue in ask_{i}", "sev": "low"})
+
+
+def _units(tmp_path, n=6):
+    units = []
+    for i in range(n):
+        fp = tmp_path / f"m{i}.py"
+        fp.write_text(_SRC.format(i=i))
+        units.append(PythonASTUnit(fp, fp.read_text(), project_root=tmp_path))
+    return units
+
+
+def _fresh(monkeypatch, client, **limits):
+    manager = BudgetManager()
+    for k, v in limits.items():
+        setattr(manager, k, v)
+    monkeypatch.setattr(llm_base, "_budget", manager)
+    monkeypatch.setattr(audit, "_budget", manager)
+    monkeypatch.setattr(audit, "_CLIENT", client)
+    monkeypatch.setattr(audit, "_SEEN_FUNCS", set())
+    monkeypatch.setattr(audit, "_EMITTED", set())
+    return manager
+
+
+def test_concurrent_audit_keeps_serial_order(tmp_path, monkeypatch):
+    units = _units(tmp_path)
+
+    _fresh(monkeypatch, _SlowClient())
+    serial = run_units(units, concurrency=1)
+
+    client = _SlowClient()
+    manager = _fresh(monkeypatch, client)
+    parallel = run_units(units, concurrency=6)
+
+    audits = [f.message for f in parallel if f.detector_id == "AI_DETECTOR01"]
+    assert audits == [f"LLM audit: issue in ask_{i}" for i in range(6)]
+    assert [f.to_dict() for f in parallel] == [f.to_dict() for f in serial]
+    assert client.peak > 1
+    assert manager.snapshot()["requests"] == 6
+
+
+def test_concurrent_audit_respects_request_budget(tmp_path, monkeypatch):
+    units = _units(tmp_path)
+    manager = _fresh(monkeypatch, _SlowClient(), max_requests=2)
+
+    findings = run_units(units, concurrency=6)
+
+    assert len([f for f in findings if f.detector_id == "AI_DETECTOR01"]) == 2
+    assert manager.snapshot()["requests"] == 2
+    assert manager.allow(0, 0, "fake-model") is False  # nothing left held or free
+
+
+def test_cached_replies_are_reused_without_spending_budget(tmp_path, monkeypatch):
+    from lintai.llm import cache as llm_cache
+
+    units = _units(tmp_path)
+    monkeypatch.setattr(
+        llm_cache, "response_cache", llm_cache.ResponseCache.open(tmp_path / "c")
+    )
+    _fresh(monkeypatch, _SlowClient())
+    first = run_units(units, concurrency=3)
+
+    manager = _fresh(monkeypatch, _SlowClient(), max_requests=0)
+    again = run_units(units, concurrency=3)
+
+    assert [f.to_dict() for f in again] == [f.to_dict() for f in first]
+    usage = manager.snapshot()
+    assert usage["requests"] == 0
+    assert usage["cache"]["hits"] == 6 and usage["cache"]["tokens_saved"] > 0
+
+
+class _BatchClient(_SlowClient):
+    """Answers batched prompts with ``{"results": [...]}`` keyed by id."""
+
+    max_context = 100_000
+
+    def ask(self, prompt, max_tokens=256, **kw):
+        blocks = re.findall(r"FUNCTION id=(\d+) ###\n```python\ndef ask_(\d+)", prompt)
+        if not blocks:
+            return super().ask(prompt, max_tokens, **kw)
+        self._preflight_budget(prompt, max_tokens)
+        self._post_commit_budget(10, None)
+        results = [
+            {"id": int(n), "issue": f"issue in ask_{i}", "sev": "low"}
+            for n, i in reversed(blocks)
+        ]
+        return json.dumps({"results": results})
+
+
+def test_batched_audit_packs_functions_into_fewer_requests(tmp_path, monkeypatch):
+    units = _units(tmp_path)
+    manager = _fresh(monkeypatch, _BatchClient())
+    monkeypatch.setattr(audit, "batch_size", 4)
+
+    findings = run_units(units, concurrency=2)
+
+    audits = [f.message for f in findings if f.detector_id == "AI_DETECTOR01"]
+    assert audits == [f"LLM audit: issue in ask_{i}" for i in range(6)]
+    assert manager.snapshot()["requests"] == 2  # 4 + 2 functions
+
+
+def test_batches_stay_within_max_context(tmp_path, monkeypatch):
+    units = _units(tmp_path)
+    client = _BatchClient()
+    client.max_context = 750  # room for the preamble and ~2 functions
+    manager = _fresh(monkeypatch, client)
+    monkeypatch.setattr(audit, "batch_size", 6)
+
+    findings = run_units(units, concurrency=1)
+
+    assert len([f for f in findings if f.detector_id == "AI_DETECTOR01"]) == 6
+    assert 2 < manager.snapshot()["requests"] < 6
+
+
+_STATIC = """
+import openai
+
+def fixed():
+    reply = openai.ChatCompletion.create(prompt="Say hello", temperature=0)
+    print(reply)
+
+def cleaned(q):
+    reply = openai.ChatCompletion.create(prompt=sanitize(q))
+    logger.info("got %s", reply.text)
+
+def dangerous():
+    reply = openai.ChatCompletion.create(prompt="Write code")
+    return eval(reply)
+
+def ask_0(user_q):
+    reply = openai.ChatCompletion.create(prompt=f"Answer: {user_q}")
+    return reply
+"""
+
+
+def test_prefilter_skips_provably_clean_functions(tmp_path, monkeypatch):
+    fp = tmp_path / "static.py"
+    fp.write_text(_STATIC)
+    unit = PythonASTUnit(fp, _STATIC, project_root=tmp_path)
+    client = _SlowClient()
+    client.ask = lambda prompt, *a, **kw: asked.append(prompt) or "{}"
+    asked = []
+    manager = _fresh(monkeypatch, client)
+
+    run_units([unit])
+
+    assert len(asked) == 2  # dangerous() and the tainted ask_0()
+    assert all("def dangerous" in p or "def ask_0" in p for p in asked)
+    skipped = manager.snapshot()["prefilter"]
+    assert skipped["skipped"] == 2 and skipped["tokens_saved"] > 0
+    assert skipped["reasons"] == {"constant prompt": 1, "sanitised prompt": 1}
+
+    asked.clear()
+    _fresh(monkeypatch, client)
+    monkeypatch.setattr(audit, "prefilter", False)
+    run_units([unit])
+    assert len(asked) == 4
+
+
+_UNCLEAN = """
+import openai
+from subprocess import run as sh
+
+def aliased_sink():
+    reply = openai.ChatCompletion.create(prompt="Pick a command")
+    sh("make clean", shell=True)
+    return reply
+
+def sql(cursor):
+    cursor.execute(openai.ChatCompletion.create(prompt="query"))
+
+def handed_on():
+    reply = openai.ChatCompletion.create(prompt="Say hello")
+    helper(reply.text)
+
+def stored(self):
+    self.last = openai.ChatCompletion.create(prompt="Say hello")
+
+def logged():
+    reply = openai.ChatCompletion.create(prompt="Say hello")
+    print(reply)
+    return "ok"
+
+def returned():
+    reply = openai.ChatCompletion.create(prompt="Say hello")
+    return reply.text.strip()
+
+def yielded():
+    for reply in openai.ChatCompletion.create(prompt="Say hello", stream=True):
+        yield reply
+"""
+
+
+def test_prefilter_needs_a_safe_reply_not_just_a_constant_prompt(tmp_path, monkeypatch):
+    import lintai.engine as engine
+    from lintai.engine.analysis import ProjectAnalyzer
+
+    fp = tmp_path / "unclean.py"
+    fp.write_text(_UNCLEAN)
+    unit = PythonASTUnit(fp, _UNCLEAN, project_root=tmp_path)
+    monkeypatch.setattr(engine, "ai_analyzer", ProjectAnalyzer([unit]).analyze())
+
+    verdicts = {
+        fn.name: audit._static_verdict(unit, fn)
+        for fn in unit.nodes_of(ast.FunctionDef)
+    }
+    assert verdicts == {
+        "aliased_sink": None,  # `sh` is subprocess.run
+        "sql": None,
+        "handed_on": None,  # helper() is not audited
+        "stored": None,
+        "logged": "constant prompt",
+        "returned": None,  # a caller such as `x = returned(); eval(x)` is not
+        "yielded": None,  # audited unless its own name looks AI-related
+    }
+    assert audit._resolved(unit, "sh") == "subprocess.run"
+
+
+def test_snippets_are_memoised_per_node(monkeypatch):
+    monkeypatch.setattr(audit, "_SNIPPETS", audit._SnippetMemo(maxsize=2))
+    src = 'def helper(x):\n    """Doc."""\n    # note\n    y = x + 1\n    return y\n'
+    node = ast.parse(src).body[0]
+    parse = ast.parse
+    parsed = []
+    monkeypatch.setattr(
+        ast, "parse", lambda *a, **kw: parsed.append(a) or parse(*a, **kw)
+    )
+
+    first = audit._snippet(node, src, path="m.py")
+    assert audit._snippet(node, src, path="m.py") == first
+    assert audit._snippet(node, src, max_lines=1, path="m.py").endswith("…trimmed…")
+    assert first == "def helper(x):\n    y = x + 1\n    return y"
+    assert len(parsed) == 1
+    assert audit.log_snippet_stats() == {
+        "hits": 2,
+        "misses": 1,
+        "size": 1,
+        "hit_rate": 0.667,
+    }
+
+    for other in ("a.py", "b.py"):  # evicts the least recently used entry
+        audit._snippet(node, src, path=other)
+    audit._snippet(node, src, path="m.py")
+    assert len(parsed) == 4
@@ -0,0 +1,50 @@
+from lintai.llm.cache import ResponseCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _cache(tmp_path, clock, ttl=60, max_entries=10):
+    return ResponseCache(tmp_path / "llm.sqlite3", ttl, max_entries, clock=clock)
+
+
+def test_key_covers_provider_model_template_and_prompt():
+    base = ResponseCache.key("openai", "gpt-4o", "1", "prompt")
+    assert base == ResponseCache.key("openai", "gpt-4o", "1", "prompt")
+    assert base != ResponseCache.key("anthropic", "gpt-4o", "1", "prompt")
+    assert base != ResponseCache.key("openai", "gpt-4o-mini", "1", "prompt")
+    assert base != ResponseCache.key("openai", "gpt-4o", "2", "prompt")
+    assert base != ResponseCache.key("openai", "gpt-4o", "1", "prompt!")
+
+
+def test_round_trip_persists_and_expires(tmp_path):
+    clock = _Clock()
+    cache = _cache(tmp_path, clock)
+    cache.put("k", '{"issue": "clean"}', 120, 8)
+    cache.close()
+
+    reopened = _cache(tmp_path, clock)
+    assert reopened.get("k") == ('{"issue": "clean"}', 120, 8)
+    clock.now += 61
+    assert reopened.get("k") is None
+    assert (reopened.hits, reopened.misses) == (1, 1)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    clock = _Clock()
+    cache = _cache(tmp_path, clock, max_entries=2)
+    for key in ("a", "b"):
+        clock.now += 1
+        cache.put(key, key, 1, 1)
+    clock.now += 1
+    cache.get("a")  # "b" is now the least recently used
+    clock.now += 1
+    cache.put("c", "c", 1, 1)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
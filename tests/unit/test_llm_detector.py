@@ -14,7 +14,10 @@ def test_llm_detector_offline(tmp_path, monkeypatch):
         )
     )
     result = subprocess.run(
-        ["lintai", "find-issues", str(src)], capture_output=True, text=True, check=True
+        ["lintai", "find-issues", str(src), "--no-cache"],
+        capture_output=True,
+        text=True,
+        check=True,
     )
     result_obj = json.loads(result.stdout)
     findings = result_obj["findings"]
@@ -58,3 +58,83 @@ def test_openai_provider_requires_sdk(monkeypatch):
     # Ensure it exits when trying to get the provider
     with pytest.raises(SystemExit):
         llm_mod.get_client()
+
+
+def _fake_usage_env(monkeypatch):
+    from lintai.llm.budget import BudgetManager
+    import lintai.llm.base as llm_base
+
+    manager = BudgetManager()
+    monkeypatch.setattr(llm_base, "_budget", manager)
+    monkeypatch.setattr(llm_base, "estimate_tokens", lambda text, model=None, **kw: 100)
+    return manager
+
+
+def test_anthropic_marks_system_prefix_cacheable(monkeypatch):
+    from types import SimpleNamespace as NS
+    import lintai.llm.anthropic as anth
+
+    sent = {}
+
+    class FakeAnthropic:
+        def __init__(self, api_key, **kw):
+            self.messages = NS(create=self._create)
+
+        def _create(self, **kw):
+            sent.update(kw)
+            usage = NS(
+                input_tokens=50,
+                output_tokens=20,
+                cache_read_input_tokens=1000,
+                cache_creation_input_tokens=0,
+            )
+            return NS(content=[NS(text='{"issue": "clean"}')], usage=usage)
+
+    monkeypatch.setattr(anth, "anthropic", NS(Anthropic=FakeAnthropic))
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "k")
+    monkeypatch.delenv("ANTHROPIC_MODEL", raising=False)
+    monkeypatch.delenv("LLM_MODEL_NAME", raising=False)
+    manager = _fake_usage_env(monkeypatch)
+
+    reply = anth.create().ask("variable part", max_tokens=50, system="static rules")
+
+    assert reply == '{"issue": "clean"}'
+    assert sent["system"][0]["text"] == "static rules"
+    assert sent["system"][0]["cache_control"] == {"type": "ephemeral"}
+    assert sent["messages"] == [{"role": "user", "content": "variable part"}]
+    usage = manager.snapshot()
+    assert usage["tokens_used"] == 1070 and usage["cached_prompt_tokens"] == 1000
+    # claude-3: $0.008 / 1k tokens, cache reads at 10 %
+    assert usage["usd_used"] == pytest.approx(0.07 * 0.008 + 1.0 * 0.0008)
+
+
+def test_openai_sends_system_first_and_bills_cached_tokens(monkeypatch):
+    from types import SimpleNamespace as NS
+    import lintai.llm.openai as oai
+
+    sent = {}
+
+    def create(**kw):
+        sent.update(kw)
+        usage = NS(
+            prompt_tokens=1200,
+            completion_tokens=10,
+            prompt_tokens_details=NS(cached_tokens=1024),
+        )
+        return NS(choices=[NS(message=NS(content="{}"))], usage=usage)
+
+    class FakeOpenAI:
+        def __init__(self, **kw):
+            self.chat = NS(completions=NS(create=create))
+
+    monkeypatch.setattr(oai, "openai", NS(OpenAI=FakeOpenAI))
+    monkeypatch.setenv("OPENAI_MODEL", "gpt-4o")
+    manager = _fake_usage_env(monkeypatch)
+
+    oai.create().ask("variable part", system="static rules")
+
+    assert [m["role"] for m in sent["messages"]] == ["system", "user"]
+    assert sent["messages"][0]["content"] == "static rules"
+    usage = manager.snapshot()
+    assert usage["tokens_used"] == 1210 and usage["cached_prompt_tokens"] == 1024
+    assert usage["usd_used"] == pytest.approx(0.186 * 0.005 + 1.024 * 0.0025)
@@ -0,0 +1,109 @@
+import json
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import lintai.llm.base as llm_base
+import lintai.llm.ratelimit as rl
+from lintai.llm.base import LLMClient
+from lintai.llm.budget import BudgetManager
+
+
+@pytest.fixture
+def server():
+    """Local endpoint answering each POST with the next queued response."""
+    replies, seen = [], []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            seen.append(self.rfile.read(int(self.headers["Content-Length"])))
+            status, headers = replies.pop(0) if replies else (200, {})
+            self.send_response(status)
+            for k, v in headers.items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(json.dumps({"issue": "clean"}).encode())
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_port}/", replies, seen
+    httpd.shutdown()
+
+
+class _HTTPClient(LLMClient):
+    model = "fake-model"
+
+    def __init__(self, url):
+        self.url = url
+
+    def ask(self, prompt, max_tokens=256, **kw):
+        try:
+            self._preflight_budget(prompt, max_tokens)
+            body = self._send(
+                lambda: urllib.request.urlopen(self.url, prompt.encode()).read()
+            )
+            self._post_commit_budget(10, None)
+            return body.decode()
+        except Exception as exc:
+            self._abort_budget()
+            return json.dumps({"issue": f"error: {exc.__class__.__name__}"})
+
+
+@pytest.fixture
+def slept(monkeypatch):
+    manager = BudgetManager()
+    monkeypatch.setattr(llm_base, "_budget", manager)
+    naps = []
+    monkeypatch.setattr(rl, "_sleep", naps.append)
+    monkeypatch.delenv("LINTAI_LLM_RPM", raising=False)
+    monkeypatch.delenv("LINTAI_LLM_TPM", raising=False)
+    monkeypatch.setenv("LINTAI_LLM_MAX_RETRIES", "2")
+    return naps
+
+
+def test_429_is_retried_after_retry_after(server, slept):
+    url, replies, seen = server
+    replies.append((429, {"Retry-After": "2"}))
+
+    reply = _HTTPClient(url).ask("audit me")
+
+    assert json.loads(reply) == {"issue": "clean"}
+    assert len(seen) == 2
+    assert len(slept) == 1 and 1.5 < slept[0] <= 2
+    assert llm_base._budget.snapshot()["requests"] == 1
+
+
+def test_retries_give_up_and_client_errors_fail_fast(server, slept):
+    url, replies, seen = server
+    replies.extend([(503, {})] * 3)
+
+    assert "HTTPError" in _HTTPClient(url).ask("audit me")
+    assert len(seen) == 3  # first try + LINTAI_LLM_MAX_RETRIES
+    assert len(slept) == 2 and all(0 <= s <= 2 for s in slept)
+
+    replies.append((400, {}))
+    assert "HTTPError" in _HTTPClient(url).ask("audit me")
+    assert len(seen) == 4
+    assert llm_base._budget.snapshot()["requests"] == 0
+
+
+def test_token_buckets_pace_requests_and_tokens(monkeypatch):
+    now = [0.0]
+    waits = []
+    monkeypatch.setattr(rl, "_sleep", waits.append)
+
+    requests = rl.RateLimiter(rpm=2, clock=lambda: now[0])
+    for _ in range(3):
+        requests.acquire(100)
+    assert waits == [pytest.approx(30)]  # third request within the minute
+
+    tokens = rl.RateLimiter(tpm=1200, clock=lambda: now[0])
+    tokens.acquire(1500)  # more than the bucket holds: drains it, no wait
+    now[0] = 10.0
+    tokens.acquire(600)
+    assert waits[1:] == [pytest.approx(20)]  # 400 tokens short at 20 per second
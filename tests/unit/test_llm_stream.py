@@ -0,0 +1,96 @@
+import json
+from types import SimpleNamespace as NS
+
+import lintai.detectors.llm_code_audit as audit
+import lintai.llm.base as llm_base
+import lintai.llm.openai as oai
+from lintai.llm.budget import BudgetManager
+from lintai.llm.json_stream import IncrementalJSON
+
+
+def test_incremental_json_reads_members_as_they_complete():
+    reply = '```json\n{"issue": "a \\"}\\" b", "owasp": ["LLM01", {"x": "]"}], "n": 3}'
+    parser = IncrementalJSON()
+    seen = []
+    for ch in reply:
+        seen.append(dict(parser.feed(ch)))
+
+    assert parser.done
+    assert parser.fields == {"issue": 'a "}" b', "owasp": ["LLM01", {"x": "]"}], "n": 3}
+    first = next(i for i, f in enumerate(seen) if "issue" in f)
+    assert reply[: first + 1].endswith('b"')  # known right after its closing quote
+
+
+class _Stream:
+    def __init__(self, reply, usage):
+        self.pieces = [reply[i : i + 4] for i in range(0, len(reply), 4)]
+        self.usage = usage
+        self.read = 0
+        self.closed = False
+
+    def __iter__(self):
+        for piece in self.pieces:
+            self.read += 1
+            yield NS(choices=[NS(delta=NS(content=piece))], usage=None)
+        yield NS(choices=[], usage=self.usage)
+
+    def close(self):
+        self.closed = True
+
+
+def _openai(monkeypatch, reply):
+    usage = NS(prompt_tokens=300, completion_tokens=40, prompt_tokens_details=None)
+    stream = _Stream(reply, usage)
+
+    def create(**kw):
+        assert kw["stream"] and kw["stream_options"] == {"include_usage": True}
+        return stream
+
+    class FakeOpenAI:
+        def __init__(self, **kw):
+            self.chat = NS(completions=NS(create=create))
+
+    manager = BudgetManager()
+    monkeypatch.setattr(oai, "openai", NS(OpenAI=FakeOpenAI))
+    monkeypatch.setenv("OPENAI_MODEL", "fake-model")
+    monkeypatch.setattr(llm_base, "_budget", manager)
+    monkeypatch.setattr(llm_base, "estimate_tokens", lambda text, model=None, **kw: 7)
+    return oai.create(), stream, manager
+
+
+def test_clean_verdict_cancels_the_stream(monkeypatch):
+    reply = json.dumps({"issue": "clean", "sev": "info", "fix": "n/a " * 30})
+    client, stream, manager = _openai(monkeypatch, reply)
+
+    assert json.loads(audit._stream_verdict(client, "def f(): ...")) == {
+        "issue": "clean"
+    }
+    assert stream.closed and stream.read < len(stream.pieces) // 4
+    usage = manager.snapshot()
+    assert usage["requests"] == 1
+    assert usage["tokens_used"] == 14  # estimated prompt + received completion
+    assert llm_base.reply_was_billed()
+
+
+def test_findings_are_streamed_to_the_end(monkeypatch):
+    verdict = {"issue": "prompt injection", "sev": "high", "owasp": "LLM01"}
+    client, stream, manager = _openai(monkeypatch, json.dumps(verdict))
+
+    assert json.loads(audit._stream_verdict(client, "def f(): ...")) == verdict
+    assert stream.read == len(stream.pieces)
+    assert manager.snapshot()["tokens_used"] == 340  # usage of the final chunk
+
+
+def test_stream_closed_from_another_context_settles_its_reservation(monkeypatch):
+    import contextvars
+
+    client, stream, manager = _openai(monkeypatch, json.dumps({"issue": "x" * 80}))
+
+    pieces = client.stream("def f(): ...")
+    next(pieces)
+    contextvars.Context().run(pieces.close)  # e.g. collected on another thread
+
+    assert stream.closed
+    usage = manager.snapshot()
+    assert usage["requests"] == 1 and usage["tokens_used"] == 14
+    assert manager.headroom("fake-model") == manager.max_tokens - 14
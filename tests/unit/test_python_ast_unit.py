@@ -0,0 +1,156 @@
+import ast
+from pathlib import Path
+
+from lintai.engine.python_ast_unit import PythonASTUnit, active_unit, unit_of
+
+_SRC = """
+def outer():
+    def inner():
+        return call()
+    return inner
+"""
+
+
+def _unit(tmp_path: Path, name: str = "mod.py") -> PythonASTUnit:
+    fp = tmp_path / name
+    fp.write_text(_SRC)
+    return PythonASTUnit(fp, _SRC, project_root=tmp_path)
+
+
+def test_nodes_are_not_stamped_and_qualname_still_works(tmp_path):
+    unit = _unit(tmp_path)
+    call = next(n for n in ast.walk(unit.tree) if isinstance(n, ast.Call))
+
+    assert not hasattr(call, "parent")
+    assert not hasattr(call, "_unit")
+    assert unit.qualname(call).endswith("mod.outer.inner")
+    inner = unit.enclosing_def(call)
+    assert inner.name == "inner"
+    assert unit.parent_def(inner).name == "outer"
+    assert unit.enclosing_def(unit.tree.body[0]) is unit.tree.body[0]
+    assert unit.enclosing_def(unit.tree) is None
+
+
+def test_unit_of_finds_owner(tmp_path):
+    a = _unit(tmp_path, "a.py")
+    b = _unit(tmp_path, "b.py")
+    node_b = next(n for n in ast.walk(b.tree) if isinstance(n, ast.Call))
+
+    assert unit_of(node_b) is b
+    with active_unit(a):
+        assert unit_of(node_b) is b  # active unit does not own it
+        assert unit_of(a.tree.body[0]) is a
+    assert unit_of(ast.Name(id="x")) is None
+
+    old = b.tree.body[0]
+    b._attach(ast.parse(b.source))  # re-parsed: the old nodes are not b's
+    assert unit_of(old) is None
+    assert unit_of(b.tree.body[0]) is b
+
+
+def test_nodes_of_is_source_ordered(tmp_path):
+    unit = _unit(tmp_path)
+    walked = [n for n in ast.walk(unit.tree)]
+
+    defs = unit.nodes_of(ast.FunctionDef)
+    assert [d.name for d in defs] == ["outer", "inner"]
+    mixed = unit.nodes_of(ast.Return, ast.Call)
+    assert [type(n).__name__ for n in mixed] == ["Return", "Call", "Return"]
+    assert len(unit.nodes_of(*{type(n) for n in walked})) == len(walked)
+
+
+def test_analyzer_walks_each_file_once(tmp_path, monkeypatch):
+    from lintai.engine.analysis import ProjectAnalyzer
+
+    unit = _unit(tmp_path)
+    n_nodes = sum(1 for _ in ast.walk(unit.tree))
+    visited = []
+    real = ast.iter_child_nodes
+    monkeypatch.setattr(ast, "iter_child_nodes", lambda n: visited.append(n) or real(n))
+
+    analyzer = ProjectAnalyzer([unit]).analyze()
+
+    assert len(visited) == n_nodes
+    assert any(q.endswith("mod.outer.inner") for q in analyzer.qualname_to_node)
+
+
+_NESTED = """
+@deco(lambda d: d)
+def a(x=lambda: 0):
+    def b():
+        f = lambda y: (lambda z: call(z))(y)
+        return f
+    class C:
+        async def m(self):
+            return call(self)
+    return call(b)
+
+def c(): return call()
+x = call()
+"""
+
+
+def test_enclosing_def_matches_a_full_scan(tmp_path):
+    fp = tmp_path / "nested.py"
+    fp.write_text(_NESTED)
+    unit = PythonASTUnit(fp, _NESTED, project_root=tmp_path)
+    defs = [
+        n
+        for n in ast.walk(unit.tree)
+        if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda))
+    ]
+
+    parents = {c: n for n in ast.walk(unit.tree) for c in ast.iter_child_nodes(n)}
+
+    def scan(node):  # the old parent-chain lookup
+        node = parents.get(node)
+        while node is not None and node not in defs:
+            node = parents.get(node)
+        return node
+
+    nodes = [n for n in ast.walk(unit.tree) if hasattr(n, "lineno")]
+    for node in nodes:
+        if node not in defs:
+            assert unit.enclosing_def(node) is scan(node)
+
+    calls = sorted(
+        (n for n in nodes if getattr(getattr(n, "func", None), "id", "") == "call"),
+        key=lambda n: (n.lineno, n.col_offset),
+    )
+    assert [unit.enclosing_function(n).name for n in calls[:-1]] == [
+        "b",
+        "m",
+        "a",
+        "c",
+    ]
+    assert unit.enclosing_function(calls[-1]) is None
+
+
+_DECORATED = """
+import openai
+
+def outer():
+    @deco(openai.ChatCompletion.create(prompt="x"))
+    def inner():
+        return 1
+    return inner
+"""
+
+
+def test_decorator_calls_belong_to_the_decorated_def(tmp_path):
+    from lintai.engine.analysis import ProjectAnalyzer
+
+    fp = tmp_path / "mod.py"
+    fp.write_text(_DECORATED)
+    unit = PythonASTUnit(fp, _DECORATED, project_root=tmp_path)
+    create = next(
+        n
+        for n in unit.nodes_of(ast.Call)
+        if isinstance(n.func, ast.Attribute) and n.func.attr == "create"
+    )
+
+    assert unit.enclosing_def(create).name == "inner"
+    assert unit.qualname(create).endswith("mod.outer.inner")
+    # the same def the call graph attributes it to
+    (sink,) = ProjectAnalyzer([unit]).analyze().ai_calls
+    assert sink.scope.endswith(".inner")
@@ -0,0 +1,61 @@
+from types import SimpleNamespace as NS
+
+import pytest
+
+import lintai.llm.token_util as tu
+
+
+class _Encoding:
+    """Splits on whitespace; counts its encode() calls."""
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+
+    def encode(self, text):
+        self.calls += 1
+        return text.split()
+
+
+@pytest.fixture
+def fake_tiktoken(monkeypatch):
+    base, big = _Encoding("cl100k_base"), _Encoding("o200k_base")
+    lookups = []
+
+    def encoding_for_model(model):
+        lookups.append(model)
+        if model == "offline-model":
+            raise ConnectionError("cannot download encoding")
+        if model != "big-model":
+            raise KeyError(model)
+        return big
+
+    monkeypatch.setattr(tu, "_LOADED", True)
+    monkeypatch.setattr(tu, "_CL100K", base)
+    monkeypatch.setattr(tu, "tiktoken", NS(encoding_for_model=encoding_for_model))
+    monkeypatch.setattr(tu, "_SAMPLES", {})
+    tu._encoder.cache_clear()
+    yield NS(base=base, big=big, lookups=lookups)
+    tu._encoder.cache_clear()
+
+
+def test_encoder_lookup_is_memoised_per_model(fake_tiktoken):
+    for _ in range(3):
+        assert tu.estimate_tokens("a b c", "big-model") == 3
+        assert tu.estimate_tokens("a b", "offline-model") == 2  # cl100k fallback
+
+    assert fake_tiktoken.lookups == ["big-model", "offline-model"]
+    assert fake_tiktoken.big.calls == 3 and fake_tiktoken.base.calls == 3
+
+
+def test_cheap_estimate_far_from_limit_exact_near_it(fake_tiktoken):
+    text = "word " * 100  # 500 chars, 100 "tokens"
+
+    far = tu.estimate_tokens(text, "big-model", headroom=10_000)
+    assert far == tu.approx_tokens(text, "big-model") == 136  # seed 3.7 chars/tok
+    assert fake_tiktoken.big.calls == 0
+
+    assert tu.estimate_tokens(text, "big-model", headroom=200) == 100
+    assert fake_tiktoken.big.calls == 1
+    assert tu.chars_per_token("big-model") == 5.0  # calibrated by the exact count
+    assert tu.approx_tokens(text, "big-model") == 100